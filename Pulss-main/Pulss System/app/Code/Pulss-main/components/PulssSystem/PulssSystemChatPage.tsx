@@ -61,11 +61,12 @@ const PulssSystemChatPage: React.FC<Props> = ({ clientId, token }) => {
   const handleSend = async () => {
     if (!input.trim() || !sessionId) return;
     const text = input.trim();
-    setMessages((prev) => [...prev, { id: crypto.randomUUID(), from: 'user', text }]);
+    const messageId = crypto.randomUUID();
+    setMessages((prev) => [...prev, { id: messageId, from: 'user', text }]);
     setInput('');
     setLoading(true);
     try {
-      const res = await pulssChatService.sendMessage(sessionId, text);
+      const res = await pulssChatService.sendMessage(sessionId, text, messageId);
       setMessages((prev) => [...prev, { id: crypto.randomUUID(), from: 'assistant', text: res.assistant_message }]);
       if (res.done) {
         setDone(true);
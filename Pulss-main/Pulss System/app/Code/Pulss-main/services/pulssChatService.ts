@@ -39,12 +39,17 @@ export const pulssChatService = {
     return request(`/api/pulss-chat/start-from-link/${clientId}/${token}`, { method: 'POST' });
   },
 
-  async sendMessage(sessionId: string, userMessage: string): Promise<PulssChatSendResult> {
+  async sendMessage(sessionId: string, userMessage: string, idempotencyKey?: string): Promise<PulssChatSendResult> {
     // Expected backend request: POST {API_BASE}/api/pulss-chat/sessions/{session_id}/messages
     // Body: { user_message }
+    // Optional header: Idempotency-Key (a retry with the same key returns the stored reply)
     // Expected response (200): { assistant_message, done }
     return request(`/api/pulss-chat/sessions/${sessionId}/messages`, {
       method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : {}),
+      },
       body: JSON.stringify({ user_message: userMessage }),
     });
   },
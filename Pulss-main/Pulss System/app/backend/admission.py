@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional, Set
+
+from metrics import REGISTRY
+
+QUEUE_DEPTH = REGISTRY.gauge("pulss_llm_queue_depth", "LLM calls waiting for admission.")
+IN_FLIGHT = REGISTRY.gauge("pulss_llm_in_flight", "LLM calls currently admitted.")
+QUEUE_WAIT = REGISTRY.histogram("pulss_llm_queue_wait_seconds", "Time LLM calls spent waiting for admission.")
+SHED = REGISTRY.counter("pulss_llm_shed_total", "LLM calls rejected by the admission controller.", ("reason",))
+
+# Waiting calls hold a worker thread: the sync endpoints run in anyio's default pool of 40
+# threads. The default queue leaves THREADPOOL_RESERVE of them for everything else, so calls
+# are shed before the pool is exhausted and non-LLM requests start queueing behind them.
+THREADPOOL_SIZE = 40
+THREADPOOL_RESERVE = 16
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~4 ASCII characters per token, ~1 token per Japanese character."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+class AdmissionRejected(Exception):
+    """The call was shed (queue full or waited too long)."""
+
+    def __init__(self, reason: str, retry_after: int = 5) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _TokenBucket:
+    """Tokens-per-minute budget; capacity is one minute's worth."""
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, amount: int) -> bool:
+        self._refill()
+        # A request larger than the whole budget may go once the bucket is full.
+        need = min(float(amount), self.capacity)
+        if self.tokens >= need:
+            self.tokens -= amount
+            return True
+        return False
+
+    def seconds_until(self, amount: int) -> float:
+        self._refill()
+        deficit = min(float(amount), self.capacity) - self.tokens
+        return max(0.0, deficit / self.rate) if self.rate else 1.0
+
+
+class _Waiter:
+    __slots__ = ("session", "tokens", "granted", "enqueued_at")
+
+    def __init__(self, session: str, tokens: int) -> None:
+        self.session = session
+        self.tokens = tokens
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionController:
+    """Admission in front of outbound LLM calls.
+
+    - at most `max_concurrent` calls in flight overall, and one per session;
+    - a tokens-per-minute budget (0 disables it);
+    - waiting calls are served round-robin across sessions, so one busy session
+      cannot starve the others;
+    - calls are shed with AdmissionRejected once `max_queue` are waiting or a call
+      has waited `queue_timeout` seconds. The default queue is what the worker thread
+      pool can hold besides the in-flight calls and THREADPOOL_RESERVE.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: Optional[int] = None,
+        tokens_per_minute: int = 0,
+        queue_timeout: float = 30.0,
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        if max_queue is None:
+            max_queue = max(1, THREADPOOL_SIZE - THREADPOOL_RESERVE - max_concurrent)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._bucket = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._cond = threading.Condition()
+        # session -> FIFO of its waiters; dict order is the round-robin order.
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._active: Set[str] = set()
+        self._waiting = 0
+        self._in_flight = 0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            max_concurrent=int(os.getenv("PULSS_LLM_MAX_CONCURRENCY", "8") or 8),
+            max_queue=int(os.getenv("PULSS_LLM_MAX_QUEUE", "") or 0) or None,
+            tokens_per_minute=int(os.getenv("PULSS_LLM_TPM", "0") or 0),
+            queue_timeout=float(os.getenv("PULSS_LLM_QUEUE_TIMEOUT_SECONDS", "30") or 30),
+        )
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._cond:
+            return {"waiting": self._waiting, "in_flight": self._in_flight, "sessions": len(self._queues)}
+
+    def _publish(self) -> None:
+        QUEUE_DEPTH.set(value=self._waiting)
+        IN_FLIGHT.set(value=self._in_flight)
+
+    def _dispatch(self) -> None:
+        """Grant waiters in round-robin session order while capacity allows. Caller holds the lock."""
+        granted: List[_Waiter] = []
+        while self._in_flight < self.max_concurrent and self._queues:
+            session = next((s for s in self._queues if s not in self._active), None)
+            if session is None:
+                break
+            queue = self._queues[session]
+            waiter = queue[0]
+            if self._bucket is not None and not self._bucket.try_take(waiter.tokens):
+                # Head-of-line waits for budget; skipping it would be unfair to that session.
+                break
+            queue.popleft()
+            if queue:
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+            waiter.granted = True
+            self._active.add(session)
+            self._in_flight += 1
+            self._waiting -= 1
+            granted.append(waiter)
+        if granted:
+            self._publish()
+            self._cond.notify_all()
+
+    def _remove(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.session)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.session]
+            self._waiting -= 1
+
+    @contextmanager
+    def admit(self, session: Optional[str], tokens: int = 1) -> Iterator[None]:
+        """Block until the call may run; calls without a session get a lane of their own."""
+        waiter = _Waiter("", tokens)
+        session = session or f"_call-{id(waiter)}"
+        waiter.session = session
+        with self._cond:
+            if self._waiting >= self.max_queue:
+                SHED.inc("queue_full")
+                raise AdmissionRejected("queue_full")
+            self._queues.setdefault(session, deque()).append(waiter)
+            self._waiting += 1
+            self._publish()
+            self._dispatch()
+            deadline = waiter.enqueued_at + self.queue_timeout
+            while not waiter.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._remove(waiter)
+                    self._publish()
+                    SHED.inc("timeout")
+                    raise AdmissionRejected("timeout")
+                wait = remaining
+                if self._bucket is not None and self._queues:
+                    # Wake up when the budget has refilled enough for the next head-of-line.
+                    wait = min(wait, max(0.01, self._bucket.seconds_until(waiter.tokens)))
+                self._cond.wait(wait)
+                self._dispatch()
+        QUEUE_WAIT.observe(value=time.monotonic() - waiter.enqueued_at)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active.discard(session)
+                self._in_flight -= 1
+                self._publish()
+                self._dispatch()
+                self._cond.notify_all()
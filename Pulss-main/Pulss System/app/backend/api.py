@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+import json
 import logging
-from fastapi import APIRouter, Body, Depends, FastAPI, HTTPException
+from fastapi import APIRouter, Body, Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -22,6 +24,10 @@ from domain import (
     Contract,
     Lead,
     LeadStatus,
+    LlmUsageSummary,
+    KpiRow,
+    MetricSeries,
+    MetricSeriesSet,
     MetricSnapshot,
     Proposal,
     ProposalStatus,
@@ -32,9 +38,24 @@ from domain import (
     TaskCategory,
     TaskStatus,
 )
+from batch import BATCH_MAX_REQUESTS, SubRequest, run_batch
+from compression import CompressionMiddleware
+from http_cache import ResponseCache, format_http_date, is_not_modified, make_etag
+from infrastructure import TableState
+from metrics import REGISTRY, MetricsMiddleware
+from slow_query import QueryShapeStats, SlowQueryLog
+from client_similarity import SimilarClient
+from dedup import DEFAULT_THRESHOLD, KINDS as DUPLICATE_KINDS, DuplicateGroup, DuplicateMatch
+from lead_scoring import LeadRescoreResult
+from pipeline import OwnerStats, PipelineReport, PipelineStage
+from embeddings import SOURCES as KNOWLEDGE_SOURCES, EmbeddingIndex, KnowledgeHit
+from timing import TimedRoute, TimingMiddleware, span
 from services import (
     AiSuggestionService,
     ClientService,
+    BulkSuggestionJob,
+    BulkSuggestionService,
+    ClientWorkspaceService,
     ManagementService,
     PulssChatService,
     ScheduleService,
@@ -43,6 +64,10 @@ from services import (
     PulssLinkNotFound,
     PulssOpenAIError,
     PulssPersistenceError,
+    PulssLlmOverloaded,
+    PulssIdempotencyConflict,
+    DuplicateRecordError,
+    ScheduleConflictError,
 )
 
 logger = logging.getLogger(__name__)
@@ -154,6 +179,12 @@ class PulssChatMessageOut(BaseModel):
     done: bool
 
 
+class PulssChatSlotsOut(BaseModel):
+    session_id: str
+    slots: Dict[str, Any]
+    missing: List[str]
+
+
 class AiDraftPayload(BaseModel):
     type: str
     status: str
@@ -221,6 +252,82 @@ class AiSuggestionOut(BaseModel):
         return cls(**s.__dict__)
 
 
+class BulkSuggestionPayload(BaseModel):
+    status: Optional[ClientStatus] = ClientStatus.CONTRACTED
+    phase: Optional[ClientPhase] = None
+    client_ids: Optional[List[str]] = None
+    context: Dict[str, Any] = Field(default_factory=dict)
+    force: bool = False
+
+
+class BulkSuggestionJobOut(BaseModel):
+    id: str
+    status: str
+    filters: Dict[str, Any]
+    total: int
+    processed: int
+    generated: int
+    skipped: int
+    failed: int
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    @classmethod
+    def from_domain(cls, job: BulkSuggestionJob) -> "BulkSuggestionJobOut":
+        return cls(**job.__dict__)
+
+
+class SimilarClientOut(BaseModel):
+    client_id: str
+    name: str
+    industry: str
+    phase: str
+    score: float
+
+    @classmethod
+    def from_domain(cls, item: SimilarClient) -> "SimilarClientOut":
+        return cls(**item.__dict__)
+
+
+class DuplicateMatchOut(BaseModel):
+    kind: str
+    id: str
+    name: str
+    score: float
+
+    @classmethod
+    def from_domain(cls, item: DuplicateMatch) -> "DuplicateMatchOut":
+        return cls(**item.__dict__)
+
+
+class DuplicateGroupOut(BaseModel):
+    normalized: str
+    members: List[DuplicateMatchOut]
+
+    @classmethod
+    def from_domain(cls, group: DuplicateGroup) -> "DuplicateGroupOut":
+        return cls(normalized=group.normalized, members=[DuplicateMatchOut.from_domain(m) for m in group.members])
+
+
+class ClientCreatedOut(ClientSummaryOut):
+    duplicates: List[DuplicateMatchOut] = Field(default_factory=list)  # existing clients with a similar name
+
+
+class KnowledgeHitOut(BaseModel):
+    source: str
+    source_id: str
+    client_id: Optional[str]
+    title: str
+    snippet: str
+    score: float
+
+    @classmethod
+    def from_domain(cls, hit: KnowledgeHit) -> "KnowledgeHitOut":
+        return cls(**hit.__dict__)
+
+
 class DirectorBoardItem(BaseModel):
     client_id: str
     name: str
@@ -239,6 +346,7 @@ class SchedulePayload(BaseModel):
     type: str = "meeting"
     team: str = "sales"
     description: Optional[str] = None
+    rrule: Optional[str] = Field(None, max_length=500)  # e.g. FREQ=WEEKLY;BYDAY=MO
 
 
 class ScheduleOut(BaseModel):
@@ -249,12 +357,19 @@ class ScheduleOut(BaseModel):
     type: str
     team: str
     description: Optional[str]
+    rrule: Optional[str] = None
+    series_id: Optional[str] = None
+    recurrence_id: Optional[datetime] = None
 
     @classmethod
     def from_domain(cls, e: ScheduleEvent) -> "ScheduleOut":
         return cls(**e.__dict__)
 
 
+class ScheduleSavedOut(ScheduleOut):
+    conflicts: List[ScheduleOut] = Field(default_factory=list)  # same-team events it overlaps
+
+
 class SnsNewsOut(BaseModel):
     id: str
     title: str
@@ -304,6 +419,10 @@ class LeadOut(BaseModel):
         return cls(**lead.__dict__)
 
 
+class LeadCreatedOut(LeadOut):
+    duplicates: List[DuplicateMatchOut] = Field(default_factory=list)  # existing leads/clients with a similar name
+
+
 class ContactPayload(BaseModel):
     channel: str
     content: str
@@ -433,9 +552,12 @@ class ContentOut(BaseModel):
         return cls(**c.__dict__)
 
 
+PERIOD_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"  # YYYY-MM
+
+
 class MetricPayload(BaseModel):
     client_id: str
-    period: str
+    period: str = Field(..., pattern=PERIOD_PATTERN)
     metrics: dict
 
 
@@ -451,6 +573,108 @@ class MetricOut(BaseModel):
         return cls(**m.__dict__)
 
 
+class MetricSeriesOut(BaseModel):
+    client_id: str
+    metric: str
+    values: List[Optional[float]]
+    mom: List[Optional[float]]
+    yoy: List[Optional[float]]
+    avg3: List[Optional[float]]
+
+    @classmethod
+    def from_domain(cls, s: MetricSeries) -> "MetricSeriesOut":
+        return cls(**s.__dict__)
+
+
+class MetricSeriesSetOut(BaseModel):
+    periods: List[str]
+    series: List[MetricSeriesOut]
+
+    @classmethod
+    def from_domain(cls, s: MetricSeriesSet) -> "MetricSeriesSetOut":
+        return cls(periods=s.periods, series=[MetricSeriesOut.from_domain(x) for x in s.series])
+
+
+class KpiRowOut(BaseModel):
+    period: str
+    group: str
+    metric: str
+    clients: int
+    total: float
+    mean: float
+    min: float
+    max: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
+    mom_median: Optional[float]
+
+    @classmethod
+    def from_domain(cls, r: KpiRow) -> "KpiRowOut":
+        return cls(**r.__dict__)
+
+
+class PipelineStageOut(BaseModel):
+    status: str
+    count: int
+    open_mrr: int
+    reached: int
+    conversion_rate: Optional[float]
+    win_probability: Optional[float]
+    avg_days_in_stage: Optional[float]
+    avg_contacts: Optional[float]
+
+    @classmethod
+    def from_domain(cls, s: PipelineStage) -> "PipelineStageOut":
+        return cls(**s.__dict__)
+
+
+class OwnerStatsOut(BaseModel):
+    owner: str
+    open: int
+    won: int
+    lost: int
+    win_rate: Optional[float]
+    open_mrr: int
+    won_mrr: int
+
+    @classmethod
+    def from_domain(cls, o: OwnerStats) -> "OwnerStatsOut":
+        return cls(**o.__dict__)
+
+
+class LeadRescoreOut(BaseModel):
+    scored: int
+    changed: int
+    duration_ms: float
+
+    @classmethod
+    def from_domain(cls, r: LeadRescoreResult) -> "LeadRescoreOut":
+        return cls(**r.__dict__)
+
+
+class PipelineReportOut(BaseModel):
+    stages: List[PipelineStageOut]
+    lead_forecast_mrr: float
+    proposal_forecast_mrr: float
+    forecast_mrr: float
+    proposals: Dict[str, Dict[str, int]]
+    owners: List[OwnerStatsOut]
+    transitions: Dict[str, int]
+    computed_at: datetime
+
+    @classmethod
+    def from_domain(cls, r: PipelineReport) -> "PipelineReportOut":
+        return cls(
+            **{
+                **r.__dict__,
+                "stages": [PipelineStageOut.from_domain(s) for s in r.stages],
+                "owners": [OwnerStatsOut.from_domain(o) for o in r.owners],
+            }
+        )
+
+
 class NotificationOut(BaseModel):
     id: str
     user: str
@@ -464,6 +688,78 @@ class NotificationOut(BaseModel):
         return cls(**n.__dict__)
 
 
+class ClientWorkspaceOut(BaseModel):
+    client: ClientSummaryOut
+    tasks: Optional[List[TaskOut]] = None
+    ai_suggestions: Optional[List[AiSuggestionOut]] = None
+    proposals: Optional[List[ProposalOut]] = None
+    contracts: Optional[List[ContractOut]] = None
+    brief: Optional[BriefOut] = None
+    content_posts: Optional[List[ContentOut]] = None
+    metrics: Optional[List[MetricOut]] = None
+    ai_drafts: Optional[List[AiDraftOut]] = None
+    has_more: Dict[str, bool] = Field(default_factory=dict)
+
+
+class BatchRequestItem(BaseModel):
+    method: str = "GET"
+    path: str
+    body: Optional[Any] = None
+    headers: Dict[str, str] = Field(default_factory=dict)
+
+
+class BatchPayload(BaseModel):
+    requests: List[BatchRequestItem]
+
+
+class BatchResponseItem(BaseModel):
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
+
+
+class SlowQueryOut(BaseModel):
+    sql: str
+    count: int
+    slow_count: int
+    avg_ms: float
+    max_ms: float
+    total_ms: float
+    last_rows: int
+    param_types: List[str]
+    plan: List[str]
+    last_slow_at: Optional[datetime] = None
+
+    @classmethod
+    def from_domain(cls, stats: QueryShapeStats) -> "SlowQueryOut":
+        return cls(
+            sql=stats.sql,
+            count=stats.count,
+            slow_count=stats.slow_count,
+            avg_ms=round(stats.avg_ms, 3),
+            max_ms=round(stats.max_ms, 3),
+            total_ms=round(stats.total_ms, 3),
+            last_rows=stats.last_rows,
+            param_types=stats.param_types,
+            plan=stats.plan,
+            last_slow_at=stats.last_slow_at,
+        )
+
+
+class LlmUsageSummaryOut(BaseModel):
+    key: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    avg_latency_ms: float
+    models: List[str]
+
+    @classmethod
+    def from_domain(cls, s: LlmUsageSummary) -> "LlmUsageSummaryOut":
+        return cls(**s.__dict__)
+
+
 def build_router(
     client_service: ClientService,
     task_service: TaskService,
@@ -472,8 +768,35 @@ def build_router(
     news_service: SnsNewsService,
     management_service: ManagementService,
     pulss_service: PulssChatService,
+    workspace_service: ClientWorkspaceService,
+    slow_query_log: SlowQueryLog,
+    bulk_service: BulkSuggestionService,
+    knowledge: EmbeddingIndex,
 ) -> APIRouter:
-    router = APIRouter(prefix="/api")
+    router = APIRouter(prefix="/api", route_class=TimedRoute)
+    response_cache = ResponseCache()
+
+    def _overloaded(e: PulssLlmOverloaded) -> HTTPException:
+        return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    def _duplicate_conflict(e: DuplicateRecordError) -> HTTPException:
+        # Only raised with ?reject_duplicates=true; by default the matches come back with the new record.
+        return HTTPException(
+            status_code=409,
+            detail={"message": str(e), "matches": [DuplicateMatchOut.from_domain(m).model_dump() for m in e.matches]},
+        )
+
+    def _schedule_conflict(e: ScheduleConflictError) -> HTTPException:
+        # Only raised with ?reject_conflicts=true; by default the overlaps come back with the saved event.
+        return HTTPException(
+            status_code=409,
+            detail={"message": str(e), "conflicts": [jsonable_encoder(ScheduleOut.from_domain(c)) for c in e.conflicts]},
+        )
+
+    def _validate_kinds(kinds: Optional[List[str]]) -> None:
+        unknown = set(kinds or ()) - set(DUPLICATE_KINDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown kind: {', '.join(sorted(unknown))}")
 
     def _calc_onboarding_progress(tasks: List[Task]) -> Optional[float]:
         onboarding_tasks = [t for t in tasks if t.category == TaskCategory.ONBOARDING]
@@ -489,28 +812,103 @@ def build_router(
         stale_contact = client.last_contact_at and (datetime.utcnow() - client.last_contact_at).days >= 14
         return bool(overdue or stale_contact)
 
+    def _cached_json(
+        request: Request,
+        state: TableState,
+        render: Callable[[], Any],
+        *extra: object,
+        not_before: Optional[datetime] = None,
+    ) -> Response:
+        """Serve a list endpoint through ETag validation and the precompressed response cache.
+
+        304 when the client's copy is current; otherwise the cached body for this ETag
+        (raw or already-compressed), rendering only on a miss.
+        """
+        etag = make_etag(request.url.path, state.version, request.url.query, *extra)
+        last_modified = state.last_modified
+        if last_modified and not_before and not_before > last_modified:
+            last_modified = not_before
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if last_modified:
+            headers["Last-Modified"] = format_http_date(last_modified)
+        if is_not_modified(request.headers, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+        key = (request.url.path, request.url.query)
+        payload = response_cache.get(key, etag)
+        if payload is None:
+            data = render()
+            with span("encode"):
+                body = json.dumps(
+                    jsonable_encoder(data), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+                ).encode("utf-8")
+            payload = response_cache.put(key, etag, body)
+        return payload.to_response(request.headers.get("accept-encoding", ""), headers)
+
+    @router.post("/batch", response_model=List[BatchResponseItem])
+    async def batch(request: Request, payload: BatchPayload) -> List[BatchResponseItem]:
+        if len(payload.requests) > BATCH_MAX_REQUESTS:
+            raise HTTPException(status_code=413, detail=f"Batch is limited to {BATCH_MAX_REQUESTS} requests")
+        subs: List[SubRequest] = []
+        for item in payload.requests:
+            path = item.path.split("?", 1)[0]
+            if not path.startswith(f"{router.prefix}/") or path == f"{router.prefix}/batch":
+                raise HTTPException(status_code=400, detail=f"Unsupported batch path: {item.path}")
+            subs.append(SubRequest(method=item.method.upper(), path=item.path, body=item.body, headers=item.headers))
+        results = await run_batch(request.app.router, request.scope, subs)
+        return [BatchResponseItem(status=r.status, headers=r.headers, body=r.body) for r in results]
+
     @router.get("/health")
     def health() -> dict:
         return {"status": "ok", "time": datetime.utcnow().isoformat()}
 
-    @router.get("/clients", response_model=List[ClientSummaryOut])
-    def list_clients() -> List[ClientSummaryOut]:
-        clients = client_service.list_clients()
-        result: List[ClientSummaryOut] = []
-        for c in clients:
-            tasks = task_service.list_tasks(c.id)
-            progress = _calc_onboarding_progress(tasks)
-            alert = _calc_has_alert(c, tasks)
-            result.append(ClientSummaryOut.from_domain(c, onboarding_progress=progress, has_alert=alert))
-        return result
+    @router.get("/metrics", include_in_schema=False)
+    def prometheus_metrics() -> Response:
+        return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    @router.get("/admin/slow-queries", response_model=List[SlowQueryOut])
+    def list_slow_queries(limit: int = Query(20, ge=1, le=200)) -> List[SlowQueryOut]:
+        return [SlowQueryOut.from_domain(s) for s in slow_query_log.top(limit)]
+
+    @router.get("/admin/llm-usage", response_model=List[LlmUsageSummaryOut])
+    def llm_usage(
+        group_by: str = Query("day", pattern="^(day|session|client)$"),
+        client_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = Query(100, ge=1, le=1000),
+    ) -> List[LlmUsageSummaryOut]:
+        summaries = pulss_service.usage_summary(
+            group_by, client_id=client_id, session_id=session_id, since=since, until=until, limit=limit
+        )
+        return [LlmUsageSummaryOut.from_domain(s) for s in summaries]
 
-    @router.post("/clients", response_model=ClientSummaryOut)
-    def create_client(payload: ClientCreatePayload) -> ClientSummaryOut:
-        client = client_service.create_client(payload.model_dump())
+    @router.get("/clients", response_model=List[ClientSummaryOut])
+    def list_clients(request: Request) -> Response:
+        def render() -> List[ClientSummaryOut]:
+            result: List[ClientSummaryOut] = []
+            for c in client_service.list_clients():
+                tasks = task_service.list_tasks(c.id)
+                progress = _calc_onboarding_progress(tasks)
+                alert = _calc_has_alert(c, tasks)
+                result.append(ClientSummaryOut.from_domain(c, onboarding_progress=progress, has_alert=alert))
+            return result
+
+        # has_alert depends on today's date, so the day is part of the validator.
+        today = datetime.combine(date.today(), datetime.min.time())
+        return _cached_json(request, client_service.list_state(), render, today.date(), not_before=today)
+
+    @router.post("/clients", response_model=ClientCreatedOut)
+    def create_client(payload: ClientCreatePayload, reject_duplicates: bool = False) -> ClientCreatedOut:
+        try:
+            client, matches = client_service.create_client(payload.model_dump(), reject_duplicates=reject_duplicates)
+        except DuplicateRecordError as e:
+            raise _duplicate_conflict(e)
         tasks = task_service.list_tasks(client.id)
         progress = _calc_onboarding_progress(tasks)
         alert = _calc_has_alert(client, tasks)
-        return ClientSummaryOut.from_domain(client, onboarding_progress=progress, has_alert=alert)
+        summary = ClientSummaryOut.from_domain(client, onboarding_progress=progress, has_alert=alert)
+        return ClientCreatedOut(**summary.model_dump(), duplicates=[DuplicateMatchOut.from_domain(m) for m in matches])
 
     @router.get("/clients/{client_id}", response_model=ClientSummaryOut)
     def get_client(client_id: str) -> ClientSummaryOut:
@@ -522,6 +920,53 @@ def build_router(
         alert = _calc_has_alert(client, tasks)
         return ClientSummaryOut.from_domain(client, onboarding_progress=progress, has_alert=alert)
 
+    @router.get("/clients/{client_id}/similar", response_model=List[SimilarClientOut])
+    def get_similar_clients(
+        client_id: str, k: int = Query(10, ge=1, le=100), same_industry: bool = False
+    ) -> List[SimilarClientOut]:
+        items = client_service.similar_clients(client_id, k=k, same_industry=same_industry)
+        if items is None:
+            raise HTTPException(status_code=404, detail="Client not found")
+        return [SimilarClientOut.from_domain(i) for i in items]
+
+    @router.get("/clients/{client_id}/workspace", response_model=ClientWorkspaceOut)
+    def get_client_workspace(
+        client_id: str,
+        include: Optional[str] = None,
+        limit: int = Query(20, ge=1, le=100),
+    ) -> ClientWorkspaceOut:
+        sections = [s.strip() for s in include.split(",") if s.strip()] if include else None
+        unknown = [s for s in sections or [] if s not in ClientWorkspaceService.SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+        workspace = workspace_service.load(client_id, include=sections, limit=limit)
+        if not workspace:
+            raise HTTPException(status_code=404, detail="Client not found")
+        converters = {
+            "tasks": TaskOut.from_domain,
+            "ai_suggestions": AiSuggestionOut.from_domain,
+            "proposals": ProposalOut.from_domain,
+            "contracts": ContractOut.from_domain,
+            "brief": BriefOut.from_domain,
+            "content_posts": ContentOut.from_domain,
+            "metrics": MetricOut.from_domain,
+            "ai_drafts": AiDraftOut.from_domain,
+        }
+        out = {}
+        for name, value in workspace.sections.items():
+            convert = converters[name]
+            if isinstance(value, list):
+                out[name] = [convert(v) for v in value]
+            else:
+                out[name] = convert(value) if value else None
+        client = workspace.client
+        summary = ClientSummaryOut.from_domain(
+            client,
+            onboarding_progress=_calc_onboarding_progress(workspace.tasks),
+            has_alert=_calc_has_alert(client, workspace.tasks),
+        )
+        return ClientWorkspaceOut(client=summary, has_more=workspace.has_more, **out)
+
     @router.put("/clients/{client_id}", response_model=ClientSummaryOut)
     def update_client(client_id: str, payload: ClientUpdatePayload) -> ClientSummaryOut:
         client = client_service.update_client(client_id, {k: v for k, v in payload.model_dump().items() if v is not None})
@@ -565,6 +1010,8 @@ def build_router(
         except PulssLinkNotFound as e:
             logger.info("[pulss] start-from-link not found/expired/mismatch: client_id=%s token=%s", client_id, token)
             raise HTTPException(status_code=404, detail=str(e))
+        except PulssLlmOverloaded as e:
+            raise _overloaded(e)
         except PulssOpenAIError:
             logger.exception("[pulss] start-from-link openai error: client_id=%s token=%s", client_id, token)
             raise HTTPException(status_code=502, detail="Failed to call OpenAI API")
@@ -594,6 +1041,8 @@ def build_router(
         except PulssLinkNotFound as e:
             logger.info("[pulss] start-from-link not found/expired: token=%s", token)
             raise HTTPException(status_code=404, detail=str(e))
+        except PulssLlmOverloaded as e:
+            raise _overloaded(e)
         except PulssOpenAIError as e:
             logger.exception("[pulss] start-from-link openai error: token=%s", token)
             raise HTTPException(status_code=502, detail="Failed to call OpenAI API")
@@ -616,16 +1065,36 @@ def build_router(
         )
 
     @router.post("/pulss-chat/sessions/{session_id}/messages", response_model=PulssChatMessageOut)
-    def send_pulss_message(session_id: str, payload: PulssChatMessagePayload) -> PulssChatMessageOut:
-        result = pulss_service.post_message(session_id, payload.user_message)
+    def send_pulss_message(
+        session_id: str,
+        payload: PulssChatMessagePayload,
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=200),
+    ) -> PulssChatMessageOut:
+        try:
+            result = pulss_service.post_message(session_id, payload.user_message, idempotency_key=idempotency_key)
+        except PulssLlmOverloaded as e:
+            raise _overloaded(e)
+        except PulssIdempotencyConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
         if not result:
             raise HTTPException(status_code=404, detail="Session not found")
         assistant_message, done = result
         return PulssChatMessageOut(assistant_message=assistant_message, done=done)
 
+    @router.get("/pulss-chat/sessions/{session_id}/slots", response_model=PulssChatSlotsOut)
+    def get_pulss_slots(session_id: str) -> PulssChatSlotsOut:
+        slots = pulss_service.get_slots(session_id)
+        if slots is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return PulssChatSlotsOut(session_id=session_id, slots=slots.to_dict(), missing=slots.missing())
+
     @router.get("/clients/{client_id}/tasks", response_model=List[TaskOut])
-    def list_tasks(client_id: str, category: Optional[TaskCategory] = None) -> List[TaskOut]:
-        return [TaskOut.from_domain(t) for t in task_service.list_tasks(client_id, category)]
+    def list_tasks(request: Request, client_id: str, category: Optional[TaskCategory] = None) -> Response:
+        return _cached_json(
+            request,
+            task_service.list_state(),
+            lambda: [TaskOut.from_domain(t) for t in task_service.list_tasks(client_id, category)],
+        )
 
     @router.post("/clients/{client_id}/tasks", response_model=TaskOut)
     def create_task(client_id: str, payload: TaskPayload) -> TaskOut:
@@ -644,13 +1113,52 @@ def build_router(
         return [AiSuggestionOut.from_domain(s) for s in ai_service.list_for_client(client_id)]
 
     @router.post("/clients/{client_id}/ai-suggestions", response_model=AiSuggestionOut)
-    def generate_ai_suggestion(client_id: str, payload: dict = Body(default_factory=dict)) -> AiSuggestionOut:
+    def generate_ai_suggestion(
+        client_id: str, payload: dict = Body(default_factory=dict), force: bool = False
+    ) -> AiSuggestionOut:
         client = client_service.get_client(client_id)
         if not client:
             raise HTTPException(status_code=404, detail="Client not found")
-        suggestion = ai_service.generate(client, context=payload)
+        suggestion = ai_service.generate(client, context=payload, force=force)
         return AiSuggestionOut.from_domain(suggestion)
 
+    @router.post("/ai-suggestions/bulk", response_model=BulkSuggestionJobOut, status_code=202)
+    def start_bulk_suggestions(
+        payload: BulkSuggestionPayload = Body(default_factory=BulkSuggestionPayload),
+    ) -> BulkSuggestionJobOut:
+        job = bulk_service.start(
+            status=payload.status,
+            phase=payload.phase,
+            client_ids=payload.client_ids,
+            context=payload.context,
+            force=payload.force,
+        )
+        return BulkSuggestionJobOut.from_domain(job)
+
+    @router.get("/ai-suggestions/bulk", response_model=List[BulkSuggestionJobOut])
+    def list_bulk_suggestion_jobs() -> List[BulkSuggestionJobOut]:
+        return [BulkSuggestionJobOut.from_domain(j) for j in bulk_service.list_jobs()]
+
+    @router.get("/ai-suggestions/bulk/{job_id}", response_model=BulkSuggestionJobOut)
+    def get_bulk_suggestion_job(job_id: str) -> BulkSuggestionJobOut:
+        job = bulk_service.get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return BulkSuggestionJobOut.from_domain(job)
+
+    @router.get("/knowledge/search", response_model=List[KnowledgeHitOut])
+    def search_knowledge(
+        q: str = Query(..., min_length=1, max_length=2000),
+        k: int = Query(5, ge=1, le=50),
+        source: Optional[List[str]] = Query(None),
+        client_id: Optional[str] = None,
+    ) -> List[KnowledgeHitOut]:
+        unknown = set(source or ()) - set(KNOWLEDGE_SOURCES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown source: {', '.join(sorted(unknown))}")
+        hits = knowledge.search(q, k=k, sources=source, client_id=client_id)
+        return [KnowledgeHitOut.from_domain(h) for h in hits]
+
     @router.post("/clients/{client_id}/ai-drafts", response_model=AiDraftOut)
     def create_ai_draft(client_id: str, payload: AiDraftPayload) -> AiDraftOut:
         client = client_service.get_client(client_id)
@@ -682,41 +1190,96 @@ def build_router(
         return items
 
     @router.get("/schedules", response_model=List[ScheduleOut])
-    def list_schedules(date: Optional[str] = None, team: Optional[str] = None) -> List[ScheduleOut]:
-        events = schedule_service.list(date=date, team=team)
-        return [ScheduleOut.from_domain(e) for e in events]
-
-    @router.post("/schedules", response_model=ScheduleOut)
-    def create_schedule(payload: SchedulePayload) -> ScheduleOut:
-        event = schedule_service.create(payload.model_dump())
-        return ScheduleOut.from_domain(event)
-
-    @router.put("/schedules/{event_id}", response_model=ScheduleOut)
-    def update_schedule(event_id: str, payload: SchedulePayload) -> ScheduleOut:
-        event = schedule_service.update(event_id, payload.model_dump())
-        if not event:
+    def list_schedules(
+        request: Request,
+        date: Optional[str] = None,
+        team: Optional[str] = None,
+        start: Optional[datetime] = Query(None, alias="from"),
+        end: Optional[datetime] = Query(None, alias="to"),
+    ) -> Response:
+        # from/to: events overlapping [from, to), e.g. a month view in one request.
+        if start and end and start >= end:
+            raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+        return _cached_json(
+            request,
+            schedule_service.list_state(),
+            lambda: [
+                ScheduleOut.from_domain(e) for e in schedule_service.list(date=date, team=team, start=start, end=end)
+            ],
+        )
+
+    @router.get("/schedules/conflicts", response_model=List[ScheduleOut])
+    def list_schedule_conflicts(
+        team: str, start: datetime = Query(..., alias="from"), end: datetime = Query(..., alias="to")
+    ) -> List[ScheduleOut]:
+        return [ScheduleOut.from_domain(e) for e in schedule_service.conflicts(team, start, end)]
+
+    def _schedule_saved(event: ScheduleEvent, conflicts: List[ScheduleEvent]) -> ScheduleSavedOut:
+        return ScheduleSavedOut(
+            **ScheduleOut.from_domain(event).model_dump(), conflicts=[ScheduleOut.from_domain(c) for c in conflicts]
+        )
+
+    @router.post("/schedules", response_model=ScheduleSavedOut)
+    def create_schedule(payload: SchedulePayload, reject_conflicts: bool = False) -> ScheduleSavedOut:
+        try:
+            event, conflicts = schedule_service.create(payload.model_dump(), reject_conflicts=reject_conflicts)
+        except ScheduleConflictError as e:
+            raise _schedule_conflict(e)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _schedule_saved(event, conflicts)
+
+    @router.put("/schedules/{event_id}", response_model=ScheduleSavedOut)
+    def update_schedule(event_id: str, payload: SchedulePayload, reject_conflicts: bool = False) -> ScheduleSavedOut:
+        try:
+            saved = schedule_service.update(event_id, payload.model_dump(), reject_conflicts=reject_conflicts)
+        except ScheduleConflictError as e:
+            raise _schedule_conflict(e)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not saved:
             raise HTTPException(status_code=404, detail="Schedule not found")
-        return ScheduleOut.from_domain(event)
+        return _schedule_saved(*saved)
 
     @router.delete("/schedules/{event_id}")
     def delete_schedule(event_id: str) -> dict:
+        # A recurring occurrence id ('<series id>@<start>') cancels only that occurrence.
         schedule_service.delete(event_id)
         return {"ok": True}
 
     @router.get("/sns-news", response_model=List[SnsNewsOut])
-    def list_news(platform: Optional[str] = None, industry: Optional[str] = None, limit: int = 30) -> List[SnsNewsOut]:
-        news = news_service.list(platform=platform, industry=industry, limit=limit)
-        return [SnsNewsOut.from_domain(n) for n in news]
+    def list_news(
+        request: Request,
+        platform: Optional[str] = None,
+        industry: Optional[str] = None,
+        limit: int = 30,
+    ) -> Response:
+        # list_state() already ran the n8n refresh.
+        return _cached_json(
+            request,
+            news_service.list_state(),
+            lambda: [
+                SnsNewsOut.from_domain(n)
+                for n in news_service.list(platform=platform, industry=industry, limit=limit, refresh=False)
+            ],
+        )
 
     # --- Lead & sales modules ---
     @router.get("/leads", response_model=List[LeadOut])
-    def list_leads() -> List[LeadOut]:
-        return [LeadOut.from_domain(l) for l in management_service.list_leads()]
+    def list_leads(request: Request) -> Response:
+        return _cached_json(
+            request,
+            management_service.leads_state(),
+            lambda: [LeadOut.from_domain(l) for l in management_service.list_leads()],
+        )
 
-    @router.post("/leads", response_model=LeadOut)
-    def create_lead(payload: LeadPayload) -> LeadOut:
-        lead = management_service.create_lead(payload.model_dump())
-        return LeadOut.from_domain(lead)
+    @router.post("/leads", response_model=LeadCreatedOut)
+    def create_lead(payload: LeadPayload, reject_duplicates: bool = False) -> LeadCreatedOut:
+        try:
+            lead, matches = management_service.create_lead(payload.model_dump(), reject_duplicates=reject_duplicates)
+        except DuplicateRecordError as e:
+            raise _duplicate_conflict(e)
+        return LeadCreatedOut(**LeadOut.from_domain(lead).model_dump(), duplicates=[DuplicateMatchOut.from_domain(m) for m in matches])
 
     @router.put("/leads/{lead_id}", response_model=LeadOut)
     def update_lead(lead_id: str, payload: LeadPayload) -> LeadOut:
@@ -725,6 +1288,32 @@ def build_router(
             raise HTTPException(status_code=404, detail="Lead not found")
         return LeadOut.from_domain(lead)
 
+    @router.get("/duplicates/check", response_model=List[DuplicateMatchOut])
+    def check_duplicates(
+        name: str = Query(..., min_length=1, max_length=200),
+        kind: Optional[List[str]] = Query(None),
+        threshold: float = Query(DEFAULT_THRESHOLD, ge=0.1, le=1.0),
+    ) -> List[DuplicateMatchOut]:
+        _validate_kinds(kind)
+        return [DuplicateMatchOut.from_domain(m) for m in management_service.find_duplicates(name, kind, threshold)]
+
+    @router.get("/duplicates/report", response_model=List[DuplicateGroupOut])
+    def duplicates_report(
+        kind: Optional[List[str]] = Query(None),
+        threshold: float = Query(DEFAULT_THRESHOLD, ge=0.1, le=1.0),
+    ) -> List[DuplicateGroupOut]:
+        _validate_kinds(kind)
+        return [DuplicateGroupOut.from_domain(g) for g in management_service.duplicate_report(kind, threshold)]
+
+    @router.post("/leads/rescore", response_model=LeadRescoreOut)
+    def rescore_leads() -> LeadRescoreOut:
+        # Called by lead import jobs once a batch is in; a daily run is scheduled in app.py.
+        return LeadRescoreOut.from_domain(management_service.rescore_leads())
+
+    @router.get("/sales/pipeline", response_model=PipelineReportOut)
+    def get_sales_pipeline() -> PipelineReportOut:
+        return PipelineReportOut.from_domain(management_service.pipeline_report())
+
     @router.get("/leads/{lead_id}/contacts", response_model=List[ContactOut])
     def list_contacts(lead_id: str) -> List[ContactOut]:
         return [ContactOut.from_domain(c) for c in management_service.list_contacts(lead_id)]
@@ -794,6 +1383,36 @@ def build_router(
     def list_metrics(client_id: str) -> List[MetricOut]:
         return [MetricOut.from_domain(m) for m in management_service.list_metrics(client_id)]
 
+    @router.get("/metrics/series", response_model=MetricSeriesSetOut)
+    def get_metric_series(
+        client_id: Optional[List[str]] = Query(None),
+        industry: Optional[str] = None,
+        metric: Optional[List[str]] = Query(None),
+        period_from: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+        period_to: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+    ) -> MetricSeriesSetOut:
+        if period_from and period_to and period_from > period_to:
+            raise HTTPException(status_code=400, detail="period_from must not be after period_to")
+        result = management_service.metric_series(
+            client_ids=client_id, industry=industry, metrics=metric, period_from=period_from, period_to=period_to
+        )
+        return MetricSeriesSetOut.from_domain(result)
+
+    @router.get("/reports/kpis", response_model=List[KpiRowOut])
+    def get_kpi_report(
+        industry: Optional[str] = None,
+        period_from: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+        period_to: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+        group_by: str = Query("none", pattern="^(none|industry|phase|status)$"),
+        metric: Optional[List[str]] = Query(None),
+    ) -> List[KpiRowOut]:
+        if period_from and period_to and period_from > period_to:
+            raise HTTPException(status_code=400, detail="period_from must not be after period_to")
+        rows = management_service.kpi_report(
+            period_from=period_from, period_to=period_to, industry=industry, group_by=group_by, metrics=metric
+        )
+        return [KpiRowOut.from_domain(r) for r in rows]
+
     @router.post("/metrics", response_model=MetricOut)
     def create_metric(payload: MetricPayload) -> MetricOut:
         snap = management_service.create_metric(payload.model_dump())
@@ -827,6 +1446,10 @@ def create_app(
     news_service: SnsNewsService,
     management_service: ManagementService,
     pulss_service: PulssChatService,
+    workspace_service: ClientWorkspaceService,
+    slow_query_log: SlowQueryLog,
+    bulk_service: BulkSuggestionService,
+    knowledge: EmbeddingIndex,
 ) -> FastAPI:
     app = FastAPI(title="Pulss API", version="0.2.0")
     origins = [
@@ -842,6 +1465,10 @@ def create_app(
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(TimingMiddleware)
+    # Outermost, so latency covers CORS and compression as well.
+    app.add_middleware(MetricsMiddleware)
     router = build_router(
         client_service,
         task_service,
@@ -850,6 +1477,10 @@ def create_app(
         news_service,
         management_service,
         pulss_service,
+        workspace_service,
+        slow_query_log,
+        bulk_service,
+        knowledge,
     )
     app.include_router(router)
     return app
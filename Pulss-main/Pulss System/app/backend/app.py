@@ -1,6 +1,17 @@
 from __future__ import annotations
 
+import os
+import threading
+
 from api import create_app
+import timing
+from metrics import record_db_query
+from slow_query import SlowQueryLog
+from client_similarity import ClientSimilarityIndex
+from dedup import DuplicateIndex
+from embeddings import EmbeddingIndex
+from scheduler import start_daily
+from pipeline import PipelineAnalytics
 from infrastructure import (
     AiDraftRepository,
     AiSuggestionRepository,
@@ -11,6 +22,7 @@ from infrastructure import (
     ContentPostRepository,
     ContractRepository,
     PulssChatMessageRepository,
+    LlmUsageRepository,
     PulssChatSessionRepository,
     PulssLinkRepository,
     LeadRepository,
@@ -27,7 +39,9 @@ from infrastructure import (
 )
 from services import (
     AiSuggestionService,
+    BulkSuggestionService,
     ClientService,
+    ClientWorkspaceService,
     ManagementService,
     PulssChatService,
     ScheduleService,
@@ -37,15 +51,30 @@ from services import (
 
 
 def build_services() -> tuple[
-    ClientService, TaskService, AiSuggestionService, ScheduleService, SnsNewsService, ManagementService, PulssChatService
+    ClientService,
+    TaskService,
+    AiSuggestionService,
+    ScheduleService,
+    SnsNewsService,
+    ManagementService,
+    PulssChatService,
+    ClientWorkspaceService,
+    SlowQueryLog,
+    BulkSuggestionService,
+    EmbeddingIndex,
 ]:
-    db = Database()
+    db = Database(os.getenv("PULSS_DB_PATH", "data.db"))
+    db.add_query_observer(record_db_query)
+    db.add_query_observer(timing.record_db_query)
+    slow_query_log = SlowQueryLog(db.conn)
+    db.add_query_observer(slow_query_log.observe)
     client_repo = ClientRepository(db)
     pulse_repo = PulseResponseRepository(db)
     pulse_link_repo = PulseLinkRepository(db)
     pulss_link_repo = PulssLinkRepository(db)
     pulss_session_repo = PulssChatSessionRepository(db)
     pulss_message_repo = PulssChatMessageRepository(db)
+    llm_usage_repo = LlmUsageRepository(db)
     ai_draft_repo = AiDraftRepository(db)
     task_repo = TaskRepository(db)
     template_repo = TaskTemplateRepository()
@@ -60,8 +89,20 @@ def build_services() -> tuple[
     content_repo = ContentPostRepository(db)
     metric_repo = MetricSnapshotRepository(db)
     notification_repo = NotificationRepository(db)
+    knowledge = EmbeddingIndex(db)
+    knowledge.attach()
+    similarity = ClientSimilarityIndex(db)
+    similarity.attach()
+    pipeline = PipelineAnalytics(db)
+    pipeline.attach()
+    duplicates = DuplicateIndex(db)
+    duplicates.attach()
 
     seed_data(client_repo, template_repo, task_repo)
+    # Backfill rows written before the index existed (or by an older embedder) off the startup path.
+    threading.Thread(target=knowledge.sync, name="pulss-knowledge-sync", daemon=True).start()
+    threading.Thread(target=similarity.build, name="pulss-similarity-build", daemon=True).start()
+    threading.Thread(target=duplicates.build, name="pulss-duplicates-build", daemon=True).start()
 
     client_service = ClientService(
         client_repo=client_repo,
@@ -69,9 +110,11 @@ def build_services() -> tuple[
         pulse_link_repo=pulse_link_repo,
         template_repo=template_repo,
         task_repo=task_repo,
+        similarity=similarity,
+        duplicates=duplicates,
     )
     task_service = TaskService(task_repo=task_repo)
-    ai_service = AiSuggestionService(repo=ai_repo)
+    ai_service = AiSuggestionService(repo=ai_repo, task_repo=task_repo, brief_repo=brief_repo, knowledge=knowledge)
     schedule_service = ScheduleService(schedule_repo=schedule_repo)
     news_service = SnsNewsService(news_repo=news_repo)
     pulss_service = PulssChatService(
@@ -81,6 +124,8 @@ def build_services() -> tuple[
         draft_repo=ai_draft_repo,
         client_repo=client_repo,
         pulse_repo=pulse_repo,
+        usage_repo=llm_usage_repo,
+        knowledge=knowledge,
     )
     management_service = ManagementService(
         lead_repo=lead_repo,
@@ -91,8 +136,36 @@ def build_services() -> tuple[
         content_repo=content_repo,
         metric_repo=metric_repo,
         notification_repo=notification_repo,
+        pipeline=pipeline,
+        duplicates=duplicates,
+    )
+    workspace_service = ClientWorkspaceService(
+        client_service=client_service,
+        task_service=task_service,
+        ai_service=ai_service,
+        management_service=management_service,
+        pulss_service=pulss_service,
+    )
+    threading.Thread(
+        target=management_service.refresh_metric_rollups, name="pulss-metric-rollups", daemon=True
+    ).start()
+    rescore_hour = os.getenv("PULSS_LEAD_RESCORE_HOUR_UTC", "18")  # 03:00 JST; empty disables
+    if rescore_hour:
+        start_daily(management_service.rescore_leads, int(rescore_hour), "pulss-lead-rescore")
+    bulk_service = BulkSuggestionService(client_service=client_service, ai_service=ai_service)
+    return (
+        client_service,
+        task_service,
+        ai_service,
+        schedule_service,
+        news_service,
+        management_service,
+        pulss_service,
+        workspace_service,
+        slow_query_log,
+        bulk_service,
+        knowledge,
     )
-    return client_service, task_service, ai_service, schedule_service, news_service, management_service, pulss_service
 
 
 def create_fastapi_app():
@@ -104,6 +177,10 @@ def create_fastapi_app():
         news_service,
         management_service,
         pulss_service,
+        workspace_service,
+        slow_query_log,
+        bulk_service,
+        knowledge,
     ) = build_services()
     return create_app(
         client_service=client_service,
@@ -113,4 +190,8 @@ def create_fastapi_app():
         news_service=news_service,
         management_service=management_service,
         pulss_service=pulss_service,
+        workspace_service=workspace_service,
+        slow_query_log=slow_query_log,
+        bulk_service=bulk_service,
+        knowledge=knowledge,
     )
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_REQUESTS = int(os.getenv("PULSS_BATCH_MAX_REQUESTS", "20") or 20)
+BATCH_TIMEOUT_SECONDS = float(os.getenv("PULSS_BATCH_TIMEOUT_SECONDS", "10") or 10)
+
+READ_METHODS = {"GET", "HEAD"}
+# Headers that describe the outer batch request and must not leak into sub-requests.
+_DROPPED_HEADERS = {b"content-length", b"content-type", b"if-none-match", b"if-modified-since", b"accept-encoding"}
+
+
+@dataclass
+class SubRequest:
+    method: str
+    path: str
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SubResponse:
+    status: int
+    headers: Dict[str, str]
+    body: Any
+
+
+def _build_scope(parent: dict, sub: SubRequest, body: bytes) -> dict:
+    path, _, query = sub.path.partition("?")
+    headers = [(k, v) for k, v in parent.get("headers", []) if k.lower() not in _DROPPED_HEADERS]
+    headers += [(k.lower().encode("latin-1"), str(v).encode("latin-1")) for k, v in sub.headers.items()]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": sub.method,
+        "scheme": parent.get("scheme", "http"),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": parent.get("root_path", ""),
+        "query_string": query.encode("latin-1"),
+        "headers": headers,
+        "client": parent.get("client"),
+        "server": parent.get("server"),
+        "app": parent.get("app"),
+    }
+    # Route-level exception handling (HTTPException -> JSON) reads its handlers from the scope.
+    if "starlette.exception_handlers" in parent:
+        scope["starlette.exception_handlers"] = parent["starlette.exception_handlers"]
+    return scope
+
+
+async def _dispatch(router: Any, parent_scope: dict, sub: SubRequest) -> SubResponse:
+    body = json.dumps(sub.body).encode("utf-8") if sub.body is not None else b""
+    scope = _build_scope(parent_scope, sub, body)
+    sent_request = False
+    status = 500
+    headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def receive() -> dict:
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for k, v in message.get("headers", []):
+                headers[k.decode("latin-1")] = v.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await router(scope, receive, send)
+    except StarletteHTTPException as e:
+        return SubResponse(status=e.status_code, headers={}, body={"detail": e.detail})
+    except Exception:  # noqa: BLE001
+        logger.exception("[pulss] batch sub-request failed: %s %s", sub.method, sub.path)
+        return SubResponse(status=500, headers={}, body={"detail": "Internal server error"})
+
+    raw = b"".join(chunks)
+    payload: Any = None
+    if raw:
+        if headers.get("content-type", "").startswith("application/json"):
+            payload = json.loads(raw)
+        else:
+            payload = raw.decode("utf-8", errors="replace")
+    headers.pop("content-length", None)
+    return SubResponse(status=status, headers=headers, body=payload)
+
+
+async def run_batch(
+    router: Any,
+    parent_scope: dict,
+    requests: List[SubRequest],
+    timeout: float = BATCH_TIMEOUT_SECONDS,
+) -> List[SubResponse]:
+    """Dispatch sub-requests in-process.
+
+    Consecutive reads run concurrently; a write waits for earlier entries and blocks later ones,
+    so read-after-write order inside a batch is preserved. Anything unfinished at the deadline
+    is answered with 504.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    results: List[Optional[SubResponse]] = [None] * len(requests)
+
+    groups: List[List[int]] = []
+    for i, sub in enumerate(requests):
+        if sub.method in READ_METHODS and groups and requests[groups[-1][0]].method in READ_METHODS:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+
+    for group in groups:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        tasks = {asyncio.ensure_future(_dispatch(router, parent_scope, requests[i])): i for i in group}
+        done, pending = await asyncio.wait(tasks.keys(), timeout=remaining)
+        for task in done:
+            results[tasks[task]] = task.result()
+        for task in pending:
+            task.cancel()
+        if pending:
+            break
+
+    return [
+        r if r is not None else SubResponse(status=504, headers={}, body={"detail": "Batch deadline exceeded"})
+        for r in results
+    ]
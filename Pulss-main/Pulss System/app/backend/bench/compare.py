@@ -0,0 +1,58 @@
+"""Compare two bench/run.py result files.
+
+Usage:
+    python bench/compare.py base.json head.json [--threshold 10]
+
+Prints every timing/throughput figure with its relative change and flags changes
+beyond the threshold (percent) as regressions or improvements.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict
+
+# Lower is better for latencies, higher is better for throughput.
+LOWER_IS_BETTER = ("_ms",)
+HIGHER_IS_BETTER = ("rps", "items_per_sec")
+
+
+def _flatten(results: dict) -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    for section in ("micro", "load"):
+        for name, values in results.get(section, {}).items():
+            for key, value in values.items():
+                if key.startswith("llm_"):  # run settings, not measurements
+                    continue
+                if isinstance(value, (int, float)) and (key.endswith(LOWER_IS_BETTER) or key in HIGHER_IS_BETTER):
+                    flat[f"{section}.{name}.{key}"] = float(value)
+    return flat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args()
+
+    base_doc = json.loads(Path(args.base).read_text())
+    head_doc = json.loads(Path(args.head).read_text())
+    if base_doc.get("meta", {}).get("spec") != head_doc.get("meta", {}).get("spec"):
+        print("warning: dataset specs differ; numbers are not directly comparable")
+    print(f"base {base_doc['meta'].get('commit')}  ->  head {head_doc['meta'].get('commit')}")
+
+    base, head = _flatten(base_doc), _flatten(head_doc)
+    for key in sorted(base.keys() & head.keys()):
+        old, new = base[key], head[key]
+        change = (new - old) / old * 100 if old else 0.0
+        better = change < 0 if key.endswith(LOWER_IS_BETTER) else change > 0
+        flag = ""
+        if abs(change) >= args.threshold:
+            flag = "improved" if better else "REGRESSED"
+        print(f"{key:52s} {old:>12.3f} {new:>12.3f} {change:>+8.1f}%  {flag}")
+
+
+if __name__ == "__main__":
+    main()
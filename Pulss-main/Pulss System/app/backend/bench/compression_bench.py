@@ -0,0 +1,139 @@
+"""CPU-vs-bytes tradeoff of gzip/brotli levels on representative API payloads.
+
+Usage (from the backend directory):
+    python bench/compression_bench.py [--rows 200] [--repeat 20] [--json out.json]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from compression import brotli, compress  # noqa: E402
+
+GZIP_LEVELS = [1, 3, 6, 9]
+BROTLI_QUALITIES = [1, 4, 5, 8, 11]
+
+
+def _leads(rows: int, rng: random.Random) -> List[dict]:
+    areas = ["東京都渋谷区", "大阪府大阪市", "福岡県福岡市", "北海道札幌市"]
+    industries = ["飲食", "美容", "ホテル", "小売"]
+    return [
+        {
+            "id": f"{rng.getrandbits(64):016x}",
+            "company_name": f"株式会社サンプル{i}",
+            "industry": rng.choice(industries),
+            "source": rng.choice(["テレアポ", "紹介", "Web問い合わせ"]),
+            "area": rng.choice(areas),
+            "owner": rng.choice(["田中 健", "鈴木 一郎", "佐藤 恵"]),
+            "status": rng.choice(["new", "calling", "meeting_scheduled", "proposal"]),
+            "score": rng.randint(0, 100),
+            "expected_mrr": rng.choice([None, 150000, 300000, 500000]),
+            "last_contact_at": "2026-10-01T10:00:00",
+            "memo": "来月の撮影スケジュールを確認。Instagramリールの運用に関心あり。",
+            "created_at": "2026-09-01T09:00:00",
+            "updated_at": "2026-10-01T10:00:00",
+        }
+        for i in range(rows)
+    ]
+
+
+def _news(rows: int, rng: random.Random) -> List[dict]:
+    return [
+        {
+            "id": f"https://example.com/news/{i}",
+            "title": "Instagramリールがシェア重視にアルゴリズム更新",
+            "summary": "保存・シェアが主要シグナルに。企画の作り方を見直そう。" * rng.randint(1, 3),
+            "url": f"https://example.com/news/{i}",
+            "platform_tags": [rng.choice(["instagram", "tiktok", "youtube", "x"])],
+            "industry_tags": [rng.choice(["food", "beauty", "hotel", "other"])],
+            "source_name": "Social Media Today",
+            "published_at": "2026-10-01T00:00:00",
+            "fetched_at": "2026-10-01T00:05:00",
+        }
+        for i in range(rows)
+    ]
+
+
+def _transcript(rows: int, rng: random.Random) -> List[dict]:
+    lines = [
+        "現在のSNS運用状況を教えてください。",
+        "Instagramを週2回投稿しています。TikTokは未運用です。",
+        "ターゲットは20〜30代のカップルと訪日客です。",
+        "ありがとうございます。次に、参考にしているアカウントはありますか？",
+    ]
+    return [
+        {"role": "assistant" if i % 2 == 0 else "user", "content": rng.choice(lines), "created_at": "2026-10-01T10:00:00"}
+        for i in range(rows)
+    ]
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(rows: int, repeat: int) -> Dict[str, List[dict]]:
+    rng = random.Random(42)
+    payloads = {
+        "leads": _leads(rows, rng),
+        "sns_news": _news(rows, rng),
+        "chat_transcript": _transcript(rows, rng),
+    }
+    results: Dict[str, List[dict]] = {}
+    for name, data in payloads.items():
+        raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        rows_out = []
+        variants = [("gzip", level, gzip.decompress) for level in GZIP_LEVELS]
+        if brotli is not None:
+            variants += [("br", q, brotli.decompress) for q in BROTLI_QUALITIES]
+        for encoding, level, decompress in variants:
+            blob = compress(raw, encoding, level)
+            rows_out.append(
+                {
+                    "encoding": encoding,
+                    "level": level,
+                    "raw_bytes": len(raw),
+                    "compressed_bytes": len(blob),
+                    "ratio": round(len(blob) / len(raw), 4),
+                    "compress_ms": round(_time(lambda: compress(raw, encoding, level), repeat), 3),
+                    "decompress_ms": round(_time(lambda: decompress(blob), repeat), 3),
+                }
+            )
+        results[name] = rows_out
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    for name, rows in results.items():
+        print(f"\n== {name} ({rows[0]['raw_bytes']} bytes raw)")
+        print(f"{'enc':<5}{'lvl':>4}{'bytes':>10}{'ratio':>8}{'comp ms':>10}{'decomp ms':>11}")
+        for r in rows:
+            print(
+                f"{r['encoding']:<5}{r['level']:>4}{r['compressed_bytes']:>10}{r['ratio']:>8.3f}"
+                f"{r['compress_ms']:>10.3f}{r['decompress_ms']:>11.3f}"
+            )
+    if brotli is None:
+        print("\n(brotli not installed; only gzip measured)")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Deterministic synthetic dataset for benchmarks.
+
+Runs the regular seed_data, then adds N clients with tasks, chat history, metrics,
+plus leads, schedules and SNS news. The same --seed produces the same rows, ids and
+timestamps included (all relative to AS_OF); only the ETag bookkeeping in
+table_versions differs.
+
+Usage (from the backend directory):
+    python bench/datagen.py --db /tmp/pulss_bench.db [--clients 200] [--tasks 12] [--messages 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from domain import (  # noqa: E402
+    Client,
+    ClientPhase,
+    ClientStatus,
+    Lead,
+    LeadStatus,
+    MetricSnapshot,
+    PulssChatMessage,
+    PulssChatSession,
+    ScheduleEvent,
+    SnsNews,
+    Task,
+    TaskCategory,
+    TaskStatus,
+)
+from infrastructure import (  # noqa: E402
+    ClientRepository,
+    Database,
+    LeadRepository,
+    MetricSnapshotRepository,
+    PulssChatMessageRepository,
+    PulssChatSessionRepository,
+    ScheduleRepository,
+    SnsNewsRepository,
+    TaskRepository,
+    TaskTemplateRepository,
+    seed_data,
+)
+from timeseries import month_index, period_label  # noqa: E402
+
+# Fixed reference time so generated timestamps do not depend on when the bench runs.
+AS_OF = datetime(2026, 10, 1, 9, 0, 0)
+
+INDUSTRIES = ["飲食", "美容", "ホテル", "小売", "不動産", "教育"]
+AREAS = ["東京都渋谷区", "大阪府大阪市", "福岡県福岡市", "北海道札幌市", "愛知県名古屋市"]
+OWNERS = ["田中 健", "鈴木 一郎", "佐藤 恵", "高橋 直子"]
+TEAMS = ["sales", "director", "creative"]
+PLATFORMS = ["instagram", "tiktok", "youtube", "x"]
+NEWS_INDUSTRIES = ["food", "beauty", "hotel", "other"]
+TASK_TITLES = ["撮影準備", "投稿カレンダー作成", "月次レポート", "リール編集", "KPIレビュー", "広告入稿"]
+CHAT_LINES = [
+    "現在はInstagramを週2回更新しています。",
+    "来店につながる投稿を増やしたいです。",
+    "ターゲットは20〜30代の女性です。",
+    "強みは国産食材と個室の多さです。",
+    "予算は月30万円程度を想定しています。",
+]
+
+
+@dataclass
+class DatasetSpec:
+    clients: int = 50
+    tasks_per_client: int = 12
+    messages_per_client: int = 20
+    metric_months: int = 12
+    leads: int = 500
+    schedules: int = 300
+    news: int = 200
+    seed: int = 42
+
+
+def _id(rng: random.Random) -> str:
+    return f"{rng.getrandbits(128):032x}"
+
+
+def generate(db: Database, spec: DatasetSpec) -> Dict[str, int]:
+    """Populate db according to spec; returns row counts per table."""
+    rng = random.Random(spec.seed)
+    # Bulk load: durability does not matter for a throwaway bench database.
+    db.conn.execute("PRAGMA synchronous=OFF")
+
+    client_repo = ClientRepository(db)
+    task_repo = TaskRepository(db)
+    # Own stream for the demo rows, so the bench rows below do not shift if seed_data changes.
+    seed_rng = random.Random(f"{spec.seed}:seed_data")
+    seed_data(client_repo, TaskTemplateRepository(), task_repo, now=AS_OF, new_id=lambda: _id(seed_rng))
+    session_repo = PulssChatSessionRepository(db)
+    message_repo = PulssChatMessageRepository(db)
+    metric_repo = MetricSnapshotRepository(db)
+    lead_repo = LeadRepository(db)
+    schedule_repo = ScheduleRepository(db)
+    news_repo = SnsNewsRepository(db)
+
+    for i in range(spec.clients):
+        created = AS_OF - timedelta(days=rng.randint(30, 720))
+        contracted = rng.random() < 0.7
+        client = client_repo.upsert(
+            Client(
+                id=_id(rng),
+                name=f"ベンチ株式会社{i:05d}",
+                industry=rng.choice(INDUSTRIES),
+                status=ClientStatus.CONTRACTED if contracted else ClientStatus.PRE_CONTRACT,
+                phase=rng.choice(list(ClientPhase)),
+                sales_owner=rng.choice(OWNERS),
+                director_owner=rng.choice(OWNERS),
+                slack_url=None,
+                memo="ベンチマーク用のダミークライアント",
+                onboarding_completed_at=None,
+                last_contact_at=AS_OF - timedelta(days=rng.randint(0, 40)),
+                created_at=created,
+                updated_at=created,
+            )
+        )
+        for t in range(spec.tasks_per_client):
+            status = rng.choice(list(TaskStatus))
+            task_repo.add(
+                Task(
+                    id=_id(rng),
+                    client_id=client.id,
+                    title=f"{rng.choice(TASK_TITLES)} #{t}",
+                    description=None,
+                    category=rng.choice(list(TaskCategory)),
+                    status=status,
+                    due_date=(AS_OF + timedelta(days=rng.randint(-20, 40))).date(),
+                    completed_at=AS_OF if status == TaskStatus.DONE else None,
+                    assignee=rng.choice(OWNERS),
+                    source="bench",
+                    template_id=None,
+                    created_at=created,
+                    updated_at=created,
+                )
+            )
+        if spec.messages_per_client:
+            session = session_repo.add(
+                PulssChatSession(id=_id(rng), client_id=client.id, status="active", created_at=created)
+            )
+            for m in range(spec.messages_per_client):
+                message_repo.add(
+                    PulssChatMessage(
+                        id=_id(rng),
+                        session_id=session.id,
+                        role="user" if m % 2 else "assistant",
+                        content=rng.choice(CHAT_LINES),
+                        created_at=created + timedelta(minutes=m),
+                    )
+                )
+        for month in range(spec.metric_months):
+            period = period_label(month_index(f"{AS_OF:%Y-%m}") - month)
+            metric_repo.add(
+                MetricSnapshot(
+                    id=_id(rng),
+                    client_id=client.id,
+                    period=period,
+                    metrics={
+                        "followers": rng.randint(500, 50000),
+                        "reach": rng.randint(1000, 200000),
+                        "engagement_rate": round(rng.uniform(0.5, 8.0), 2),
+                    },
+                    created_at=AS_OF,
+                )
+            )
+
+    for i in range(spec.leads):
+        created = AS_OF - timedelta(days=rng.randint(0, 365))
+        lead_repo.add(
+            Lead(
+                id=_id(rng),
+                company_name=f"見込み商店{i:05d}",
+                industry=rng.choice(INDUSTRIES),
+                source=rng.choice(["テレアポ", "紹介", "Web問い合わせ"]),
+                area=rng.choice(AREAS),
+                owner=rng.choice(OWNERS),
+                status=rng.choice(list(LeadStatus)),
+                score=rng.randint(0, 100),
+                expected_mrr=rng.choice([None, 150000, 300000, 500000]),
+                last_contact_at=created + timedelta(days=rng.randint(0, 30)),
+                memo="Instagramリールの運用に関心あり。",
+                created_at=created,
+                updated_at=created,
+            )
+        )
+
+    for i in range(spec.schedules):
+        start = AS_OF + timedelta(days=rng.randint(-30, 60), hours=rng.randint(0, 9))
+        schedule_repo.add(
+            ScheduleEvent(
+                id=_id(rng),
+                title=f"打ち合わせ {i}",
+                start=start,
+                end=start + timedelta(minutes=rng.choice([30, 60, 90])),
+                type=rng.choice(["meeting", "shooting", "internal"]),
+                team=rng.choice(TEAMS),
+            )
+        )
+
+    news_repo.add_many(
+        [
+            SnsNews(
+                id=_id(rng),
+                title=f"{rng.choice(PLATFORMS)} のアルゴリズム更新 {i}",
+                summary="保存・シェアが主要シグナルに。企画の作り方を見直そう。" * rng.randint(1, 3),
+                url=f"https://example.com/news/{i}",
+                platform_tags=[rng.choice(PLATFORMS)],
+                industry_tags=rng.sample(NEWS_INDUSTRIES, rng.randint(1, 3)),
+                source_name="Bench Media",
+                published_at=AS_OF - timedelta(hours=i),
+                fetched_at=AS_OF,
+            )
+            for i in range(spec.news)
+        ]
+    )
+    db.conn.commit()
+
+    tables = ["clients", "tasks", "pulss_chat_messages", "metric_snapshots", "leads", "schedules", "sns_news"]
+    return {t: db.conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables}
+
+
+def build_database(path: str, spec: DatasetSpec) -> Dict[str, int]:
+    """Create a fresh database file at path and fill it."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    db = Database(path)
+    try:
+        return generate(db, spec)
+    finally:
+        db.conn.close()
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSpec()
+    parser.add_argument("--clients", type=int, default=defaults.clients)
+    parser.add_argument("--tasks", type=int, default=defaults.tasks_per_client, help="tasks per client")
+    parser.add_argument("--messages", type=int, default=defaults.messages_per_client, help="chat messages per client")
+    parser.add_argument("--metric-months", type=int, default=defaults.metric_months)
+    parser.add_argument("--leads", type=int, default=defaults.leads)
+    parser.add_argument("--schedules", type=int, default=defaults.schedules)
+    parser.add_argument("--news", type=int, default=defaults.news)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    return DatasetSpec(
+        clients=args.clients,
+        tasks_per_client=args.tasks,
+        messages_per_client=args.messages,
+        metric_months=args.metric_months,
+        leads=args.leads,
+        schedules=args.schedules,
+        news=args.news,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="bench.db")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+    start = time.perf_counter()
+    counts = build_database(args.db, spec)
+    print(json.dumps({"spec": asdict(spec), "rows": counts, "seconds": round(time.perf_counter() - start, 2)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Local stand-in for OpenAI Chat Completions and the n8n webhooks.
+
+Deterministic (seeded) latency, error injection and token pacing, so chat/news load,
+timeouts and retries can be exercised offline.
+
+Usage (from the backend directory):
+    python bench/fake_upstream.py --port 8900 --latency-ms 400 --latency-dist lognormal \\
+        --error-rate 0.02 --tokens-per-sec 60
+
+Then point the backend at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=dummy \\
+    N8N_NEWS_WEBHOOK_URL=http://127.0.0.1:8900/webhook/sns-marketing-news \\
+    PULSS_N8N_TOUCHPOINT_WEBHOOK_URL=http://127.0.0.1:8900/webhook/ai-touchpoint-draft \\
+    uvicorn main:app
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+REPLY = "承知しました。現在のSNS運用状況について、もう少し詳しく教えてください。投稿頻度や反応の良かった企画はありますか？"
+
+
+@dataclass
+class FakeUpstreamConfig:
+    latency_ms: float = 300.0
+    latency_jitter_ms: float = 100.0
+    latency_dist: str = "normal"
+    error_rate: float = 0.0
+    error_statuses: tuple = (429, 500, 503)
+    retry_after_seconds: int = 1
+    tokens_per_sec: float = 0.0  # 0 = reply tokens cost no extra time
+    reply_tokens: int = 60
+    news_items: int = 20
+    seed: int = 42
+
+
+class FakeUpstream:
+    def __init__(self, config: FakeUpstreamConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats: Counter = Counter()
+
+    def latency(self) -> float:
+        """Time to first byte in seconds, drawn from the configured distribution."""
+        c = self.config
+        mean, jitter = c.latency_ms, c.latency_jitter_ms
+        if c.latency_dist == "fixed":
+            ms = mean
+        elif c.latency_dist == "uniform":
+            ms = self.rng.uniform(mean - jitter, mean + jitter)
+        elif c.latency_dist == "lognormal":
+            # Long right tail, median ~= mean.
+            sigma = jitter / mean if mean else 0.0
+            ms = mean * self.rng.lognormvariate(0.0, sigma)
+        elif c.latency_dist == "exponential":
+            ms = self.rng.expovariate(1.0 / mean) if mean else 0.0
+        else:
+            ms = self.rng.gauss(mean, jitter)
+        return max(0.0, ms) / 1000
+
+    def maybe_error(self, kind: str) -> JSONResponse | None:
+        if self.config.error_rate <= 0 or self.rng.random() >= self.config.error_rate:
+            return None
+        status = self.rng.choice(self.config.error_statuses)
+        self.stats[f"{kind}.error.{status}"] += 1
+        headers = {"Retry-After": str(self.config.retry_after_seconds)} if status in (429, 503) else {}
+        return JSONResponse(
+            {"error": {"message": f"injected {status}", "type": "fake_upstream"}}, status_code=status, headers=headers
+        )
+
+    def reply_tokens(self) -> List[str]:
+        text = REPLY
+        # ~2 characters per token is close enough for Japanese text.
+        tokens = [text[i : i + 2] for i in range(0, len(text), 2)]
+        return (tokens * (self.config.reply_tokens // len(tokens) + 1))[: self.config.reply_tokens]
+
+    def news(self) -> List[Dict[str, Any]]:
+        now = datetime.utcnow()
+        platforms = ["instagram", "tiktok", "youtube", "x"]
+        return [
+            {
+                "title": f"{platforms[i % 4]} の最新アップデート {i}",
+                "summary": "保存・シェアが主要シグナルに。企画の作り方を見直そう。",
+                "url": f"https://fake-upstream.local/news/{i}",
+                "platform_tags": [platforms[i % 4]],
+                "industry_tags": ["food", "beauty"] if i % 2 else ["hotel", "other"],
+                "source_name": "Fake Upstream",
+                "published_at": (now - timedelta(hours=i)).isoformat(),
+            }
+            for i in range(self.config.news_items)
+        ]
+
+
+def create_fake_app(config: FakeUpstreamConfig) -> FastAPI:
+    upstream = FakeUpstream(config)
+    app = FastAPI(title="Pulss fake upstream")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Any:
+        body = await request.json()
+        upstream.stats["chat.requests"] += 1
+        await asyncio.sleep(upstream.latency())
+        error = upstream.maybe_error("chat")
+        if error:
+            return error
+        tokens = upstream.reply_tokens()
+        prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 2
+        created = int(time.time())
+        model = body.get("model", "fake-model")
+        per_token = 1.0 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+
+        if body.get("stream"):
+            upstream.stats["chat.stream"] += 1
+
+            async def events() -> AsyncIterator[bytes]:
+                for tok in tokens:
+                    if per_token:
+                        await asyncio.sleep(per_token)
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": tok}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+                done = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(done)}\n\n".encode("utf-8")
+                yield b"data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        if per_token:
+            await asyncio.sleep(per_token * len(tokens))
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(tokens),
+                "total_tokens": prompt_tokens + len(tokens),
+            },
+        }
+
+    @app.api_route("/webhook/sns-marketing-news", methods=["GET", "POST"])
+    async def news_webhook() -> Any:
+        upstream.stats["news.requests"] += 1
+        await asyncio.sleep(upstream.latency())
+        return upstream.maybe_error("news") or upstream.news()
+
+    @app.post("/webhook/ai-touchpoint-draft")
+    async def touchpoint_webhook(request: Request) -> Any:
+        await request.body()
+        upstream.stats["touchpoint.requests"] += 1
+        await asyncio.sleep(upstream.latency())
+        return upstream.maybe_error("touchpoint") or {"ok": True}
+
+    @app.get("/stats")
+    def stats() -> Dict[str, Any]:
+        return {"config": asdict(config), "counts": dict(upstream.stats)}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = FakeUpstreamConfig()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--latency-jitter-ms", type=float, default=defaults.latency_jitter_ms)
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default=defaults.latency_dist)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="0..1")
+    parser.add_argument(
+        "--error-statuses", default=",".join(str(s) for s in defaults.error_statuses), help="comma separated"
+    )
+    parser.add_argument("--retry-after", type=int, default=defaults.retry_after_seconds)
+    parser.add_argument("--tokens-per-sec", type=float, default=defaults.tokens_per_sec)
+    parser.add_argument("--reply-tokens", type=int, default=defaults.reply_tokens)
+    parser.add_argument("--news-items", type=int, default=defaults.news_items)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    config = FakeUpstreamConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_dist=args.latency_dist,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(",") if s.strip()),
+        retry_after_seconds=args.retry_after,
+        tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens,
+        news_items=args.news_items,
+        seed=args.seed,
+    )
+    import uvicorn
+
+    uvicorn.run(create_fake_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""In-process load driver for the main API endpoints.
+
+Builds the real app against a bench database (see datagen.py) and drives it through
+httpx's ASGI transport, so no server or network is involved. Chat uses a fake LLM with
+configurable latency instead of OpenAI, unless --real-llm is given (then the configured
+OPENAI_BASE_URL is called, e.g. bench/fake_upstream.py).
+
+Usage (from the backend directory):
+    python bench/load.py --db /tmp/pulss_bench.db [--requests 200] [--concurrency 8] [--llm-latency-ms 300]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from openai_client import ChatCompletion  # noqa: E402
+
+SCENARIOS = ["clients", "director_board", "sns_news", "chat"]
+
+
+class FakeLLM:
+    """Stand-in for OpenAIChatClient.create: sleeps like a remote call, then answers.
+
+    Patched below the admission controller, so queueing and shedding are part of the measurement.
+    """
+
+    def __init__(self, latency_ms: float, jitter_ms: float = 0.0, seed: int = 42) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self, messages: List[Dict[str, str]], model: Optional[str] = None) -> ChatCompletion:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        time.sleep(delay)
+        content = f"承知しました。（{len(messages)}件の履歴を確認しました）次に、現在の課題を教えてください。"
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 2
+        return ChatCompletion(content, model or "fake-llm", prompt_tokens, len(content) // 2)
+
+
+def summarize(latencies: List[float], statuses: List[int], wall: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+
+    def pct(p: float) -> float:
+        if not ordered:
+            return 0.0
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "requests": len(latencies),
+        "errors": sum(1 for s in statuses if s >= 400),
+        "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+async def _drive(
+    make_request: Callable[[int], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: List[int] = []
+    counter = iter(range(requests))
+
+    async def worker(worker_id: int) -> None:
+        for _ in counter:
+            start = time.perf_counter()
+            resp = await make_request(worker_id)
+            latencies.append(time.perf_counter() - start)
+            statuses.append(resp.status_code)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - wall_start)
+
+
+async def run_load_async(
+    requests: int = 200,
+    concurrency: int = 8,
+    llm_latency_ms: float = 300.0,
+    scenarios: Optional[List[str]] = None,
+    real_llm: bool = False,
+) -> Dict[str, Any]:
+    # Imported here so PULSS_DB_PATH set by the caller is honoured.
+    from api import create_app
+    from app import build_services
+
+    (
+        client_service,
+        task_service,
+        ai_service,
+        schedule_service,
+        news_service,
+        management_service,
+        pulss_service,
+        workspace_service,
+        slow_query_log,
+        bulk_service,
+        knowledge,
+    ) = build_services()
+    fake_llm = FakeLLM(llm_latency_ms, jitter_ms=llm_latency_ms * 0.2)
+    if not real_llm:
+        # A key must be present for the service to reach the (fake) client at all.
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        pulss_service.openai_client.create = fake_llm  # type: ignore[method-assign]
+    app = create_app(
+        client_service=client_service,
+        task_service=task_service,
+        ai_service=ai_service,
+        schedule_service=schedule_service,
+        news_service=news_service,
+        management_service=management_service,
+        pulss_service=pulss_service,
+        workspace_service=workspace_service,
+        slow_query_log=slow_query_log,
+        bulk_service=bulk_service,
+        knowledge=knowledge,
+    )
+
+    results: Dict[str, Any] = {}
+    # Unhandled app errors become 500s and are counted, instead of aborting the run.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as http:
+        client_ids = [c["id"] for c in (await http.get("/api/clients")).json()]
+        wanted = scenarios or SCENARIOS
+
+        if "clients" in wanted:
+            results["clients"] = await _drive(lambda _: http.get("/api/clients"), requests, concurrency)
+        if "director_board" in wanted:
+            results["director_board"] = await _drive(
+                lambda _: http.get("/api/director-board/clients"), requests, concurrency
+            )
+        if "sns_news" in wanted:
+            results["sns_news"] = await _drive(
+                lambda i: http.get("/api/sns-news", params={"platform": ["all", "instagram", "tiktok"][i % 3]}),
+                requests,
+                concurrency,
+            )
+        if "chat" in wanted and client_ids:
+            # One session per virtual user, each on its own client.
+            sessions: List[str] = []
+            for i in range(concurrency):
+                cid = client_ids[i % len(client_ids)]
+                token = (await http.post(f"/api/clients/{cid}/pulss-link")).json()["token"]
+                started = await http.post(f"/api/pulss-chat/start-from-link/{token}")
+                if started.status_code != 200:
+                    raise RuntimeError(f"chat setup failed: {started.status_code} {started.text}")
+                sessions.append(started.json()["session_id"])
+            results["chat"] = await _drive(
+                lambda i: http.post(
+                    f"/api/pulss-chat/sessions/{sessions[i]}/messages",
+                    json={"user_message": "来店につながる投稿を増やしたいです。"},
+                ),
+                requests,
+                concurrency,
+            )
+            if not real_llm:
+                results["chat"]["llm_latency_ms"] = llm_latency_ms
+                results["chat"]["llm_calls"] = fake_llm.calls
+    return results
+
+
+def run_load(db_path: str, **kwargs: Any) -> Dict[str, Any]:
+    os.environ["PULSS_DB_PATH"] = db_path
+    return asyncio.run(run_load_async(**kwargs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeatable; default all")
+    parser.add_argument("--real-llm", action="store_true", help="call OPENAI_BASE_URL instead of the in-process fake")
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run_load(
+        args.db,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        llm_latency_ms=args.llm_latency_ms,
+        scenarios=args.scenario,
+        real_llm=args.real_llm,
+    )
+    for name, r in results.items():
+        print(
+            f"{name:16s} {r['requests']:>5d} req  {r['rps']:>8.1f} rps  "
+            f"p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}  p99 {r['p99_ms']:>8.2f} ms  errors {r['errors']}"
+        )
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Microbenchmarks for repository row mapping and response serialization.
+
+Usage (from the backend directory, against a database built by datagen.py):
+    python bench/micro.py --db /tmp/pulss_bench.db [--repeat 20] [--json out.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from api import ClientSummaryOut, LeadOut, SnsNewsOut, TaskOut  # noqa: E402
+from infrastructure import (  # noqa: E402
+    ClientRepository,
+    Database,
+    LeadRepository,
+    PulssChatMessageRepository,
+    SnsNewsRepository,
+    TaskRepository,
+)
+
+
+def measure(fn: Callable[[], Any], repeat: int, items: int) -> Dict[str, float]:
+    """Run fn repeat times (after one warm-up); items is the number of rows handled per run."""
+    fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    return {
+        "items": items,
+        "median_ms": round(median * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "items_per_sec": round(items / median, 1) if median else 0.0,
+    }
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def run_micro(db: Database, repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    client_repo = ClientRepository(db)
+    task_repo = TaskRepository(db)
+    lead_repo = LeadRepository(db)
+    news_repo = SnsNewsRepository(db)
+    message_repo = PulssChatMessageRepository(db)
+
+    clients = client_repo.list()
+    client_ids = [c.id for c in clients]
+    leads = lead_repo.list()
+    news = news_repo.list(limit=10_000)
+    tasks = [t for cid in client_ids for t in task_repo.list_by_client(cid)]
+    session_row = db.conn.execute(
+        "SELECT session_id, COUNT(*) AS n FROM pulss_chat_messages GROUP BY session_id ORDER BY n DESC LIMIT 1"
+    ).fetchone()
+    session_id = session_row["session_id"] if session_row else ""
+    message_count = session_row["n"] if session_row else 0
+
+    lead_models = [LeadOut.from_domain(lead) for lead in leads]
+    lead_adapter = TypeAdapter(List[LeadOut])
+    task_models = [TaskOut.from_domain(t) for t in tasks]
+    task_adapter = TypeAdapter(List[TaskOut])
+
+    results: Dict[str, Dict[str, float]] = {
+        # Row mapping: SELECT + sqlite3.Row -> domain dataclass.
+        "map.clients.list": measure(client_repo.list, repeat, len(clients)),
+        "map.tasks.per_client": measure(
+            lambda: [task_repo.list_by_client(cid) for cid in client_ids], repeat, len(tasks)
+        ),
+        "map.leads.list": measure(lead_repo.list, repeat, len(leads)),
+        "map.sns_news.list": measure(lambda: news_repo.list(limit=10_000), repeat, len(news)),
+        "map.chat.history": measure(lambda: message_repo.list_for_session(session_id), repeat, message_count),
+        # Serialization: domain -> Out models -> JSON bytes.
+        "ser.leads.from_domain": measure(lambda: [LeadOut.from_domain(lead) for lead in leads], repeat, len(leads)),
+        "ser.leads.jsonable_dumps": measure(lambda: _dumps(lead_models), repeat, len(leads)),
+        "ser.leads.pydantic_dump_json": measure(lambda: lead_adapter.dump_json(lead_models), repeat, len(leads)),
+        "ser.tasks.jsonable_dumps": measure(lambda: _dumps(task_models), repeat, len(tasks)),
+        "ser.tasks.pydantic_dump_json": measure(lambda: task_adapter.dump_json(task_models), repeat, len(tasks)),
+        "ser.news.from_domain_dumps": measure(
+            lambda: _dumps([SnsNewsOut.from_domain(n) for n in news]), repeat, len(news)
+        ),
+        "ser.clients.summary_dumps": measure(
+            lambda: _dumps([ClientSummaryOut.from_domain(c, None, False) for c in clients]), repeat, len(clients)
+        ),
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    results = run_micro(db, args.repeat)
+    for name, r in results.items():
+        print(f"{name:32s} {r['items']:>7d} items  median {r['median_ms']:>9.3f} ms  {r['items_per_sec']:>12.1f} items/s")
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
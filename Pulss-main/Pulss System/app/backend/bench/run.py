@@ -0,0 +1,100 @@
+"""Full benchmark run: generate data, run microbenchmarks and the load driver, write one JSON file.
+
+Results carry the git commit and dataset spec so two runs can be diffed with compare.py.
+
+Usage (from the backend directory):
+    python bench/run.py --out bench-results.json [--clients 200] [--requests 300] [--concurrency 8]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from datagen import add_spec_arguments, build_database, spec_from_args  # noqa: E402
+from load import SCENARIOS, run_load  # noqa: E402
+from micro import run_micro  # noqa: E402
+
+from infrastructure import Database  # noqa: E402
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="bench-results.json")
+    parser.add_argument("--db", help="database path (default: a temporary file)")
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20, help="microbenchmark repetitions")
+    parser.add_argument("--requests", type=int, default=200, help="requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    spec = spec_from_args(args)
+    db_path = args.db or str(Path(tempfile.mkdtemp(prefix="pulss-bench-")) / "bench.db")
+    start = time.perf_counter()
+    rows = build_database(db_path, spec)
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spec": asdict(spec),
+            "rows": rows,
+            "datagen_seconds": round(time.perf_counter() - start, 2),
+            "load": {
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "llm_latency_ms": args.llm_latency_ms,
+            },
+        }
+    }
+    if not args.skip_micro:
+        db = Database(db_path)
+        try:
+            results["micro"] = run_micro(db, args.repeat)
+        finally:
+            db.conn.close()
+    if not args.skip_load:
+        results["load"] = run_load(
+            db_path,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            llm_latency_ms=args.llm_latency_ms,
+            scenarios=args.scenario,
+        )
+    Path(args.out).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from embeddings import HashingEmbedder
+from infrastructure import Database
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_LATENCY = REGISTRY.histogram("pulss_similar_clients_seconds", "Similar-clients lookup time.")
+INDEXED_CLIENTS = REGISTRY.gauge("pulss_similar_clients_indexed", "Clients in the similarity index.")
+
+# Pulse answers that describe who the client sells to and why they are chosen.
+PROFILE_FIELDS = ("target", "strengths_usp", "product_summary", "problem", "current_sns")
+
+
+@dataclass
+class SimilarClient:
+    client_id: str
+    name: str
+    industry: str
+    phase: str
+    score: float
+
+
+class ClientFeatureBuilder:
+    """Client + latest pulse response + latest metric snapshot -> unit vector.
+
+    Blocks (each L2-normalised, then weighted): industry and stage (phase/status) as hashed
+    one-hots, the pulse profile text as a hashed n-gram embedding, and the metric profile as
+    log-scaled values bucketed by metric name. A missing block is left at zero, so clients
+    without a pulse response still match on industry and metrics.
+    """
+
+    WEIGHTS = {"industry": 1.0, "stage": 0.3, "profile": 1.0, "metrics": 0.5}
+
+    def __init__(self, text_dim: int = 256, category_dim: int = 32, metric_dim: int = 16) -> None:
+        self.embedder = HashingEmbedder(text_dim)
+        self.category_dim = category_dim
+        self.metric_dim = metric_dim
+        self.dim = 2 * category_dim + text_dim + metric_dim
+
+    def _onehot(self, values: List[str]) -> np.ndarray:
+        vec = np.zeros(self.category_dim, dtype=np.float32)
+        for v in values:
+            if v:
+                vec[zlib.crc32(v.encode("utf-8")) % self.category_dim] += 1.0
+        return vec
+
+    def _metrics(self, metrics: Optional[dict]) -> np.ndarray:
+        vec = np.zeros(self.metric_dim, dtype=np.float32)
+        for name, value in (metrics or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                vec[zlib.crc32(name.encode("utf-8")) % self.metric_dim] += math.log1p(abs(value))
+        return vec
+
+    def build(self, industry: str, phase: str, status: str, profile: str, metrics: Optional[dict]) -> np.ndarray:
+        blocks = [
+            ("industry", self._onehot([f"industry:{industry}"])),
+            ("stage", self._onehot([f"phase:{phase}", f"status:{status}"])),
+            ("profile", self.embedder.embed(profile) if profile else np.zeros(self.embedder.dim, dtype=np.float32)),
+            ("metrics", self._metrics(metrics)),
+        ]
+        parts = []
+        for name, block in blocks:
+            norm = float(np.linalg.norm(block))
+            parts.append(block * (self.WEIGHTS[name] / norm) if norm else block)
+        vec = np.concatenate(parts)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+
+class ClientSimilarityIndex:
+    """One feature row per client in a NumPy matrix; similar() is a single matrix-vector product.
+
+    A full N x N similarity matrix would be O(N^2) memory and O(N) work per update; scoring one
+    client against all rows is O(N * dim) (a few ms for tens of thousands of clients) and an
+    update only rewrites that client's row. Rows are built lazily on first use and kept current
+    through Database.on_write for clients, pulse_responses and metric_snapshots.
+    """
+
+    def __init__(self, db: Database, builder: Optional[ClientFeatureBuilder] = None) -> None:
+        self.db = db
+        self.builder = builder or ClientFeatureBuilder()
+        self._lock = threading.RLock()
+        self._built = False
+        self._matrix = np.zeros((0, self.builder.dim), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._meta: List[Tuple[str, str, str]] = []  # name, industry, phase
+
+    def attach(self) -> None:
+        self.db.on_write("clients", lambda items: self.refresh([c.id for c in items]))
+        self.db.on_write("pulse_responses", lambda items: self.refresh([p.client_id for p in items]))
+        self.db.on_write("metric_snapshots", lambda items: self.refresh([m.client_id for m in items]))
+
+    # -- building ----------------------------------------------------------
+
+    def _features(self, client: Any, pulse: Any, metrics: Optional[str]) -> np.ndarray:
+        profile = "\n".join(pulse[f] for f in PROFILE_FIELDS if pulse and pulse[f])
+        return self.builder.build(
+            client["industry"] or "", client["phase"] or "", client["status"] or "", profile, json.loads(metrics or "{}")
+        )
+
+    def _put(self, client: Any, vec: np.ndarray) -> None:
+        row = self._rows.get(client["id"])
+        if row is None:
+            if self._size == len(self._matrix):
+                grown = np.zeros((max(64, 2 * len(self._matrix)), self.builder.dim), dtype=np.float32)
+                grown[: self._size] = self._matrix[: self._size]
+                self._matrix = grown
+            row = self._size
+            self._size += 1
+            self._rows[client["id"]] = row
+            self._ids.append(client["id"])
+            self._meta.append(("", "", ""))
+        self._matrix[row] = vec
+        self._meta[row] = (client["name"] or "", client["industry"] or "", client["phase"] or "")
+
+    def build(self) -> None:
+        """(Re)build every row: three scans, latest pulse/snapshot per client picked in SQL."""
+        with self._lock:
+            self._build()
+
+    def _build(self) -> None:
+        started = time.perf_counter()
+        conn = self.db.conn
+        clients = conn.execute("SELECT id, name, industry, status, phase FROM clients").fetchall()
+        pulses = {
+            r["client_id"]: r
+            for r in conn.execute(
+                "SELECT * FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY submitted_at DESC) AS rn "
+                "FROM pulse_responses) WHERE rn = 1"
+            )
+        }
+        metrics = {
+            r["client_id"]: r["metrics"]
+            for r in conn.execute(
+                "SELECT client_id, metrics FROM (SELECT client_id, metrics, ROW_NUMBER() OVER "
+                "(PARTITION BY client_id ORDER BY period DESC) AS rn FROM metric_snapshots) WHERE rn = 1"
+            )
+        }
+        for client in clients:
+            self._put(client, self._features(client, pulses.get(client["id"]), metrics.get(client["id"])))
+        self._built = True
+        INDEXED_CLIENTS.set(value=self._size)
+        logger.info("[pulss] similarity index built: %d clients in %.0fms", len(clients), (time.perf_counter() - started) * 1000)
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._build()
+
+    def refresh(self, client_ids: List[str]) -> None:
+        """Recompute the rows of clients whose data just changed."""
+        with self._lock:
+            if self._built:
+                self._refresh(client_ids)
+            # otherwise the first build reads the change (it is committed before on_write fires)
+
+    def _refresh(self, client_ids: List[str]) -> None:
+        conn = self.db.conn
+        for client_id in dict.fromkeys(client_ids):
+            client = conn.execute(
+                "SELECT id, name, industry, status, phase FROM clients WHERE id = ?", (client_id,)
+            ).fetchone()
+            if not client:
+                continue
+            pulse = conn.execute(
+                "SELECT * FROM pulse_responses WHERE client_id = ? ORDER BY submitted_at DESC LIMIT 1", (client_id,)
+            ).fetchone()
+            snap = conn.execute(
+                "SELECT metrics FROM metric_snapshots WHERE client_id = ? ORDER BY period DESC LIMIT 1", (client_id,)
+            ).fetchone()
+            self._put(client, self._features(client, pulse, snap["metrics"] if snap else None))
+        INDEXED_CLIENTS.set(value=self._size)
+
+    # -- querying ----------------------------------------------------------
+
+    def similar(self, client_id: str, k: int = 10, same_industry: bool = False) -> Optional[List[SimilarClient]]:
+        """Top-k most similar other clients, or None if the client is unknown."""
+        self._ensure_built()
+        started = time.perf_counter()
+        with self._lock:
+            row = self._rows.get(client_id)
+            if row is None:
+                # Written before attach() or by another process; index it now.
+                self._refresh([client_id])
+                row = self._rows.get(client_id)
+            if row is None:
+                return None
+            size = self._size
+            matrix = self._matrix
+            query = matrix[row].copy()
+            ids = self._ids[:size]
+            meta = self._meta[:size]
+        scores = matrix[:size] @ query
+        scores[row] = -np.inf
+        if same_industry:
+            industry = meta[row][1]
+            scores[[i for i, m in enumerate(meta) if m[1] != industry]] = -np.inf
+        take = min(k, size - 1)
+        if take <= 0:
+            return []
+        top = np.argpartition(-scores, take - 1)[:take]
+        top = top[np.argsort(-scores[top])]
+        SIMILAR_LATENCY.observe(value=time.perf_counter() - started)
+        return [
+            SimilarClient(
+                client_id=ids[i],
+                name=meta[i][0],
+                industry=meta[i][1],
+                phase=meta[i][2],
+                score=round(float(scores[i]), 4),
+            )
+            for i in top
+            if np.isfinite(scores[i])
+        ]
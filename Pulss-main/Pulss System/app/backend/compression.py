@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import gzip
+import os
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # brotli is optional; gzip is always available.
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("PULSS_COMPRESSION_MIN_BYTES", "1024") or 1024)
+GZIP_LEVEL = int(os.getenv("PULSS_GZIP_LEVEL", "6") or 6)
+BROTLI_QUALITY = int(os.getenv("PULSS_BROTLI_QUALITY", "5") or 5)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def available_encodings() -> List[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+    for encoding in available_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressedPayload:
+    """Raw response bytes plus compressed variants, each encoded at most once."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json") -> None:
+        self.body = body
+        self.media_type = media_type
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def variant(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        if not encoding or len(self.body) < COMPRESSION_MIN_BYTES:
+            return self.body, None
+        with self._lock:
+            data = self._variants.get(encoding)
+            if data is None:
+                data = compress(self.body, encoding)
+                self._variants[encoding] = data
+        return data, encoding
+
+    def to_response(self, accept_encoding: str, headers: Optional[Mapping[str, str]] = None) -> Response:
+        data, encoding = self.variant(choose_encoding(accept_encoding))
+        response = Response(content=data, media_type=self.media_type, headers=dict(headers or {}))
+        response.headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class CompressionMiddleware:
+    """gzip/brotli for buffered JSON/text responses above a size threshold.
+
+    Responses that already carry Content-Encoding (e.g. served from the precompressed
+    response cache) and streamed responses pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            assert start is not None
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming: flush the held start message and stop interfering.
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, wrapped_send)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from infrastructure import Database
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DEDUP_INDEXED = REGISTRY.gauge("pulss_dedup_indexed", "Names in the duplicate index.", ("kind",))
+DEDUP_LOOKUP = REGISTRY.histogram("pulss_dedup_lookup_seconds", "Duplicate-check lookup time.")
+
+KINDS = ("lead", "client")
+DEFAULT_THRESHOLD = 0.6
+
+# Legal-entity markers, compared after NFKC + lowercasing (so ㈱ and （株） both arrive as "(株)").
+_JA_ENTITY = (
+    "特定非営利活動法人",
+    "一般社団法人",
+    "一般財団法人",
+    "公益社団法人",
+    "公益財団法人",
+    "社会福祉法人",
+    "医療法人社団",
+    "株式会社",
+    "有限会社",
+    "合同会社",
+    "合資会社",
+    "合名会社",
+    "医療法人",
+    "学校法人",
+    "npo法人",
+    "(株)",
+    "(有)",
+    "(同)",
+    "(資)",
+    "(名)",
+    "(社)",
+    "(財)",
+    "(医)",
+)
+_EN_ENTITY = re.compile(
+    r"(?:[\s,.]*\b(?:co|corp|corporation|company|inc|incorporated|ltd|limited|llc|kk|k\.k|gk|g\.k)\b\.?)+\s*$"
+)
+_DIGITS = re.compile(r"\d+")
+_SMALL_KANA = str.maketrans("ァィゥェォッャュョヮヵヶ", "アイウエオツヤユヨワカケ")
+
+
+def normalize_company(name: str) -> str:
+    """Canonical form of a company name for duplicate matching.
+
+    NFKC (full/half-width, ㈱ -> (株)), lowercase, legal-entity markers removed wherever they
+    appear (株式会社ABC / ABC(株) / ABC Co., Ltd.), hiragana folded to katakana and small kana
+    to full size, then everything but letters and digits dropped (spaces, ・, punctuation).
+    """
+    s = unicodedata.normalize("NFKC", name or "").lower()
+    for marker in _JA_ENTITY:
+        s = s.replace(marker, " ")
+    s = _EN_ENTITY.sub("", s)
+    s = "".join(chr(ord(ch) + 0x60) if "ぁ" <= ch <= "ゖ" else ch for ch in s).translate(_SMALL_KANA)
+    return "".join(ch for ch in s if ch.isalnum())
+
+
+def shingles(normalized: str) -> FrozenSet[str]:
+    """Character bigrams with boundary markers, so short names still get several shingles."""
+    padded = f"^{normalized}$"
+    return frozenset(padded[i : i + 2] for i in range(len(padded) - 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class MinHasher:
+    """MinHash signatures with LSH banding.
+
+    Two names share at least one band bucket with probability 1 - (1 - J^rows)^bands, where J
+    is their shingle Jaccard similarity; with 16 bands x 4 rows that is ~0.5 at J=0.5 and
+    >0.98 at J=0.8, while unrelated names (J < 0.2) almost never collide.
+    """
+
+    PRIME = 4294967311  # > 2**32; coefficients < 2**31 keep a * h + b within uint64
+
+    def __init__(self, bands: int = 16, rows: int = 4, seed: int = 7) -> None:
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**31, size=bands * rows, dtype=np.uint64)
+        self._b = rng.integers(0, 2**31, size=bands * rows, dtype=np.uint64)
+
+    def signature(self, grams: Iterable[str]) -> np.ndarray:
+        h = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+        return ((self._a[:, None] * h[None, :] + self._b[:, None]) % np.uint64(self.PRIME)).min(axis=1)
+
+    def bands_of(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(i, signature[i * self.rows : (i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+
+@dataclass
+class DuplicateMatch:
+    kind: str  # lead | client
+    id: str
+    name: str
+    score: float  # shingle Jaccard similarity of the normalized names (1.0 = same normalized name)
+
+
+@dataclass
+class DuplicateGroup:
+    normalized: str
+    members: List[DuplicateMatch] = field(default_factory=list)
+
+
+@dataclass
+class _Entry:
+    name: str
+    normalized: str
+    grams: FrozenSet[str]
+    digits: Tuple[str, ...]
+    buckets: List[Tuple[int, bytes]] = field(default_factory=list)
+
+    @classmethod
+    def of(cls, name: str) -> "_Entry":
+        normalized = normalize_company(name)
+        return cls(name, normalized, shingles(normalized), tuple(_DIGITS.findall(normalized)))
+
+    def similarity(self, other: "_Entry") -> float:
+        if self.normalized == other.normalized:
+            return 1.0
+        if self.digits != other.digits:
+            return 0.0  # 第1営業所 / 第2営業所, 店舗00010 / 店舗00100: numbered names are distinct
+        return jaccard(self.grams, other.grams)
+
+
+Key = Tuple[str, str]  # (kind, id)
+
+
+class DuplicateIndex:
+    """MinHash LSH index over leads.company_name and clients.name.
+
+    A lookup hashes the query into its band buckets and verifies only the names found there
+    (O(candidates), not O(rows)); the batch report unions verified pairs bucket by bucket
+    instead of comparing every pair. Built lazily and kept current through Database.on_write.
+    """
+
+    def __init__(self, db: Database, hasher: Optional[MinHasher] = None) -> None:
+        self.db = db
+        self.hasher = hasher or MinHasher()
+        self._lock = threading.RLock()
+        self._built = False
+        self._entries: Dict[Key, _Entry] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[Key]] = defaultdict(set)
+        self._counts: Counter = Counter()
+
+    def attach(self) -> None:
+        self.db.on_write("leads", lambda items: self.update([(("lead", l.id), l.company_name) for l in items]))
+        self.db.on_write("clients", lambda items: self.update([(("client", c.id), c.name) for c in items]))
+
+    # -- maintenance -------------------------------------------------------
+
+    def _put(self, key: Key, name: str) -> None:
+        old = self._entries.pop(key, None)
+        if old:
+            if old.name == name:
+                self._entries[key] = old
+                return
+            for bucket in old.buckets:
+                self._buckets[bucket].discard(key)
+            self._counts[key[0]] -= 1
+        entry = _Entry.of(name)
+        if not entry.normalized:
+            return  # nothing left once the entity marker is stripped
+        entry.buckets = self.hasher.bands_of(self.hasher.signature(entry.grams))
+        for bucket in entry.buckets:
+            self._buckets[bucket].add(key)
+        self._entries[key] = entry
+        self._counts[key[0]] += 1
+
+    def build(self) -> None:
+        with self._lock:
+            started = time.perf_counter()
+            self._entries.clear()
+            self._buckets.clear()
+            self._counts.clear()
+            conn = self.db.conn
+            for r in conn.execute("SELECT id, company_name FROM leads").fetchall():
+                self._put(("lead", r["id"]), r["company_name"] or "")
+            for r in conn.execute("SELECT id, name FROM clients").fetchall():
+                self._put(("client", r["id"]), r["name"] or "")
+            self._built = True
+            self._report_size()
+            logger.info(
+                "[pulss] duplicate index built: %d names in %.0fms", len(self._entries), (time.perf_counter() - started) * 1000
+            )
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+
+    def update(self, items: List[Tuple[Key, str]]) -> None:
+        with self._lock:
+            if not self._built:
+                return  # the first build reads the committed change
+            for key, name in items:
+                self._put(key, name or "")
+            self._report_size()
+
+    def _report_size(self) -> None:
+        for kind in KINDS:
+            DEDUP_INDEXED.set(kind, value=self._counts[kind])
+
+    # -- queries -----------------------------------------------------------
+
+    def find(
+        self,
+        name: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        kinds: Optional[Iterable[str]] = None,
+        exclude: Optional[Key] = None,
+        limit: int = 10,
+    ) -> List[DuplicateMatch]:
+        """Indexed names similar to `name`, best first."""
+        self._ensure_built()
+        started = time.perf_counter()
+        query = _Entry.of(name)
+        if not query.normalized:
+            return []
+        wanted = set(kinds or KINDS)
+        matches = []
+        with self._lock:
+            candidates: Set[Key] = set()
+            for bucket in self.hasher.bands_of(self.hasher.signature(query.grams)):
+                candidates |= self._buckets.get(bucket, set())
+            for key in candidates:
+                entry = self._entries[key]
+                if key == exclude or key[0] not in wanted:
+                    continue
+                score = query.similarity(entry)
+                if score >= threshold:
+                    matches.append(DuplicateMatch(kind=key[0], id=key[1], name=entry.name, score=round(score, 4)))
+        DEDUP_LOOKUP.observe(value=time.perf_counter() - started)
+        matches.sort(key=lambda m: (-m.score, m.kind, m.name))
+        return matches[:limit]
+
+    def report(self, threshold: float = DEFAULT_THRESHOLD, kinds: Optional[Iterable[str]] = None) -> List[DuplicateGroup]:
+        """Groups of likely duplicates: verified candidate pairs per bucket, joined transitively."""
+        self._ensure_built()
+        wanted = set(kinds or KINDS)
+        parent: Dict[Key, Key] = {}
+        best: Dict[Key, float] = {}
+
+        def root(k: Key) -> Key:
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        with self._lock:
+            checked: Set[Tuple[Key, Key]] = set()
+            for members in self._buckets.values():
+                keys = sorted(k for k in members if k[0] in wanted)
+                for i, a in enumerate(keys):
+                    for b in keys[i + 1 :]:
+                        if (a, b) in checked:
+                            continue
+                        checked.add((a, b))
+                        score = self._entries[a].similarity(self._entries[b])
+                        if score < threshold:
+                            continue
+                        for k in (a, b):
+                            parent.setdefault(k, k)
+                            best[k] = max(best.get(k, 0.0), score)
+                        parent[root(a)] = root(b)
+            groups: Dict[Key, DuplicateGroup] = {}
+            for k in parent:
+                entry = self._entries[k]
+                group = groups.setdefault(root(k), DuplicateGroup(normalized=entry.normalized))
+                group.members.append(DuplicateMatch(kind=k[0], id=k[1], name=entry.name, score=round(best[k], 4)))
+        out = list(groups.values())
+        for group in out:
+            group.members.sort(key=lambda m: (-m.score, m.kind, m.name))
+            group.normalized = min((normalize_company(m.name) for m in group.members), key=len)
+        out.sort(key=lambda g: (-len(g.members), g.normalized))
+        return out
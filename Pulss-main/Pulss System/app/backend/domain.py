@@ -113,6 +113,7 @@ class PulssChatSession:
     created_at: datetime
     finalized_at: Optional[datetime] = None
     final_report: Optional[str] = None
+    slots: dict = field(default_factory=dict)  # hearing_slots.HearingSlots.to_dict()
 
 
 @dataclass
@@ -124,6 +125,35 @@ class PulssChatMessage:
     created_at: datetime
 
 
+@dataclass
+class LlmUsage:
+    id: str
+    session_id: Optional[str]
+    client_id: Optional[str]
+    purpose: str  # start / turn
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float
+    estimated: bool  # True when the response had no usage block
+    created_at: datetime
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class LlmUsageSummary:
+    key: str  # session id, client id or YYYY-MM-DD depending on the grouping
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    avg_latency_ms: float
+    models: List[str]
+
+
 @dataclass
 class AiDraft:
     id: str
@@ -133,6 +163,7 @@ class AiDraft:
     content: str
     created_at: datetime
     updated_at: datetime
+    input_hash: Optional[str] = None
 
 
 @dataclass
@@ -194,6 +225,7 @@ class AiSuggestion:
     created_by: str
     created_at: datetime
     updated_at: datetime
+    input_hash: Optional[str] = None  # memo key of the generation inputs
 
 
 @dataclass
@@ -311,6 +343,43 @@ class MetricSnapshot:
     created_at: datetime
 
 
+@dataclass
+class MetricSeries:
+    """One client's metric on a shared period axis; None where there is no value."""
+
+    client_id: str
+    metric: str
+    values: List[Optional[float]]
+    mom: List[Optional[float]]  # growth vs. previous month (0.1 = +10%)
+    yoy: List[Optional[float]]  # growth vs. same month last year
+    avg3: List[Optional[float]]  # trailing 3-month mean
+
+
+@dataclass
+class MetricSeriesSet:
+    periods: List[str]
+    series: List[MetricSeries]
+
+
+@dataclass
+class KpiRow:
+    """Cross-client distribution of one metric in one period (and group)."""
+
+    period: str
+    group: str
+    metric: str
+    clients: int
+    total: float
+    mean: float
+    min: float
+    max: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
+    mom_median: Optional[float]  # median month-over-month growth of the clients that have one
+
+
 @dataclass
 class Notification:
     id: str
@@ -330,6 +399,23 @@ class ScheduleEvent:
     type: str
     team: str
     description: Optional[str] = None
+    rrule: Optional[str] = None  # recurrence rule of a series (see recurrence.RecurrenceRule)
+    # Set on occurrences expanded from a series: the series id and the original occurrence start.
+    series_id: Optional[str] = None
+    recurrence_id: Optional[datetime] = None
+
+
+@dataclass
+class ScheduleException:
+    """Per-occurrence change to a recurring event, keyed by the occurrence's original start."""
+
+    event_id: str
+    recurrence_id: str  # original start as a schedule key (naive UTC)
+    cancelled: bool
+    title: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    description: Optional[str] = None
 
 
 @dataclass
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from infrastructure import Database
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SEARCH_LATENCY = REGISTRY.histogram("pulss_knowledge_search_seconds", "Knowledge index search time.")
+INDEX_SIZE = REGISTRY.gauge("pulss_knowledge_index_documents", "Documents in the knowledge index.", ("source",))
+BUDGET_EXCEEDED = REGISTRY.counter(
+    "pulss_knowledge_search_truncated_total", "Searches cut short by their latency budget."
+)
+
+_WORD = re.compile(r"[a-z0-9@#_]+")
+_SPACE = re.compile(r"\s+")
+
+
+class HashingEmbedder:
+    """Local, dependency-free text embedder.
+
+    Character 2/3-grams (Japanese has no spaces) plus ASCII words are hashed into `dim`
+    signed buckets with sublinear tf, then L2-normalised, so cosine similarity is a dot product.
+    """
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = dim
+
+    def features(self, text: str) -> Counter:
+        text = unicodedata.normalize("NFKC", text or "").lower()
+        feats: Counter = Counter(f"w:{w}" for w in _WORD.findall(text))
+        compact = _SPACE.sub("", text)
+        for n in (2, 3):
+            feats.update(f"c{n}:{compact[i:i + n]}" for i in range(len(compact) - n + 1))
+        return feats
+
+    def embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feat, count in self.features(text).items():
+            h = zlib.crc32(feat.encode("utf-8"))
+            vec[h % self.dim] += (1.0 if h & 0x80000000 else -1.0) * (1.0 + math.log(count))
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+
+@dataclass
+class KnowledgeDoc:
+    source: str
+    source_id: str
+    client_id: Optional[str]
+    title: str
+    text: str
+
+
+@dataclass
+class KnowledgeHit:
+    source: str
+    source_id: str
+    client_id: Optional[str]
+    title: str
+    snippet: str
+    score: float
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(_text(v) for v in value)
+    if isinstance(value, dict):
+        return " ".join(_text(v) for v in value.values())
+    return str(value)
+
+
+def _get(entity: Any, name: str) -> Any:
+    if isinstance(entity, (dict, sqlite3.Row)):
+        return entity[name]
+    return getattr(entity, name)
+
+
+def _pulse_doc(e: Any) -> Optional[KnowledgeDoc]:
+    fields = ("problem", "current_sns", "target", "product_summary", "strengths_usp", "brand_story", "reference_accounts")
+    text = "\n".join(_text(_get(e, f)) for f in fields if _get(e, f))
+    return KnowledgeDoc("pulse_responses", _get(e, "id"), _get(e, "client_id"), "パルス回答", text) if text else None
+
+
+def _brief_doc(e: Any) -> Optional[KnowledgeDoc]:
+    sections = _get(e, "sections")
+    if isinstance(sections, str):
+        sections = json.loads(sections or "{}")
+    text = "\n".join(filter(None, [_get(e, "summary_markdown"), _text(sections)]))
+    return KnowledgeDoc("client_briefs", _get(e, "id"), _get(e, "client_id"), "クライアントブリーフ", text) if text else None
+
+
+def _session_doc(e: Any) -> Optional[KnowledgeDoc]:
+    if _get(e, "status") != "finalized" or not _get(e, "final_report"):
+        return None
+    return KnowledgeDoc("pulss_chat_sessions", _get(e, "id"), _get(e, "client_id"), "ヒアリングレポート", _get(e, "final_report"))
+
+
+def _news_doc(e: Any) -> Optional[KnowledgeDoc]:
+    tags = [_get(e, "platform_tags"), _get(e, "industry_tags")]
+    text = "\n".join(filter(None, [_get(e, "title"), _get(e, "summary"), _text(tags)]))
+    return KnowledgeDoc("sns_news", _get(e, "id"), None, _get(e, "title") or "SNSニュース", text)
+
+
+# table -> (full-scan SQL used by sync(), entity/row -> document)
+SOURCES: Dict[str, Tuple[str, Callable[[Any], Optional[KnowledgeDoc]]]] = {
+    "pulse_responses": ("SELECT * FROM pulse_responses", _pulse_doc),
+    "client_briefs": ("SELECT * FROM client_briefs", _brief_doc),
+    "pulss_chat_sessions": ("SELECT * FROM pulss_chat_sessions WHERE status = 'finalized'", _session_doc),
+    "sns_news": ("SELECT * FROM sns_news", _news_doc),
+}
+_SOURCE_CODES = {source: i for i, source in enumerate(SOURCES)}
+
+
+class EmbeddingIndex:
+    """In-memory float32 matrix over the knowledge sources, persisted in `embeddings`.
+
+    Vectors are stored as packed float32 BLOBs and loaded once; repository writes update
+    single rows (see Database.on_write). Search is one matrix-vector product per block of
+    rows, stopping early if the caller's latency budget runs out.
+    """
+
+    BLOCK_ROWS = 16384
+
+    def __init__(self, db: Database, embedder: Optional[HashingEmbedder] = None) -> None:
+        self.db = db
+        self.embedder = embedder or HashingEmbedder()
+        self._lock = threading.RLock()
+        self._matrix = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._size = 0
+        self._keys: List[Tuple[str, str]] = []
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._meta: List[Tuple[Optional[str], str, str]] = []  # client_id, title, snippet
+        # Per-row filter columns (source index in SOURCES, owner code; 0 = shared), so search
+        # can mask rows before picking the top k.
+        self._source_codes = np.zeros(0, dtype=np.int8)
+        self._owner_codes = np.zeros(0, dtype=np.int32)
+        self._owners: Dict[Optional[str], int] = {None: 0}
+        self._hashes: Dict[Tuple[str, str], str] = {}
+        self._load()
+
+    # -- storage -----------------------------------------------------------
+
+    def _load(self) -> None:
+        rows = self.db.conn.execute(
+            "SELECT source, source_id, client_id, title, snippet, text_hash, dim, vector FROM embeddings"
+        ).fetchall()
+        with self._lock:
+            for r in rows:
+                if r["dim"] != self.embedder.dim:
+                    continue  # written with another embedder config; sync() re-embeds it
+                self._put((r["source"], r["source_id"]), np.frombuffer(r["vector"], dtype=np.float32), (r["client_id"], r["title"], r["snippet"]))
+                self._hashes[(r["source"], r["source_id"])] = r["text_hash"]
+            self._publish()
+
+    def _put(self, key: Tuple[str, str], vec: np.ndarray, meta: Tuple[Optional[str], str, str]) -> None:
+        row = self._rows.get(key)
+        if row is None:
+            if self._size == len(self._matrix):
+                grown = np.zeros((max(64, 2 * len(self._matrix)), self.embedder.dim), dtype=np.float32)
+                grown[: self._size] = self._matrix[: self._size]
+                self._matrix = grown
+                self._source_codes = np.resize(self._source_codes, len(grown))
+                self._owner_codes = np.resize(self._owner_codes, len(grown))
+            row = self._size
+            self._size += 1
+            self._rows[key] = row
+            self._keys.append(key)
+            self._meta.append(meta)
+        else:
+            self._meta[row] = meta
+        self._matrix[row] = vec
+        self._source_codes[row] = _SOURCE_CODES.get(key[0], -1)
+        self._owner_codes[row] = self._owners.setdefault(meta[0], len(self._owners))
+
+    def _publish(self) -> None:
+        counts = Counter(source for source, _ in self._keys)
+        for source in SOURCES:
+            INDEX_SIZE.set(source, value=counts.get(source, 0))
+
+    def upsert(self, docs: Iterable[KnowledgeDoc]) -> int:
+        """Embed and store documents whose text changed. Returns how many were (re)embedded."""
+        pending = []
+        for doc in docs:
+            key = (doc.source, doc.source_id)
+            text_hash = hashlib.sha1(doc.text.encode("utf-8")).hexdigest()
+            if self._hashes.get(key) == text_hash:
+                continue
+            vec = self.embedder.embed(doc.text)
+            snippet = _SPACE.sub(" ", doc.text).strip()[:200]
+            pending.append((doc, key, text_hash, vec, snippet))
+        if not pending:
+            return 0
+        now = datetime.utcnow().isoformat()
+        rows = [
+            (d.source, d.source_id, d.client_id, d.title, snippet, h, self.embedder.dim, vec.tobytes(), now)
+            for d, _, h, vec, snippet in pending
+        ]
+        with self.db.lock:
+            self.db.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings(source, source_id, client_id, title, snippet, text_hash, dim, vector, "
+                "updated_at) VALUES(?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+            self.db.conn.commit()
+        with self._lock:
+            for doc, key, text_hash, vec, snippet in pending:
+                self._put(key, vec, (doc.client_id, doc.title, snippet))
+                self._hashes[key] = text_hash
+            self._publish()
+        return len(pending)
+
+    def attach(self) -> None:
+        """Keep the index current by embedding rows as the repositories write them."""
+        for table, (_, to_doc) in SOURCES.items():
+            self.db.on_write(table, lambda entities, to_doc=to_doc: self.upsert(d for d in map(to_doc, entities) if d))
+
+    def sync(self) -> int:
+        """Embed every source row that is missing or changed (startup backfill)."""
+        total = 0
+        for sql, to_doc in SOURCES.values():
+            rows = self.db.conn.execute(sql).fetchall()
+            total += self.upsert(doc for doc in map(to_doc, rows) if doc)
+        if total:
+            logger.info("[pulss] knowledge index synced: %d documents embedded", total)
+        return total
+
+    # -- search ------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        sources: Optional[Sequence[str]] = None,
+        client_id: Optional[str] = None,
+        budget_ms: Optional[float] = None,
+        exclude: Optional[Sequence[Tuple[str, str]]] = None,
+        min_score: float = 0.0,
+    ) -> List[KnowledgeHit]:
+        """Top-k documents by cosine similarity.
+
+        With `client_id`, only that client's documents and shared ones (news) are considered.
+        With `budget_ms`, the scan stops after the block that exhausts the budget and the
+        best hits found so far are returned.
+        """
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000 if budget_ms else None
+        q = self.embedder.embed(query)
+        if not q.any():
+            return []
+        if not self._lock.acquire(timeout=budget_ms / 1000 if budget_ms else -1):
+            BUDGET_EXCEEDED.inc()
+            return []
+        try:
+            size = self._size
+            matrix = self._matrix
+            keys = self._keys[:size]
+            meta = self._meta[:size]
+            allowed = np.ones(size, dtype=bool)
+            if sources:
+                allowed &= np.isin(self._source_codes[:size], [_SOURCE_CODES[s] for s in sources if s in _SOURCE_CODES])
+            if client_id is not None:
+                owners = self._owner_codes[:size]
+                allowed &= (owners == 0) | (owners == self._owners.get(client_id, -1))
+            for key in exclude or ():
+                row = self._rows.get(tuple(key))
+                if row is not None and row < size:
+                    allowed[row] = False
+        finally:
+            self._lock.release()
+
+        best: List[Tuple[float, int]] = []
+        for lo in range(0, size, self.BLOCK_ROWS):
+            hi = min(size, lo + self.BLOCK_ROWS)
+            # Filtered-out rows score -inf before the top-k cut, so a client-scoped search still
+            # finds that client's documents among many from other clients.
+            scores = np.where(allowed[lo:hi], matrix[lo:hi] @ q, -np.inf)
+            take = min(len(scores), k)
+            top = np.argpartition(-scores, take - 1)[:take] if take < len(scores) else np.arange(len(scores))
+            for i in top:
+                if scores[i] > min_score:
+                    best.append((float(scores[i]), lo + int(i)))
+            if deadline and time.perf_counter() > deadline and hi < size:
+                BUDGET_EXCEEDED.inc()
+                break
+        best.sort(reverse=True)
+        SEARCH_LATENCY.observe(value=time.perf_counter() - start)
+        return [
+            KnowledgeHit(
+                source=keys[row][0],
+                source_id=keys[row][1],
+                client_id=meta[row][0],
+                title=meta[row][1],
+                snippet=meta[row][2],
+                score=round(score, 4),
+            )
+            for score, row in best[:k]
+        ]
+
+    def size(self) -> int:
+        return self._size
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+# Required slots from PULSS_SYSTEM_PROMPT, in the order of the STEP0 questions 1)..7).
+SLOT_ORDER = ("company", "current_sns", "goals", "target", "platforms", "usp", "references")
+
+SLOT_LABELS: Dict[str, str] = {
+    "company": "会社名／ブランド名",
+    "current_sns": "現在のSNS運用状況",
+    "goals": "目標",
+    "target": "ターゲット",
+    "platforms": "主要プラットフォーム",
+    "usp": "商品・サービスの強み（USP）",
+    "references": "参考アカウント・競合",
+}
+
+# Keywords that identify a slot in "label: value" lines and in the assistant's questions.
+SLOT_KEYWORDS: Dict[str, tuple] = {
+    "company": ("会社名", "ブランド名", "店名", "屋号", "社名"),
+    "current_sns": ("運用状況", "現在のsns", "現状", "現在の運用"),
+    "goals": ("目標", "ゴール", "達成したい"),
+    "target": ("ターゲット", "ペルソナ", "客層", "顧客層"),
+    "platforms": ("プラットフォーム", "媒体"),
+    "usp": ("強み", "usp", "こだわり", "特徴"),
+    "references": ("参考", "競合", "ベンチマーク"),
+}
+
+PLATFORMS: Dict[str, tuple] = {
+    "Instagram": ("instagram", "インスタ"),
+    "TikTok": ("tiktok", "ティックトック"),
+    "YouTube": ("youtube", "ユーチューブ", "ショート動画"),
+    "X": ("twitter", "ツイッター", "x（旧twitter）"),
+    "Facebook": ("facebook", "フェイスブック"),
+    "LINE": ("line公式", "lineアカウント", "公式line"),
+}
+
+_CIRCLED = re.compile("[①-⑦]")
+# Matched after NFKC (full-width digits and brackets become ASCII). The marker after the
+# digit is required: "3 店舗を運営しています" is a sentence, not answer 3.
+_NUMBERED = re.compile(r"^\s*\(?([1-7])[).:、](?!\d)\s*(.*)$")
+_LABELLED = re.compile(r"^\s*([^:：]{1,20})[:：]\s*(.+)$")
+_HANDLE = re.compile(r"(?<![\w@])@[A-Za-z0-9_.]{2,30}")
+_X_WORD = re.compile(r"(?<![A-Za-z])X(?![A-Za-z])")
+
+
+@dataclass
+class HearingSlots:
+    company: Optional[str] = None
+    current_sns: Optional[str] = None
+    goals: Optional[str] = None
+    target: Optional[str] = None
+    platforms: List[str] = field(default_factory=list)
+    usp: Optional[str] = None
+    references: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "HearingSlots":
+        data = data or {}
+        return cls(**{k: data[k] for k in SLOT_ORDER if k in data})
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def missing(self) -> List[str]:
+        return [k for k in SLOT_ORDER if not getattr(self, k)]
+
+    def is_empty(self) -> bool:
+        return len(self.missing()) == len(SLOT_ORDER)
+
+
+def _norm(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _slot_for_label(label: str) -> Optional[str]:
+    label = _norm(label)
+    for slot, words in SLOT_KEYWORDS.items():
+        if any(w in label for w in words):
+            return slot
+    return None
+
+
+def asked_slot(assistant_message: Optional[str]) -> Optional[str]:
+    """The single slot the assistant's last message asked about, if it asked about exactly one."""
+    if not assistant_message:
+        return None
+    text = _norm(assistant_message)
+    hits = {slot for slot, words in SLOT_KEYWORDS.items() if any(w in text for w in words)}
+    return hits.pop() if len(hits) == 1 else None
+
+
+def detect_platforms(text: str) -> List[str]:
+    low = _norm(text)
+    found = [name for name, words in PLATFORMS.items() if any(w in low for w in words)]
+    if "X" not in found and _X_WORD.search(unicodedata.normalize("NFKC", text)):
+        found.append("X")
+    return found
+
+
+def _set(slots: HearingSlots, slot: str, value: str) -> None:
+    value = value.strip()
+    if not value:
+        return
+    if slot == "platforms":
+        slots.platforms = sorted(set(slots.platforms) | set(detect_platforms(value) or [value]))
+    elif slot == "references":
+        handles = _HANDLE.findall(value)
+        items = handles or [v.strip() for v in re.split(r"[、,，/]", value) if v.strip()]
+        slots.references = list(dict.fromkeys(slots.references + items))
+    else:
+        # A later answer to the same slot is a correction and replaces the earlier one.
+        setattr(slots, slot, value)
+
+
+def extract_slots(slots: HearingSlots, user_message: str, last_assistant_message: Optional[str] = None) -> HearingSlots:
+    """Update `slots` in place from one user turn and return it.
+
+    Rule based and cheap, so it can run on every turn:
+    - numbered answers (1)..7) / ①..⑦) follow the STEP0 question order;
+    - "label: value" lines are matched by keyword;
+    - an unlabelled answer goes to the one slot the previous assistant message asked about;
+    - platform names and @handles are picked up anywhere in the message.
+    """
+    unassigned: List[str] = []
+    # ①..⑦ -> "1) ".."7) " before NFKC, which would otherwise fold them into bare digits.
+    text = _CIRCLED.sub(lambda m: f"{ord(m.group()) - 0x245F}) ", user_message)
+    for line in unicodedata.normalize("NFKC", text).splitlines():
+        if not line.strip():
+            continue
+        numbered = _NUMBERED.match(line)
+        if numbered:
+            _set(slots, SLOT_ORDER[int(numbered.group(1)) - 1], numbered.group(2))
+            continue
+        labelled = _LABELLED.match(line)
+        slot = _slot_for_label(labelled.group(1)) if labelled else None
+        if slot:
+            _set(slots, slot, labelled.group(2))
+            continue
+        unassigned.append(line.strip())
+
+    if unassigned:
+        slot = asked_slot(last_assistant_message)
+        if slot:
+            _set(slots, slot, "\n".join(unassigned))
+
+    platforms = detect_platforms(user_message)
+    if platforms:
+        slots.platforms = sorted(set(slots.platforms) | set(platforms))
+    handles = _HANDLE.findall(user_message)
+    if handles:
+        slots.references = list(dict.fromkeys(slots.references + handles))
+    return slots
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional, Tuple
+
+from compression import CompressedPayload
+
+RESPONSE_CACHE_SIZE = int(os.getenv("PULSS_RESPONSE_CACHE_SIZE", "256") or 256)
+
+
+def make_etag(*parts: object) -> str:
+    """Build a weak ETag from the values a response depends on."""
+    seed = "|".join("" if p is None else str(p) for p in parts)
+    return f'W/"{hashlib.sha1(seed.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def format_http_date(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since (If-None-Match wins when both are sent)."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        wanted = _strip_weak(etag)
+        return any(_strip_weak(t) == wanted for t in if_none_match.split(","))
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        since = _parse_http_date(if_modified_since)
+        if since is None:
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have second resolution.
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+class ResponseCache:
+    """LRU of rendered bodies keyed by (path, query) and validated by ETag.
+
+    Entries keep their compressed variants next to the raw bytes, so a repeat hit
+    neither re-queries, re-serializes nor re-compresses.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._items: "OrderedDict[Tuple[str, str], Tuple[str, CompressedPayload]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str], etag: str) -> Optional[CompressedPayload]:
+        with self._lock:
+            item = self._items.get(key)
+            if not item or item[0] != etag:
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+
+    def put(self, key: Tuple[str, str], etag: str, body: bytes) -> CompressedPayload:
+        payload = CompressedPayload(body)
+        with self._lock:
+            self._items[key] = (etag, payload)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return payload
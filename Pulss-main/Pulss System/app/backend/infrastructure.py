@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import json
 import logging
+import secrets
 import sqlite3
 import threading
-from datetime import datetime
-from typing import Dict, List, Optional
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from domain import (
     AiDraft,
@@ -21,15 +24,20 @@ from domain import (
     Contract,
     HearingRecord,
     Lead,
+    LlmUsage,
+    LlmUsageSummary,
     LeadStatus,
     MeetingNote,
     MetricSnapshot,
     Notification,
+    Proposal,
+    ProposalStatus,
     PulssChatMessage,
     PulssChatSession,
     PulssLink,
     PulssLinkStatus,
     ScheduleEvent,
+    ScheduleException,
     PulseLink,
     PulseResponse,
     SnsNews,
@@ -38,22 +46,181 @@ from domain import (
     TaskStatus,
     TaskTemplate,
 )
+from recurrence import RecurrenceRule, last_start
 from utils import generate_id
 
 logger = logging.getLogger(__name__)
 
 
+_MARK_ROLLUP_DIRTY = (
+    "INSERT INTO metric_rollup_dirty(client_id, version) VALUES(?, 1) "
+    "ON CONFLICT(client_id) DO UPDATE SET version = version + 1"
+)
+
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
 def _utc(dt: datetime) -> str:
     return dt.isoformat()
 
 
+# Schedule start/end as naive-UTC second strings; the same expressions back the schedule
+# indexes, so range filters on them are index searches (stored values may carry an offset).
+_SCHEDULE_START = "strftime('%Y-%m-%dT%H:%M:%S', start)"
+_SCHEDULE_END = """strftime('%Y-%m-%dT%H:%M:%S', "end")"""
+
+
+def schedule_key(dt: datetime) -> str:
+    """Datetime -> the naive-UTC form compared against _SCHEDULE_START/_SCHEDULE_END."""
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.replace(microsecond=0).isoformat()
+
+
+def _series_end(event: ScheduleEvent) -> Optional[str]:
+    """End of a series' last occurrence (None: single event or open-ended series)."""
+    if not event.rrule:
+        return None
+    last = last_start(RecurrenceRule.parse(event.rrule), event.start)
+    return schedule_key(last + (event.end - event.start)) if last else None
+
+
+@dataclass(frozen=True)
+class TableState:
+    """Cheap change marker for a set of tables (used for ETag / Last-Modified)."""
+
+    version: str
+    last_modified: Optional[datetime]
+
+
+QueryObserver = Callable[[str, Sequence[object], float, int], None]
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that keeps timing a SELECT through its fetches and reports once the rows are consumed."""
+
+    _pending: Optional[list] = None  # [sql, params, seconds, rows]
+
+    def _begin(self, sql: str, params: Sequence[object], seconds: float) -> None:
+        if self.description is None:
+            # No result set (INSERT/UPDATE/DELETE/DDL): done already.
+            self.connection._notify(sql, params, seconds, max(self.rowcount, 0))
+        else:
+            self._pending = [sql, params, seconds, 0]
+
+    def _account(self, seconds: float, rows: int, done: bool) -> None:
+        pending = self._pending
+        if pending is None:
+            return
+        pending[2] += seconds
+        pending[3] += rows
+        if done:
+            self._pending = None
+            self.connection._notify(*pending)
+
+    def fetchall(self) -> list:
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._account(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        # Callers use fetchone() for single-row lookups; report on the first call.
+        self._account(time.perf_counter() - start, 0 if row is None else 1, True)
+        return row
+
+    def fetchmany(self, size: int = -1) -> list:
+        size = self.arraysize if size < 0 else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._account(time.perf_counter() - start, len(rows), len(rows) < size)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._account(time.perf_counter() - start, 0, True)
+            raise
+        self._account(time.perf_counter() - start, 1, False)
+        return row
+
+    def close(self) -> None:
+        self._account(0.0, 0, True)
+        super().close()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection that reports every execute()/executemany() to its observers.
+
+    Observers get (sql, params, seconds, rows); for queries the time includes fetching the rows.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.query_observers: List[QueryObserver] = []
+
+    def _notify(self, sql: str, params: Sequence[object], seconds: float, rows: int) -> None:
+        for observer in self.query_observers:
+            try:
+                observer(sql, params, seconds, rows)
+            except Exception:  # noqa: BLE001
+                logger.exception("[pulss] query observer failed")
+
+    def execute(self, sql: str, params: Sequence[object] = ()) -> sqlite3.Cursor:  # type: ignore[override]
+        if not self.query_observers:
+            return super().execute(sql, params)
+        cur = self.cursor(InstrumentedCursor)
+        start = time.perf_counter()
+        try:
+            cur.execute(sql, params)
+        except Exception:
+            self._notify(sql, params, time.perf_counter() - start, 0)
+            raise
+        cur._begin(sql, params, time.perf_counter() - start)
+        return cur
+
+    def executemany(self, sql: str, seq_of_params) -> sqlite3.Cursor:  # type: ignore[override]
+        if not self.query_observers:
+            return super().executemany(sql, seq_of_params)
+        start = time.perf_counter()
+        cur = None
+        try:
+            cur = super().executemany(sql, seq_of_params)
+            return cur
+        finally:
+            rows = max(cur.rowcount, 0) if cur is not None else 0
+            self._notify(sql, (), time.perf_counter() - start, rows)
+
+
 class Database:
     def __init__(self, path: str = "data.db") -> None:
-        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn = sqlite3.connect(path, check_same_thread=False, factory=InstrumentedConnection)
         self.conn.row_factory = sqlite3.Row
         self.lock = threading.Lock()
+        self._write_listeners: Dict[str, List[Callable[[List[Any]], None]]] = {}
         self._ensure_tables()
 
+    def add_query_observer(self, observer: QueryObserver) -> None:
+        """Called after every statement with (sql, params, seconds, rows)."""
+        self.conn.query_observers.append(observer)
+
+    def on_write(self, table: str, listener: Callable[[List[Any]], None]) -> None:
+        """Called with the written entities after a repository commits to `table`."""
+        self._write_listeners.setdefault(table, []).append(listener)
+
+    def emit_write(self, table: str, entities: List[Any]) -> None:
+        for listener in self._write_listeners.get(table, ()):
+            try:
+                listener(entities)
+            except Exception:
+                logger.exception("[pulss] write listener failed; table=%s", table)
+
     def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
         """Serialized execute + commit for thread safety."""
         try:
@@ -133,7 +300,8 @@ class Database:
                 status TEXT,
                 created_at TEXT,
                 finalized_at TEXT,
-                final_report TEXT
+                final_report TEXT,
+                slots TEXT
             );
             CREATE TABLE IF NOT EXISTS pulss_chat_messages(
                 id TEXT PRIMARY KEY,
@@ -142,6 +310,30 @@ class Database:
                 content TEXT,
                 created_at TEXT
             );
+            CREATE TABLE IF NOT EXISTS pulss_chat_idempotency(
+                session_id TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL,
+                request_hash TEXT NOT NULL,
+                assistant_message TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT,
+                PRIMARY KEY(session_id, idempotency_key)
+            );
+            CREATE TABLE IF NOT EXISTS llm_usage(
+                id TEXT PRIMARY KEY,
+                session_id TEXT,
+                client_id TEXT,
+                purpose TEXT,
+                model TEXT,
+                prompt_tokens INTEGER NOT NULL,
+                completion_tokens INTEGER NOT NULL,
+                latency_ms REAL,
+                estimated INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_usage_session ON llm_usage(session_id);
+            CREATE INDEX IF NOT EXISTS idx_llm_usage_client_created ON llm_usage(client_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_llm_usage_created ON llm_usage(created_at);
             CREATE TABLE IF NOT EXISTS ai_drafts(
                 id TEXT PRIMARY KEY,
                 client_id TEXT,
@@ -149,7 +341,8 @@ class Database:
                 status TEXT,
                 content TEXT,
                 created_at TEXT,
-                updated_at TEXT
+                updated_at TEXT,
+                input_hash TEXT
             );
             CREATE TABLE IF NOT EXISTS ai_suggestions(
                 id TEXT PRIMARY KEY,
@@ -160,7 +353,8 @@ class Database:
                 status TEXT,
                 created_by TEXT,
                 created_at TEXT,
-                updated_at TEXT
+                updated_at TEXT,
+                input_hash TEXT
             );
             CREATE TABLE IF NOT EXISTS schedules(
                 id TEXT PRIMARY KEY,
@@ -287,10 +481,154 @@ class Database:
                 created_at TEXT,
                 read_at TEXT
             );
+            CREATE TABLE IF NOT EXISTS embeddings(
+                source TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                client_id TEXT,
+                title TEXT,
+                snippet TEXT,
+                text_hash TEXT,
+                dim INTEGER,
+                vector BLOB,
+                updated_at TEXT,
+                PRIMARY KEY(source, source_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_pulse_responses_client_submitted ON pulse_responses(client_id, submitted_at);
+            CREATE INDEX IF NOT EXISTS idx_metric_snapshots_client_period ON metric_snapshots(client_id, period);
+            CREATE TABLE IF NOT EXISTS metric_values(
+                client_id TEXT NOT NULL,
+                period TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value REAL,
+                PRIMARY KEY(client_id, metric, period)
+            );
+            CREATE INDEX IF NOT EXISTS idx_metric_values_metric_period ON metric_values(metric, period);
+            CREATE TABLE IF NOT EXISTS metric_rollups(
+                client_id TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                period TEXT NOT NULL,
+                value REAL,
+                mom REAL,
+                yoy REAL,
+                avg3 REAL,
+                PRIMARY KEY(client_id, metric, period)
+            );
+            CREATE INDEX IF NOT EXISTS idx_metric_rollups_metric_period ON metric_rollups(metric, period);
+            CREATE TABLE IF NOT EXISTS metric_rollup_dirty(
+                client_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE TABLE IF NOT EXISTS lead_status_events(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                lead_id TEXT NOT NULL,
+                from_status TEXT,
+                to_status TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_lead_status_events_lead ON lead_status_events(lead_id, changed_at);
+            CREATE INDEX IF NOT EXISTS idx_contact_logs_lead ON contact_logs(lead_id, contact_at);
+            CREATE INDEX IF NOT EXISTS idx_schedules_start
+                ON schedules(strftime('%Y-%m-%dT%H:%M:%S', start), strftime('%Y-%m-%dT%H:%M:%S', "end"));
+            CREATE INDEX IF NOT EXISTS idx_schedules_team_start
+                ON schedules(team, strftime('%Y-%m-%dT%H:%M:%S', start), strftime('%Y-%m-%dT%H:%M:%S', "end"));
+            CREATE TABLE IF NOT EXISTS schedule_exceptions(
+                event_id TEXT NOT NULL,
+                recurrence_id TEXT NOT NULL,
+                cancelled INTEGER NOT NULL DEFAULT 0,
+                title TEXT,
+                start TEXT,
+                "end" TEXT,
+                description TEXT,
+                PRIMARY KEY(event_id, recurrence_id)
+            );
+            CREATE TABLE IF NOT EXISTS table_versions(
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT
+            );
             """
         )
+        self._ensure_column(cur, "pulss_chat_sessions", "slots", "TEXT")
+        self._ensure_column(cur, "ai_suggestions", "input_hash", "TEXT")
+        self._ensure_column(cur, "ai_drafts", "input_hash", "TEXT")
+        self._ensure_column(cur, "schedules", "rrule", "TEXT")
+        self._ensure_column(cur, "schedules", "series_end", "TEXT")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_ai_suggestions_client_hash ON ai_suggestions(client_id, input_hash)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_ai_drafts_client_hash ON ai_drafts(client_id, input_hash)")
+        cur.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_schedules_series ON schedules(team, {_SCHEDULE_START}, series_end) "
+            "WHERE rrule IS NOT NULL"
+        )
+        self._backfill_metric_values(cur)
+        self._backfill_lead_status_events(cur)
+        self._ensure_version_triggers(cur)
         self.conn.commit()
 
+    def _ensure_column(self, cur: sqlite3.Cursor, table: str, column: str, decl: str) -> None:
+        """Add a column to a table created by an older version of the schema."""
+        columns = {r[1] for r in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+        if column not in columns:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    def _backfill_metric_values(self, cur: sqlite3.Cursor) -> None:
+        """Explode snapshots stored before metric_values existed (the latest snapshot wins)."""
+        if cur.execute("SELECT 1 FROM metric_values LIMIT 1").fetchone():
+            return
+        cur.execute(
+            "INSERT OR REPLACE INTO metric_values(client_id, period, metric, value) "
+            "SELECT s.client_id, s.period, j.key, j.value FROM metric_snapshots s, json_each(s.metrics) j "
+            "WHERE j.type IN ('integer', 'real') ORDER BY s.created_at"
+        )
+        cur.execute("INSERT OR IGNORE INTO metric_rollup_dirty(client_id) SELECT DISTINCT client_id FROM metric_values")
+
+    def _backfill_lead_status_events(self, cur: sqlite3.Cursor) -> None:
+        """Leads created before status events were recorded start with their current status."""
+        if cur.execute("SELECT 1 FROM lead_status_events LIMIT 1").fetchone():
+            return
+        cur.execute(
+            "INSERT INTO lead_status_events(lead_id, from_status, to_status, changed_at) "
+            "SELECT id, NULL, status, created_at FROM leads"
+        )
+
+    def _ensure_version_triggers(self, cur: sqlite3.Cursor) -> None:
+        """Bump table_versions on every write so readers can detect changes without scanning the table."""
+        now = _utc(datetime.utcnow())
+        cur.execute(
+            "INSERT OR IGNORE INTO table_versions(name, version, updated_at) VALUES('__epoch__', ?, ?)",
+            (secrets.randbits(31), now),
+        )
+        tables = [
+            r[0]
+            for r in cur.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name != 'table_versions'"
+            ).fetchall()
+        ]
+        for table in tables:
+            cur.execute(
+                "INSERT OR IGNORE INTO table_versions(name, version, updated_at) VALUES(?, 0, ?)", (table, now)
+            )
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cur.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{event.lower()} AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE table_versions SET version = version + 1,
+                        updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') WHERE name = '{table}';
+                    END
+                    """
+                )
+
+    def table_state(self, *tables: str) -> TableState:
+        names = ("__epoch__",) + tables
+        placeholders = ",".join("?" for _ in names)
+        rows = self.conn.execute(
+            f"SELECT name, version, updated_at FROM table_versions WHERE name IN ({placeholders})", names
+        ).fetchall()
+        by_name = {r["name"]: r for r in rows}
+        version = ",".join(f"{n}:{by_name[n]['version'] if n in by_name else 0}" for n in names)
+        stamps = [datetime.fromisoformat(by_name[n]["updated_at"]) for n in tables if n in by_name and by_name[n]["updated_at"]]
+        return TableState(version=version, last_modified=max(stamps) if stamps else None)
+
 
 class ClientRepository:
     def __init__(self, db: Database) -> None:
@@ -334,6 +672,7 @@ class ClientRepository:
             ),
         )
         self.db.conn.commit()
+        self.db.emit_write("clients", [client])
         return client
 
     def _row_to_client(self, row: sqlite3.Row) -> Client:
@@ -361,7 +700,7 @@ class PulseResponseRepository:
         self.db = db
 
     def add(self, response: PulseResponse) -> PulseResponse:
-        self.db.conn.execute(
+        self.db.execute(
             """
             INSERT INTO pulse_responses VALUES(?,?,?,?,?,?,?,?,?,?,?)
             """,
@@ -379,13 +718,16 @@ class PulseResponseRepository:
                 _utc(response.submitted_at),
             ),
         )
-        self.db.conn.commit()
+        self.db.emit_write("pulse_responses", [response])
         return response
 
-    def list_by_client(self, client_id: str) -> List[PulseResponse]:
-        cur = self.db.conn.execute(
-            "SELECT * FROM pulse_responses WHERE client_id = ? ORDER BY submitted_at DESC", (client_id,)
-        )
+    def list_by_client(self, client_id: str, limit: Optional[int] = None) -> List[PulseResponse]:
+        sql = "SELECT * FROM pulse_responses WHERE client_id = ? ORDER BY submitted_at DESC"
+        params: List = [client_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cur = self.db.conn.execute(sql, params)
         return [self._row_to_response(r) for r in cur.fetchall()]
 
     def latest_by_client(self, client_id: str) -> Optional[PulseResponse]:
@@ -507,9 +849,14 @@ class PulssChatSessionRepository:
             _utc(session.created_at),
             session.finalized_at.isoformat() if session.finalized_at else None,
             session.final_report,
+            json.dumps(session.slots, ensure_ascii=False) if session.slots else None,
         )
         try:
-            self.db.execute("INSERT INTO pulss_chat_sessions VALUES(?,?,?,?,?,?)", params)
+            self.db.execute(
+                "INSERT INTO pulss_chat_sessions(id, client_id, status, created_at, finalized_at, final_report, slots) "
+                "VALUES(?,?,?,?,?,?,?)",
+                params,
+            )
         except Exception:
             logger.exception("[pulss] session add failed; param_types=%s", [type(p).__name__ for p in params])
             raise
@@ -527,7 +874,7 @@ class PulssChatSessionRepository:
         for k, v in kwargs.items():
             if hasattr(session, k) and v is not None:
                 setattr(session, k, v)
-        self.db.conn.execute(
+        self.db.execute(
             "UPDATE pulss_chat_sessions SET status=?, finalized_at=?, final_report=? WHERE id=?",
             (
                 session.status,
@@ -536,9 +883,14 @@ class PulssChatSessionRepository:
                 session_id,
             ),
         )
-        self.db.conn.commit()
+        self.db.emit_write("pulss_chat_sessions", [session])
         return session
 
+    def update_slots(self, session_id: str, slots: dict) -> None:
+        self.db.execute(
+            "UPDATE pulss_chat_sessions SET slots=? WHERE id=?", (json.dumps(slots, ensure_ascii=False), session_id)
+        )
+
     def _row(self, row: sqlite3.Row) -> PulssChatSession:
         return PulssChatSession(
             id=row["id"],
@@ -547,6 +899,7 @@ class PulssChatSessionRepository:
             created_at=datetime.fromisoformat(row["created_at"]),
             finalized_at=datetime.fromisoformat(row["finalized_at"]) if row["finalized_at"] else None,
             final_report=row["final_report"],
+            slots=json.loads(row["slots"]) if row["slots"] else {},
         )
 
 
@@ -555,13 +908,55 @@ class PulssChatMessageRepository:
         self.db = db
 
     def add(self, message: PulssChatMessage) -> PulssChatMessage:
-        self.db.conn.execute(
+        self.db.execute(
             "INSERT INTO pulss_chat_messages VALUES(?,?,?,?,?)",
             (message.id, message.session_id, message.role, message.content, _utc(message.created_at)),
         )
-        self.db.conn.commit()
         return message
 
+    def add_turn(
+        self,
+        user_message: PulssChatMessage,
+        assistant_message: PulssChatMessage,
+        done: bool,
+        idempotency_key: Optional[str] = None,
+        request_hash: Optional[str] = None,
+    ) -> None:
+        """Store a user/assistant pair (and its idempotency record) in one transaction."""
+        with self.db.lock:
+            try:
+                for m in (user_message, assistant_message):
+                    self.db.conn.execute(
+                        "INSERT INTO pulss_chat_messages VALUES(?,?,?,?,?)",
+                        (m.id, m.session_id, m.role, m.content, _utc(m.created_at)),
+                    )
+                if idempotency_key:
+                    self.db.conn.execute(
+                        "INSERT INTO pulss_chat_idempotency VALUES(?,?,?,?,?,?)",
+                        (
+                            user_message.session_id,
+                            idempotency_key,
+                            request_hash or "",
+                            assistant_message.content,
+                            int(done),
+                            _utc(assistant_message.created_at),
+                        ),
+                    )
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                logger.exception("[pulss] chat turn save failed: session_id=%s", user_message.session_id)
+                raise
+
+    def get_idempotent_reply(self, session_id: str, idempotency_key: str) -> Optional[tuple[str, str, bool]]:
+        """(request_hash, assistant_message, done) stored for a previous post with this key."""
+        row = self.db.conn.execute(
+            "SELECT request_hash, assistant_message, done FROM pulss_chat_idempotency "
+            "WHERE session_id = ? AND idempotency_key = ?",
+            (session_id, idempotency_key),
+        ).fetchone()
+        return (row["request_hash"], row["assistant_message"], bool(row["done"])) if row else None
+
     def list_for_session(self, session_id: str) -> List[PulssChatMessage]:
         cur = self.db.conn.execute(
             "SELECT * FROM pulss_chat_messages WHERE session_id = ? ORDER BY created_at ASC", (session_id,)
@@ -578,13 +973,106 @@ class PulssChatMessageRepository:
         )
 
 
+class LlmUsageRepository:
+    # group_by -> SQL expression for the group key
+    GROUPINGS = {
+        "session": "session_id",
+        "client": "client_id",
+        "day": "substr(created_at, 1, 10)",
+    }
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+
+    def add(self, usage: LlmUsage) -> LlmUsage:
+        self.db.execute(
+            "INSERT INTO llm_usage VALUES(?,?,?,?,?,?,?,?,?,?)",
+            (
+                usage.id,
+                usage.session_id,
+                usage.client_id,
+                usage.purpose,
+                usage.model,
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                usage.latency_ms,
+                int(usage.estimated),
+                _utc(usage.created_at),
+            ),
+        )
+        return usage
+
+    def total_for_session(self, session_id: str) -> int:
+        row = self.db.conn.execute(
+            "SELECT COALESCE(SUM(prompt_tokens + completion_tokens), 0) AS total FROM llm_usage WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        return int(row["total"])
+
+    def total_for_client(self, client_id: str, since: datetime) -> int:
+        row = self.db.conn.execute(
+            "SELECT COALESCE(SUM(prompt_tokens + completion_tokens), 0) AS total FROM llm_usage "
+            "WHERE client_id = ? AND created_at >= ?",
+            (client_id, _utc(since)),
+        ).fetchone()
+        return int(row["total"])
+
+    def summarize(
+        self,
+        group_by: str,
+        client_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[LlmUsageSummary]:
+        key = self.GROUPINGS[group_by]
+        where: List[str] = []
+        params: List = []
+        if client_id:
+            where.append("client_id = ?")
+            params.append(client_id)
+        if session_id:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if since:
+            where.append("created_at >= ?")
+            params.append(_utc(since))
+        if until:
+            where.append("created_at < ?")
+            params.append(_utc(until))
+        sql = (
+            f"SELECT {key} AS key, COUNT(*) AS calls, SUM(prompt_tokens) AS prompt_tokens, "
+            "SUM(completion_tokens) AS completion_tokens, AVG(latency_ms) AS avg_latency_ms, "
+            "GROUP_CONCAT(DISTINCT model) AS models FROM llm_usage"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        order = "key DESC" if group_by == "day" else "SUM(prompt_tokens + completion_tokens) DESC"
+        sql += f" GROUP BY {key} ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        return [
+            LlmUsageSummary(
+                key=r["key"] or "",
+                calls=r["calls"],
+                prompt_tokens=r["prompt_tokens"],
+                completion_tokens=r["completion_tokens"],
+                total_tokens=r["prompt_tokens"] + r["completion_tokens"],
+                avg_latency_ms=round(r["avg_latency_ms"] or 0.0, 1),
+                models=sorted((r["models"] or "").split(",")) if r["models"] else [],
+            )
+            for r in self.db.conn.execute(sql, params).fetchall()
+        ]
+
+
 class AiDraftRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
     def add(self, draft: AiDraft) -> AiDraft:
-        self.db.conn.execute(
-            "INSERT INTO ai_drafts VALUES(?,?,?,?,?,?,?)",
+        self.db.execute(
+            "INSERT INTO ai_drafts(id, client_id, type, status, content, created_at, updated_at, input_hash) "
+            "VALUES(?,?,?,?,?,?,?,?)",
             (
                 draft.id,
                 draft.client_id,
@@ -593,13 +1081,25 @@ class AiDraftRepository:
                 draft.content,
                 _utc(draft.created_at),
                 _utc(draft.updated_at),
+                draft.input_hash,
             ),
         )
-        self.db.conn.commit()
         return draft
 
-    def list_for_client(self, client_id: str) -> List[AiDraft]:
-        cur = self.db.conn.execute("SELECT * FROM ai_drafts WHERE client_id=? ORDER BY created_at DESC", (client_id,))
+    def find_by_hash(self, client_id: str, input_hash: str) -> Optional[AiDraft]:
+        row = self.db.conn.execute(
+            "SELECT * FROM ai_drafts WHERE client_id = ? AND input_hash = ? ORDER BY created_at DESC LIMIT 1",
+            (client_id, input_hash),
+        ).fetchone()
+        return self._row(row) if row else None
+
+    def list_for_client(self, client_id: str, limit: Optional[int] = None) -> List[AiDraft]:
+        sql = "SELECT * FROM ai_drafts WHERE client_id=? ORDER BY created_at DESC"
+        params: List = [client_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cur = self.db.conn.execute(sql, params)
         return [self._row(r) for r in cur.fetchall()]
 
     def _row(self, row: sqlite3.Row) -> AiDraft:
@@ -611,6 +1111,7 @@ class AiDraftRepository:
             content=row["content"],
             created_at=datetime.fromisoformat(row["created_at"]),
             updated_at=datetime.fromisoformat(row["updated_at"]),
+            input_hash=row["input_hash"],
         )
 
 
@@ -728,15 +1229,19 @@ class AiSuggestionRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def list_by_client(self, client_id: str) -> List[AiSuggestion]:
-        cur = self.db.conn.execute(
-            "SELECT * FROM ai_suggestions WHERE client_id = ? ORDER BY created_at DESC", (client_id,)
-        )
+    def list_by_client(self, client_id: str, limit: Optional[int] = None) -> List[AiSuggestion]:
+        sql = "SELECT * FROM ai_suggestions WHERE client_id = ? ORDER BY created_at DESC"
+        params: List = [client_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cur = self.db.conn.execute(sql, params)
         return [self._row_to_ai(r) for r in cur.fetchall()]
 
     def add(self, suggestion: AiSuggestion) -> AiSuggestion:
-        self.db.conn.execute(
-            "INSERT INTO ai_suggestions VALUES(?,?,?,?,?,?,?,?,?)",
+        self.db.execute(
+            "INSERT INTO ai_suggestions(id, client_id, type, title, body, status, created_by, created_at, updated_at, "
+            "input_hash) VALUES(?,?,?,?,?,?,?,?,?,?)",
             (
                 suggestion.id,
                 suggestion.client_id,
@@ -747,11 +1252,49 @@ class AiSuggestionRepository:
                 suggestion.created_by,
                 _utc(suggestion.created_at),
                 _utc(suggestion.updated_at),
+                suggestion.input_hash,
             ),
         )
-        self.db.conn.commit()
         return suggestion
 
+    def add_many(self, suggestions: List[AiSuggestion]) -> None:
+        """Insert all rows in one transaction."""
+        rows = [
+            (
+                s.id,
+                s.client_id,
+                s.type,
+                s.title,
+                s.body,
+                s.status.value,
+                s.created_by,
+                _utc(s.created_at),
+                _utc(s.updated_at),
+                s.input_hash,
+            )
+            for s in suggestions
+        ]
+        with self.db.lock:
+            try:
+                self.db.conn.executemany(
+                    "INSERT INTO ai_suggestions(id, client_id, type, title, body, status, created_by, created_at, "
+                    "updated_at, input_hash) VALUES(?,?,?,?,?,?,?,?,?,?)",
+                    rows,
+                )
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                logger.exception("[pulss] ai_suggestions bulk insert failed; rows=%d", len(rows))
+                raise
+
+    def find_by_hash(self, client_id: str, type_: str, input_hash: str) -> Optional[AiSuggestion]:
+        row = self.db.conn.execute(
+            "SELECT * FROM ai_suggestions WHERE client_id = ? AND input_hash = ? AND type = ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (client_id, input_hash, type_),
+        ).fetchone()
+        return self._row_to_ai(row) if row else None
+
     def _row_to_ai(self, row: sqlite3.Row) -> AiSuggestion:
         return AiSuggestion(
             id=row["id"],
@@ -763,6 +1306,7 @@ class AiSuggestionRepository:
             created_by=row["created_by"],
             created_at=datetime.fromisoformat(row["created_at"]),
             updated_at=datetime.fromisoformat(row["updated_at"]),
+            input_hash=row["input_hash"],
         )
 
 
@@ -770,24 +1314,118 @@ class ScheduleRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def list(self, date: Optional[str] = None, team: Optional[str] = None) -> List[ScheduleEvent]:
+    def list(
+        self,
+        date: Optional[str] = None,
+        team: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        earliest_start: Optional[str] = None,
+    ) -> List[ScheduleEvent]:
+        """Events starting on `date` and/or overlapping [start, end) (schedule_key strings).
+
+        `earliest_start` (start minus the longest event) bounds the start side of an overlap
+        query so it stays an index range instead of scanning every earlier event. With a
+        date or range, recurring series are left out; see `series`.
+        """
         sql = "SELECT * FROM schedules WHERE 1=1"
         params: List = []
+        if date or start or end:
+            sql += " AND rrule IS NULL"
+        if team:
+            sql += " AND team = ?"
+            params.append(team)
         if date:
-            sql += " AND DATE(start) = DATE(?)"
-            params.append(date)
+            sql += f" AND {_SCHEDULE_START} >= DATE(?) AND {_SCHEDULE_START} < DATE(?, '+1 day')"
+            params.extend([date, date])
+        if end:
+            sql += f" AND {_SCHEDULE_START} < ?"
+            params.append(end)
+        if start:
+            sql += f" AND {_SCHEDULE_END} > ?"
+            params.append(start)
+            if earliest_start:
+                sql += f" AND {_SCHEDULE_START} >= ?"
+                params.append(earliest_start)
+        sql += f" ORDER BY {_SCHEDULE_START}"
+        cur = self.db.conn.execute(sql, params)
+        return [self._row_to_event(r) for r in cur.fetchall()]
+
+    def intervals(self) -> List[sqlite3.Row]:
+        """(id, team, start, end) of every single (non-recurring) event, as schedule_key strings."""
+        cur = self.db.conn.execute(
+            f"SELECT id, team, {_SCHEDULE_START} AS start, {_SCHEDULE_END} AS \"end\" FROM schedules "
+            "WHERE rrule IS NULL"
+        )
+        return cur.fetchall()
+
+    def series(
+        self, team: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None
+    ) -> List[ScheduleEvent]:
+        """Recurring events whose span (first start to last end) may overlap [start, end)."""
+        sql = "SELECT * FROM schedules WHERE rrule IS NOT NULL"
+        params: List = []
         if team:
             sql += " AND team = ?"
             params.append(team)
-        sql += " ORDER BY start"
+        if end:
+            sql += f" AND {_SCHEDULE_START} < ?"
+            params.append(end)
+        if start:
+            sql += " AND (series_end IS NULL OR series_end > ?)"
+            params.append(start)
         cur = self.db.conn.execute(sql, params)
         return [self._row_to_event(r) for r in cur.fetchall()]
 
+    def exceptions(self, event_ids: List[str]) -> Dict[str, Dict[str, ScheduleException]]:
+        """series id -> recurrence_id -> exception."""
+        out: Dict[str, Dict[str, ScheduleException]] = {}
+        if not event_ids:
+            return out
+        marks = ",".join("?" for _ in event_ids)
+        cur = self.db.conn.execute(f"SELECT * FROM schedule_exceptions WHERE event_id IN ({marks})", event_ids)
+        for r in cur.fetchall():
+            out.setdefault(r["event_id"], {})[r["recurrence_id"]] = ScheduleException(
+                event_id=r["event_id"],
+                recurrence_id=r["recurrence_id"],
+                cancelled=bool(r["cancelled"]),
+                title=r["title"],
+                start=datetime.fromisoformat(r["start"]) if r["start"] else None,
+                end=datetime.fromisoformat(r["end"]) if r["end"] else None,
+                description=r["description"],
+            )
+        return out
+
+    def put_exception(self, exc: ScheduleException) -> ScheduleException:
+        self.db.execute(
+            "INSERT OR REPLACE INTO schedule_exceptions VALUES(?,?,?,?,?,?,?)",
+            (
+                exc.event_id,
+                exc.recurrence_id,
+                int(exc.cancelled),
+                exc.title,
+                _utc(exc.start) if exc.start else None,
+                _utc(exc.end) if exc.end else None,
+                exc.description,
+            ),
+        )
+        return exc
+
+    def get_many(self, event_ids: List[str]) -> List[ScheduleEvent]:
+        if not event_ids:
+            return []
+        marks = ",".join("?" for _ in event_ids)
+        cur = self.db.conn.execute(
+            f"SELECT * FROM schedules WHERE id IN ({marks}) ORDER BY {_SCHEDULE_START}", event_ids
+        )
+        return [self._row_to_event(r) for r in cur.fetchall()]
+
     def add(self, event: ScheduleEvent) -> ScheduleEvent:
         if not event.id:
             event.id = generate_id()
         self.db.conn.execute(
-            "INSERT INTO schedules VALUES(?,?,?,?,?,?,?)",
+            'INSERT INTO schedules(id, title, start, "end", type, team, description, rrule, series_end) '
+            "VALUES(?,?,?,?,?,?,?,?,?)",
             (
                 event.id,
                 event.title,
@@ -796,6 +1434,8 @@ class ScheduleRepository:
                 event.type,
                 event.team,
                 event.description,
+                event.rrule,
+                _series_end(event),
             ),
         )
         self.db.conn.commit()
@@ -810,16 +1450,33 @@ class ScheduleRepository:
                 setattr(event, key, val)
         self.db.conn.execute(
             """
-            UPDATE schedules SET title=?, start=?, "end"=?, type=?, team=?, description=? WHERE id=?
+            UPDATE schedules SET title=?, start=?, "end"=?, type=?, team=?, description=?, rrule=?, series_end=?
+            WHERE id=?
             """,
-            (event.title, _utc(event.start), _utc(event.end), event.type, event.team, event.description, event_id),
+            (
+                event.title,
+                _utc(event.start),
+                _utc(event.end),
+                event.type,
+                event.team,
+                event.description,
+                event.rrule,
+                _series_end(event),
+                event_id,
+            ),
         )
         self.db.conn.commit()
         return event
 
     def delete(self, event_id: str) -> None:
-        self.db.conn.execute("DELETE FROM schedules WHERE id = ?", (event_id,))
-        self.db.conn.commit()
+        with self.db.lock:
+            try:
+                self.db.conn.execute("DELETE FROM schedules WHERE id = ?", (event_id,))
+                self.db.conn.execute("DELETE FROM schedule_exceptions WHERE event_id = ?", (event_id,))
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                raise
 
     def get(self, event_id: str) -> Optional[ScheduleEvent]:
         cur = self.db.conn.execute("SELECT * FROM schedules WHERE id = ?", (event_id,))
@@ -835,6 +1492,7 @@ class ScheduleRepository:
             type=row["type"],
             team=row["team"],
             description=row["description"],
+            rrule=row["rrule"],
         )
 
 
@@ -874,6 +1532,7 @@ class SnsNewsRepository:
                 ),
             )
         self.db.conn.commit()
+        self.db.emit_write("sns_news", items)
 
     def _row_to_news(self, row: sqlite3.Row) -> SnsNews:
         return SnsNews(
@@ -898,58 +1557,116 @@ class LeadRepository:
         return [self._row(r) for r in cur.fetchall()]
 
     def add(self, lead: Lead) -> Lead:
-        self.db.conn.execute(
-            """
-            INSERT INTO leads VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
-            """,
-            (
-                lead.id,
-                lead.company_name,
-                lead.industry,
-                lead.source,
-                lead.area,
-                lead.owner,
-                lead.status.value,
-                lead.score,
-                lead.expected_mrr,
-                lead.last_contact_at.isoformat() if lead.last_contact_at else None,
-                lead.memo,
-                _utc(lead.created_at),
-                _utc(lead.updated_at),
-            ),
-        )
-        self.db.conn.commit()
+        with self.db.lock:
+            try:
+                self.db.conn.execute(
+                    """
+                    INSERT INTO leads VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
+                    """,
+                    (
+                        lead.id,
+                        lead.company_name,
+                        lead.industry,
+                        lead.source,
+                        lead.area,
+                        lead.owner,
+                        lead.status.value,
+                        lead.score,
+                        lead.expected_mrr,
+                        lead.last_contact_at.isoformat() if lead.last_contact_at else None,
+                        lead.memo,
+                        _utc(lead.created_at),
+                        _utc(lead.updated_at),
+                    ),
+                )
+                self._add_status_event(lead.id, None, lead.status.value, lead.created_at)
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                raise
+        self.db.emit_write("leads", [lead])
         return lead
 
     def update(self, lead_id: str, payload: dict) -> Optional[Lead]:
         lead = self.get(lead_id)
         if not lead:
             return None
+        previous_status = lead.status
         for k, v in payload.items():
             if hasattr(lead, k) and v is not None:
                 setattr(lead, k, v)
         lead.updated_at = datetime.utcnow()
-        self.db.conn.execute(
+        with self.db.lock:
+            try:
+                self.db.conn.execute(
+                    """
+                    UPDATE leads SET company_name=?, industry=?, source=?, area=?, owner=?, status=?, score=?, expected_mrr=?, last_contact_at=?, memo=?, updated_at=? WHERE id=?
+                    """,
+                    (
+                        lead.company_name,
+                        lead.industry,
+                        lead.source,
+                        lead.area,
+                        lead.owner,
+                        lead.status.value,
+                        lead.score,
+                        lead.expected_mrr,
+                        lead.last_contact_at.isoformat() if lead.last_contact_at else None,
+                        lead.memo,
+                        _utc(lead.updated_at),
+                        lead_id,
+                    ),
+                )
+                if lead.status != previous_status:
+                    self._add_status_event(lead_id, previous_status.value, lead.status.value, lead.updated_at)
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                raise
+        self.db.emit_write("leads", [lead])
+        return lead
+
+    def scoring_inputs(self, contacts_since: str) -> List[sqlite3.Row]:
+        """Every lead with its contact and proposal aggregates, in one grouped scan each."""
+        cur = self.db.conn.execute(
             """
-            UPDATE leads SET company_name=?, industry=?, source=?, area=?, owner=?, status=?, score=?, expected_mrr=?, last_contact_at=?, memo=?, updated_at=? WHERE id=?
+            SELECT l.id, l.industry, l.area, l.source, l.status, l.score, l.last_contact_at, l.created_at,
+                   COALESCE(c.recent, 0) AS recent_contacts, c.last_at AS last_logged_contact,
+                   COALESCE(p.won, 0) AS proposals_won, COALESCE(p.lost, 0) AS proposals_lost,
+                   COALESCE(p.open, 0) AS proposals_open
+            FROM leads l
+            LEFT JOIN (
+                SELECT lead_id, SUM(contact_at >= ?) AS recent, MAX(contact_at) AS last_at
+                FROM contact_logs GROUP BY lead_id
+            ) c ON c.lead_id = l.id
+            LEFT JOIN (
+                SELECT lead_id, SUM(status = 'won') AS won, SUM(status = 'lost') AS lost,
+                       SUM(status IN ('draft', 'sent', 'following')) AS open
+                FROM proposals WHERE lead_id IS NOT NULL GROUP BY lead_id
+            ) p ON p.lead_id = l.id
+            ORDER BY l.id
             """,
-            (
-                lead.company_name,
-                lead.industry,
-                lead.source,
-                lead.area,
-                lead.owner,
-                lead.status.value,
-                lead.score,
-                lead.expected_mrr,
-                lead.last_contact_at.isoformat() if lead.last_contact_at else None,
-                lead.memo,
-                _utc(lead.updated_at),
-                lead_id,
-            ),
+            (contacts_since,),
+        )
+        return cur.fetchall()
+
+    def update_scores(self, scores: List[tuple]) -> None:
+        """Bulk-write (score, lead_id) pairs in one transaction; updated_at is left alone."""
+        if not scores:
+            return
+        with self.db.lock:
+            try:
+                self.db.conn.executemany("UPDATE leads SET score = ? WHERE id = ?", scores)
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                raise
+
+    def _add_status_event(self, lead_id: str, from_status: Optional[str], to_status: str, at: datetime) -> None:
+        self.db.conn.execute(
+            "INSERT INTO lead_status_events(lead_id, from_status, to_status, changed_at) VALUES(?,?,?,?)",
+            (lead_id, from_status, to_status, _utc(at)),
         )
-        self.db.conn.commit()
-        return lead
 
     def get(self, lead_id: str) -> Optional[Lead]:
         cur = self.db.conn.execute("SELECT * FROM leads WHERE id = ?", (lead_id,))
@@ -996,6 +1713,7 @@ class ContactLogRepository:
             ),
         )
         self.db.conn.commit()
+        self.db.emit_write("contact_logs", [log])
         return log
 
     def _row(self, row: sqlite3.Row) -> ContactLog:
@@ -1014,10 +1732,13 @@ class ProposalRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def list_for_client(self, client_id: str) -> List[Proposal]:
-        cur = self.db.conn.execute(
-            "SELECT * FROM proposals WHERE client_id = ? ORDER BY updated_at DESC", (client_id,)
-        )
+    def list_for_client(self, client_id: str, limit: Optional[int] = None) -> List[Proposal]:
+        sql = "SELECT * FROM proposals WHERE client_id = ? ORDER BY updated_at DESC"
+        params: List = [client_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cur = self.db.conn.execute(sql, params)
         return [self._row(r) for r in cur.fetchall()]
 
     def add(self, proposal: Proposal) -> Proposal:
@@ -1043,6 +1764,7 @@ class ProposalRepository:
             ),
         )
         self.db.conn.commit()
+        self.db.emit_write("proposals", [proposal])
         return proposal
 
     def update(self, proposal_id: str, payload: dict) -> Optional[Proposal]:
@@ -1070,6 +1792,7 @@ class ProposalRepository:
             ),
         )
         self.db.conn.commit()
+        self.db.emit_write("proposals", [proposal])
         return proposal
 
     def get(self, proposal_id: str) -> Optional[Proposal]:
@@ -1098,8 +1821,13 @@ class ContractRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def list_for_client(self, client_id: str) -> List[Contract]:
-        cur = self.db.conn.execute("SELECT * FROM contracts WHERE client_id = ? ORDER BY created_at DESC", (client_id,))
+    def list_for_client(self, client_id: str, limit: Optional[int] = None) -> List[Contract]:
+        sql = "SELECT * FROM contracts WHERE client_id = ? ORDER BY created_at DESC"
+        params: List = [client_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cur = self.db.conn.execute(sql, params)
         return [self._row(r) for r in cur.fetchall()]
 
     def add(self, contract: Contract) -> Contract:
@@ -1161,6 +1889,7 @@ class ClientBriefRepository:
             ),
         )
         self.db.conn.commit()
+        self.db.emit_write("client_briefs", [brief])
         return brief
 
     def get_by_client(self, client_id: str) -> Optional[ClientBrief]:
@@ -1184,10 +1913,13 @@ class ContentPostRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def list_for_client(self, client_id: str) -> List[ContentPost]:
-        cur = self.db.conn.execute(
-            "SELECT * FROM content_posts WHERE client_id = ? ORDER BY scheduled_date", (client_id,)
-        )
+    def list_for_client(self, client_id: str, limit: Optional[int] = None) -> List[ContentPost]:
+        sql = "SELECT * FROM content_posts WHERE client_id = ? ORDER BY scheduled_date"
+        params: List = [client_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cur = self.db.conn.execute(sql, params)
         return [self._row(r) for r in cur.fetchall()]
 
     def add(self, post: ContentPost) -> ContentPost:
@@ -1266,26 +1998,120 @@ class MetricSnapshotRepository:
     def __init__(self, db: Database) -> None:
         self.db = db
 
-    def list_for_client(self, client_id: str) -> List[MetricSnapshot]:
-        cur = self.db.conn.execute(
-            "SELECT * FROM metric_snapshots WHERE client_id = ? ORDER BY period DESC", (client_id,)
-        )
+    def list_for_client(self, client_id: str, limit: Optional[int] = None) -> List[MetricSnapshot]:
+        sql = "SELECT * FROM metric_snapshots WHERE client_id = ? ORDER BY period DESC"
+        params: List = [client_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cur = self.db.conn.execute(sql, params)
         return [self._row(r) for r in cur.fetchall()]
 
     def add(self, snap: MetricSnapshot) -> MetricSnapshot:
-        self.db.conn.execute(
-            "INSERT INTO metric_snapshots VALUES(?,?,?, ?,?)",
-            (
-                snap.id,
-                snap.client_id,
-                snap.period,
-                json.dumps(snap.metrics),
-                _utc(snap.created_at),
-            ),
-        )
-        self.db.conn.commit()
+        """Store the snapshot, its numeric values as metric_values rows, and mark the
+        client's rollups stale, in one transaction."""
+        values = [(snap.client_id, snap.period, k, float(v)) for k, v in snap.metrics.items() if _is_number(v)]
+        with self.db.lock:
+            try:
+                self.db.conn.execute(
+                    "INSERT INTO metric_snapshots VALUES(?,?,?, ?,?)",
+                    (
+                        snap.id,
+                        snap.client_id,
+                        snap.period,
+                        json.dumps(snap.metrics),
+                        _utc(snap.created_at),
+                    ),
+                )
+                self.db.conn.executemany(
+                    "INSERT OR REPLACE INTO metric_values(client_id, period, metric, value) VALUES(?,?,?,?)", values
+                )
+                self.db.conn.execute(_MARK_ROLLUP_DIRTY, (snap.client_id,))
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                raise
+        self.db.emit_write("metric_snapshots", [snap])
         return snap
 
+    def dirty_clients(self, limit: int = 1000) -> Dict[str, int]:
+        """Clients whose metric values changed since their rollups were computed -> change version."""
+        rows = self.db.conn.execute("SELECT client_id, version FROM metric_rollup_dirty LIMIT ?", (limit,)).fetchall()
+        return {r["client_id"]: r["version"] for r in rows}
+
+    def values_for_clients(self, client_ids: List[str]) -> List[sqlite3.Row]:
+        placeholders = ",".join("?" for _ in client_ids)
+        return self.db.conn.execute(
+            f"SELECT client_id, metric, period, value FROM metric_values WHERE client_id IN ({placeholders}) "
+            "ORDER BY client_id, metric, period",
+            client_ids,
+        ).fetchall()
+
+    def replace_rollups(self, dirty: Dict[str, int], rows: List[tuple]) -> None:
+        """Swap in freshly computed rollups for `dirty` clients. A client written to again
+        while they were computed keeps its dirty mark (its version moved on)."""
+        ids = list(dirty)
+        placeholders = ",".join("?" for _ in ids)
+        with self.db.lock:
+            try:
+                self.db.conn.execute(f"DELETE FROM metric_rollups WHERE client_id IN ({placeholders})", ids)
+                self.db.conn.executemany(
+                    "INSERT INTO metric_rollups(client_id, metric, period, value, mom, yoy, avg3) VALUES(?,?,?,?,?,?,?)",
+                    rows,
+                )
+                self.db.conn.executemany(
+                    "DELETE FROM metric_rollup_dirty WHERE client_id = ? AND version = ?", list(dirty.items())
+                )
+                self.db.conn.commit()
+            except Exception:
+                self.db.conn.rollback()
+                logger.exception("[pulss] metric rollup write failed; clients=%d rows=%d", len(ids), len(rows))
+                raise
+
+    def kpi_source(self, periods: List[str], industry: Optional[str] = None) -> List[sqlite3.Row]:
+        """Rollup rows of `periods` with the client attributes KPIs can be grouped by."""
+        sql = (
+            "SELECT r.period, r.metric, r.value, r.mom, c.industry, c.phase, c.status FROM metric_rollups r "
+            f"JOIN clients c ON c.id = r.client_id WHERE r.period IN ({','.join('?' for _ in periods)})"
+        )
+        params: List = list(periods)
+        if industry:
+            sql += " AND c.industry = ?"
+            params.append(industry)
+        return self.db.conn.execute(sql, params).fetchall()
+
+    def rollups(
+        self,
+        client_ids: Optional[List[str]] = None,
+        industry: Optional[str] = None,
+        metrics: Optional[List[str]] = None,
+        period_from: Optional[str] = None,
+        period_to: Optional[str] = None,
+    ) -> List[sqlite3.Row]:
+        sql = "SELECT r.client_id, r.metric, r.period, r.value, r.mom, r.yoy, r.avg3 FROM metric_rollups r"
+        where: List[str] = []
+        params: List = []
+        if industry:
+            sql += " JOIN clients c ON c.id = r.client_id"
+            where.append("c.industry = ?")
+            params.append(industry)
+        if client_ids:
+            where.append(f"r.client_id IN ({','.join('?' for _ in client_ids)})")
+            params.extend(client_ids)
+        if metrics:
+            where.append(f"r.metric IN ({','.join('?' for _ in metrics)})")
+            params.extend(metrics)
+        if period_from:
+            where.append("r.period >= ?")
+            params.append(period_from)
+        if period_to:
+            where.append("r.period <= ?")
+            params.append(period_to)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.client_id, r.metric, r.period"
+        return self.db.conn.execute(sql, params).fetchall()
+
     def _row(self, row: sqlite3.Row) -> MetricSnapshot:
         return MetricSnapshot(
             id=row["id"],
@@ -1341,14 +2167,17 @@ def seed_data(
     client_repo: ClientRepository,
     template_repo: TaskTemplateRepository,
     task_repo: TaskRepository,
+    now: Optional[datetime] = None,
+    new_id: Callable[[], str] = generate_id,
 ) -> None:
+    """Demo templates and clients. `now` and `new_id` let the bench dataset reproduce them exactly."""
     # Seed only when empty
     if client_repo.list():
         return
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
     templates = [
         TaskTemplate(
-            id=generate_id(),
+            id=new_id(),
             name="アカウント情報取得",
             category=TaskCategory.ONBOARDING,
             default_offset_days=2,
@@ -1358,7 +2187,7 @@ def seed_data(
             updated_at=now,
         ),
         TaskTemplate(
-            id=generate_id(),
+            id=new_id(),
             name="ブランド素材の受領",
             category=TaskCategory.ONBOARDING,
             default_offset_days=3,
@@ -1368,7 +2197,7 @@ def seed_data(
             updated_at=now,
         ),
         TaskTemplate(
-            id=generate_id(),
+            id=new_id(),
             name="初回撮影日ドラフト",
             category=TaskCategory.ONBOARDING,
             default_offset_days=5,
@@ -1378,7 +2207,7 @@ def seed_data(
             updated_at=now,
         ),
         TaskTemplate(
-            id=generate_id(),
+            id=new_id(),
             name="KPI目標の確定",
             category=TaskCategory.ONBOARDING,
             default_offset_days=7,
@@ -1429,4 +2258,8 @@ def seed_data(
     for c in sample_clients:
         if c.status == ClientStatus.CONTRACTED:
             for tmpl in template_repo.active_onboarding():
-                task_repo.add(tmpl.to_task(client_id=c.id, assignee=tmpl.default_assignee_role))
+                task = tmpl.to_task(client_id=c.id, assignee=tmpl.default_assignee_role)
+                task.id = new_id()
+                task.due_date = now.date() + timedelta(days=tmpl.default_offset_days)
+                task.created_at = task.updated_at = now
+                task_repo.add(task)
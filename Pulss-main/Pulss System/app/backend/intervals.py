@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class _Node:
+    start: float
+    end: float
+    id: str
+    priority: float
+    max_end: float
+    left: Optional["_Node"] = None
+    right: Optional["_Node"] = None
+
+    @property
+    def key(self) -> Tuple[float, str]:
+        return (self.start, self.id)
+
+    def fix(self) -> None:
+        self.max_end = max(
+            self.end,
+            self.left.max_end if self.left else self.end,
+            self.right.max_end if self.right else self.end,
+        )
+
+
+def _rotate_right(node: _Node) -> _Node:
+    top = node.left
+    assert top is not None
+    node.left, top.right = top.right, node
+    node.fix()
+    top.fix()
+    return top
+
+
+def _rotate_left(node: _Node) -> _Node:
+    top = node.right
+    assert top is not None
+    node.right, top.left = top.left, node
+    node.fix()
+    top.fix()
+    return top
+
+
+class IntervalTree:
+    """Half-open [start, end) intervals with O(log n + k) overlap queries.
+
+    A treap ordered by (start, id), each node carrying the max end of its subtree: a query
+    skips any subtree whose max_end is <= the query start, and everything right of a node
+    starting at or after the query end. Touching intervals (a.end == b.start) do not overlap.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[_Node] = None
+        self._spans: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._spans
+
+    def add(self, item_id: str, start: float, end: float) -> None:
+        """Insert (or move) an interval."""
+        if item_id in self._spans:
+            self.remove(item_id)
+        self._spans[item_id] = (start, end)
+        self._root = self._insert(self._root, _Node(start, end, item_id, random.random(), end))
+
+    def remove(self, item_id: str) -> None:
+        span = self._spans.pop(item_id, None)
+        if span is not None:
+            self._root = self._delete(self._root, (span[0], item_id))
+
+    def overlapping(self, start: float, end: float) -> List[str]:
+        """Ids of intervals overlapping [start, end), ordered by start."""
+        out: List[str] = []
+        self._query(self._root, start, end, out)
+        return out
+
+    def _insert(self, node: Optional[_Node], new: _Node) -> _Node:
+        if node is None:
+            return new
+        if new.key < node.key:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                return _rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                return _rotate_left(node)
+        node.fix()
+        return node
+
+    def _delete(self, node: Optional[_Node], key: Tuple[float, str]) -> Optional[_Node]:
+        if node is None:
+            return None
+        if key < node.key:
+            node.left = self._delete(node.left, key)
+        elif key > node.key:
+            node.right = self._delete(node.right, key)
+        else:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            # Rotate the higher-priority child up and keep deleting below it.
+            if node.left.priority > node.right.priority:
+                node = _rotate_right(node)
+                node.right = self._delete(node.right, key)
+            else:
+                node = _rotate_left(node)
+                node.left = self._delete(node.left, key)
+        node.fix()
+        return node
+
+    def _query(self, node: Optional[_Node], start: float, end: float, out: List[str]) -> None:
+        if node is None or node.max_end <= start:
+            return
+        self._query(node.left, start, end, out)
+        if node.start >= end:
+            return
+        if node.end > start:
+            out.append(node.id)
+        self._query(node.right, start, end, out)
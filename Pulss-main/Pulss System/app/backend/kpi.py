@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+QUANTILES: Tuple[Tuple[str, float], ...] = (("p25", 0.25), ("median", 0.5), ("p75", 0.75), ("p90", 0.9))
+
+
+def grouped_stats(groups: Sequence[int], values: Sequence[float]) -> Dict[str, np.ndarray]:
+    """Count/total/mean/min/max and QUANTILES per group, without a Python loop over groups.
+
+    Rows are sorted by (group, value) once; each group is then a contiguous run, so totals
+    come from np.add.reduceat and quantiles from index arithmetic on the run boundaries
+    (linear interpolation, same as np.percentile's default). The returned arrays are
+    indexed by position in `keys` (the sorted distinct group codes).
+    """
+    g = np.asarray(groups, dtype=np.int64)
+    v = np.asarray(values, dtype=np.float64)
+    if not len(v):
+        return {"keys": np.zeros(0, dtype=np.int64)}
+    order = np.lexsort((v, g))
+    g, v = g[order], v[order]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    counts = np.diff(np.r_[starts, len(v)])
+    totals = np.add.reduceat(v, starts)
+    out: Dict[str, np.ndarray] = {
+        "keys": g[starts],
+        "count": counts,
+        "total": totals,
+        "mean": totals / counts,
+        "min": v[starts],
+        "max": v[starts + counts - 1],
+    }
+    for name, q in QUANTILES:
+        pos = starts + q * (counts - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        out[name] = v[lo] + (v[hi] - v[lo]) * (pos - lo)
+    return out
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from domain import LeadStatus
+from metrics import REGISTRY
+
+RESCORE_SECONDS = REGISTRY.histogram("pulss_lead_rescore_seconds", "Lead batch rescoring time.")
+RESCORE_CHANGED = REGISTRY.counter("pulss_lead_rescore_changed_total", "Lead scores changed by batch rescoring.")
+
+# Share of the 0-100 score per component (sums to 1).
+WEIGHTS = {"segment": 0.35, "recency": 0.2, "engagement": 0.15, "proposals": 0.15, "stage": 0.15}
+# Pseudo-count pulling a segment's win rate towards the overall rate when it has few closed leads.
+SMOOTHING = 5.0
+RECENCY_DAYS = 30.0
+ENGAGEMENT_WINDOW_DAYS = 90
+STAGE_RANK = {
+    LeadStatus.NEW.value: 0,
+    LeadStatus.CALLING.value: 1,
+    LeadStatus.MEETING_SCHEDULED.value: 2,
+    LeadStatus.MEETING_DONE.value: 3,
+    LeadStatus.PROPOSAL.value: 4,
+    LeadStatus.FOLLOWING.value: 5,
+}
+
+
+@dataclass
+class LeadRescoreResult:
+    scored: int
+    changed: int
+    duration_ms: float
+
+
+def _utc_seconds(value: Optional[str]) -> str:
+    """ISO string -> naive-UTC 'YYYY-MM-DDTHH:MM:SS' ('NaT' if missing or unparseable).
+
+    Naive values (how the repositories store them) are UTC and only need slicing; values with
+    an offset or Z are parsed and converted, as schedule_key does.
+    """
+    if not value:
+        return "NaT"
+    tail = value[19:]
+    if "+" not in tail and "-" not in tail and not tail.endswith("Z"):
+        return value[:19]
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return "NaT"
+    return dt.astimezone(timezone.utc).replace(tzinfo=None).isoformat(timespec="seconds")
+
+
+def _timestamps(values: Sequence[Optional[str]]) -> np.ndarray:
+    return np.array([_utc_seconds(v) for v in values], dtype="datetime64[s]")
+
+
+def _segment_rate(keys: Sequence[Optional[str]], won: np.ndarray, closed: np.ndarray, prior: float) -> np.ndarray:
+    """Smoothed win rate of each row's segment (industry/area/source), scaled so prior -> 0.5."""
+    _, inverse = np.unique(np.array([k or "" for k in keys], dtype=object).astype(str), return_inverse=True)
+    wins = np.bincount(inverse, weights=won)
+    totals = np.bincount(inverse, weights=closed)
+    rate = (wins + SMOOTHING * prior) / (totals + SMOOTHING)
+    return np.clip(rate[inverse] / (2 * prior), 0.0, 1.0) if prior else np.full(len(inverse), 0.5)
+
+
+def compute_scores(rows: List, now: Optional[datetime] = None) -> np.ndarray:
+    """0-100 integer score for every lead row (see LeadRepository.scoring_inputs), in one pass.
+
+    Components: win rate of the lead's industry/area/source among closed leads, recency of the
+    last touch, contact frequency over the last ENGAGEMENT_WINDOW_DAYS, proposal history and
+    funnel stage. Won leads score 100 and lost leads 0.
+    """
+    n = len(rows)
+    if not n:
+        return np.zeros(0, dtype=np.int64)
+    now64 = np.datetime64((now or datetime.utcnow()).replace(microsecond=0), "s")
+    status = np.array([r["status"] for r in rows], dtype=object)
+    won = (status == LeadStatus.WON.value).astype(np.float64)
+    lost = (status == LeadStatus.LOST.value).astype(np.float64)
+    closed = won + lost
+    prior = float(won.sum() / closed.sum()) if closed.sum() else 0.0
+
+    segment = (
+        _segment_rate([r["industry"] for r in rows], won, closed, prior)
+        + _segment_rate([r["area"] for r in rows], won, closed, prior)
+        + _segment_rate([r["source"] for r in rows], won, closed, prior)
+    ) / 3
+
+    # Last touch: the lead's last_contact_at, its latest contact log, or creation.
+    touches = np.stack(
+        [
+            _timestamps([r["last_contact_at"] for r in rows]),
+            _timestamps([r["last_logged_contact"] for r in rows]),
+            _timestamps([r["created_at"] for r in rows]),
+        ]
+    )
+    last_touch = np.where(np.isnat(touches), np.datetime64("1970-01-01T00:00:00"), touches).max(axis=0)
+    days = np.maximum((now64 - last_touch).astype(np.float64) / 86400.0, 0.0)
+    recency = np.exp(-days / RECENCY_DAYS)
+
+    contacts = np.array([r["recent_contacts"] for r in rows], dtype=np.float64)
+    engagement = 1.0 - np.exp(-contacts / 3.0)
+
+    p_won = np.array([r["proposals_won"] for r in rows], dtype=np.float64)
+    p_open = np.array([r["proposals_open"] for r in rows], dtype=np.float64)
+    p_lost = np.array([r["proposals_lost"] for r in rows], dtype=np.float64)
+    proposals = np.select([p_won > 0, p_open > 0, p_lost > 0], [1.0, 0.7, 0.1], default=0.3)
+
+    stage = np.array([STAGE_RANK.get(s, 0) for s in status], dtype=np.float64) / max(STAGE_RANK.values())
+
+    score = 100.0 * (
+        WEIGHTS["segment"] * segment
+        + WEIGHTS["recency"] * recency
+        + WEIGHTS["engagement"] * engagement
+        + WEIGHTS["proposals"] * proposals
+        + WEIGHTS["stage"] * stage
+    )
+    score = np.where(won > 0, 100.0, np.where(lost > 0, 0.0, score))
+    return np.rint(score).astype(np.int64)
+
+
+def engagement_since(now: Optional[datetime] = None) -> str:
+    return ((now or datetime.utcnow()) - timedelta(days=ENGAGEMENT_WINDOW_DAYS)).isoformat()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from admission import estimate_tokens
+from metrics import REGISTRY
+
+TOKENS = REGISTRY.counter("pulss_llm_tokens_total", "Tokens used by LLM calls.", ("model", "kind"))
+BUDGET_ACTIONS = REGISTRY.counter(
+    "pulss_llm_budget_actions_total", "Budget-driven downgrades applied to LLM calls.", ("action",)
+)
+
+# Each older user answer kept in a compacted history is cut to this many characters.
+COMPACT_ANSWER_CHARS = 200
+
+
+@dataclass(frozen=True)
+class LlmBudget:
+    """Token budgets for chat sessions. 0 disables a limit.
+
+    Over a session or daily client budget, calls switch to `cheap_model` (when set) and the
+    history is compacted to half of `history_token_limit`; under budget, the history is only
+    compacted once it exceeds `history_token_limit`.
+    """
+
+    session_tokens: int = 0
+    client_daily_tokens: int = 0
+    history_token_limit: int = 6000
+    cheap_model: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "LlmBudget":
+        return cls(
+            session_tokens=int(os.getenv("PULSS_LLM_SESSION_TOKEN_BUDGET", "0") or 0),
+            client_daily_tokens=int(os.getenv("PULSS_LLM_CLIENT_DAILY_TOKEN_BUDGET", "0") or 0),
+            history_token_limit=int(os.getenv("PULSS_LLM_HISTORY_TOKEN_LIMIT", "6000") or 0),
+            cheap_model=os.getenv("PULSS_OPENAI_CHEAP_MODEL") or None,
+        )
+
+    def over_budget(self, session_used: int, client_used_today: int) -> bool:
+        return bool(
+            (self.session_tokens and session_used >= self.session_tokens)
+            or (self.client_daily_tokens and client_used_today >= self.client_daily_tokens)
+        )
+
+
+def estimate_messages(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def compact_history(messages: List[Dict[str, str]], limit: int) -> List[Dict[str, str]]:
+    """Fit a chat history into roughly `limit` tokens without another LLM call.
+
+    Leading system messages and the most recent turns are kept verbatim; older turns are
+    replaced by one system note listing the user's earlier answers (truncated), which is
+    what the hearing prompt needs to avoid asking the same questions again.
+    """
+    if limit <= 0 or estimate_messages(messages) <= limit:
+        return messages
+    head = 0
+    while head < len(messages) and messages[head]["role"] == "system":
+        head += 1
+    system, rest = messages[:head], messages[head:]
+
+    # A quarter of the limit is reserved for the note that replaces the older turns.
+    note_budget = limit // 4
+    budget = limit - estimate_messages(system) - note_budget
+    recent: List[Dict[str, str]] = []
+    # Always keep the latest message (the one being answered).
+    for m in reversed(rest):
+        cost = estimate_tokens(m["content"])
+        if recent and cost > budget:
+            break
+        recent.insert(0, m)
+        budget -= cost
+    older = rest[: len(rest) - len(recent)]
+    if not older:
+        return messages
+    budget = max(0, budget) + note_budget
+
+    answers = [m["content"][:COMPACT_ANSWER_CHARS] for m in older if m["role"] == "user"]
+    lines: List[str] = []
+    # Newest answers are the most useful; drop the oldest ones first if the note does not fit.
+    for answer in reversed(answers):
+        cost = estimate_tokens(answer) + 1
+        if budget - cost < 0:
+            break
+        lines.insert(0, f"- {answer}")
+        budget -= cost
+    note = {
+        "role": "system",
+        "content": "（履歴を圧縮しました）これまでのユーザーの回答:\n" + ("\n".join(lines) if lines else "- （省略）"),
+    }
+    return system + [note] + recent
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import timing
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = self._header()
+        for labels, row in items:
+            cumulative = 0.0
+            bounds = [_fmt(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, row):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_fmt(row[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_fmt(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter("pulss_http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram("pulss_http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+HTTP_DB_QUERIES = REGISTRY.histogram(
+    "pulss_http_request_db_queries", "DB statements issued per HTTP request.", ("route",), buckets=COUNT_BUCKETS
+)
+HTTP_DB_SECONDS = REGISTRY.histogram("pulss_http_request_db_seconds", "DB time spent per HTTP request.", ("route",))
+DB_QUERIES = REGISTRY.counter("pulss_db_queries_total", "DB statements by operation.", ("operation",))
+DB_LATENCY = REGISTRY.histogram("pulss_db_query_duration_seconds", "DB statement latency.", ("operation",))
+EXTERNAL_REQUESTS = REGISTRY.counter(
+    "pulss_external_requests_total", "Outbound calls (openai, n8n) by outcome.", ("service", "outcome")
+)
+EXTERNAL_LATENCY = REGISTRY.histogram("pulss_external_request_duration_seconds", "Outbound call latency.", ("service",))
+
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("pulss_request_stats", default=None)
+
+
+def record_db_query(sql: str, params: Sequence[object], seconds: float, rows: int) -> None:
+    """Query observer for Database: global per-operation stats plus the current request's totals."""
+    operation = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "UNKNOWN"
+    DB_QUERIES.inc(operation)
+    DB_LATENCY.observe(operation, value=seconds)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += seconds
+
+
+@contextmanager
+def track_external(service: str) -> Iterator[None]:
+    """Time an outbound call (metrics + Server-Timing); an exception escaping the block counts as an error."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        elapsed = time.perf_counter() - start
+        EXTERNAL_REQUESTS.inc(service, "error")
+        EXTERNAL_LATENCY.observe(service, value=elapsed)
+        timing.record(service, elapsed)
+        raise
+    elapsed = time.perf_counter() - start
+    EXTERNAL_REQUESTS.inc(service, "ok")
+    EXTERNAL_LATENCY.observe(service, value=elapsed)
+    timing.record(service, elapsed)
+
+
+class MetricsMiddleware:
+    """Per-route request counts, status codes, latency and DB usage."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - start
+            # The router stores the matched route in the scope; use its template, not the raw path.
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(method, template, str(status))
+            HTTP_LATENCY.observe(method, template, value=elapsed)
+            HTTP_DB_QUERIES.observe(template, value=stats.db_queries)
+            HTTP_DB_SECONDS.observe(template, value=stats.db_seconds)
@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from metrics import track_external
+
 
 class N8nNewsClient:
     """Lightweight client to fetch marketing news from n8n webhook."""
@@ -25,9 +27,10 @@ class N8nNewsClient:
             headers = {self.api_key_header: self.api_key}
 
         try:
-            resp = httpx.get(self.url, headers=headers, timeout=self.timeout)
-            resp.raise_for_status()
-            data = resp.json()
+            with track_external("n8n"):
+                resp = httpx.get(self.url, headers=headers, timeout=self.timeout)
+                resp.raise_for_status()
+                data = resp.json()
             if not isinstance(data, list):
                 return []
             return data
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+from metrics import track_external
+from resilience import CircuitBreaker, RetryPolicy, call_with_retries
+
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+@dataclass(frozen=True)
+class ChatCompletion:
+    content: str
+    model: str
+    # None when the response carried no usage block.
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+class OpenAIChatClient:
+    """Minimal Chat Completions client.
+
+    OPENAI_BASE_URL points it at any compatible server (e.g. bench/fake_upstream.py).
+    Calls retry 429/5xx/transport errors with jittered backoff and go through a circuit
+    breaker, so a provider outage fails fast instead of holding workers for the full timeout.
+    """
+
+    def __init__(self, model: Optional[str] = None) -> None:
+        self.base_url = (os.getenv("OPENAI_BASE_URL") or DEFAULT_OPENAI_BASE_URL).rstrip("/")
+        self.model = model or os.getenv("PULSS_OPENAI_MODEL", "gpt-4o-mini")
+        self.timeout = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "30") or 30)
+        self.retry_policy = RetryPolicy.from_env("PULSS_OPENAI")
+        self.breaker = CircuitBreaker.from_env("openai", "PULSS_OPENAI")
+
+    @property
+    def api_key(self) -> Optional[str]:
+        # Read per call so a key added to the environment later is picked up.
+        return os.getenv("OPENAI_API_KEY")
+
+    def chat_completion(self, messages: List[Dict[str, str]], model: Optional[str] = None) -> str:
+        """Return the first choice's content."""
+        return self.create(messages, model=model).content
+
+    def create(self, messages: List[Dict[str, str]], model: Optional[str] = None) -> ChatCompletion:
+        """Return the first choice together with the model and token usage reported by the API.
+
+        Raises CircuitOpenError while the breaker is open, or the last error once retries are exhausted.
+        """
+        payload = {"model": model or self.model, "messages": messages}
+
+        def attempt(remaining: float) -> dict:
+            with track_external("openai"):
+                resp = httpx.post(
+                    f"{self.base_url}/chat/completions",
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json=payload,
+                    timeout=min(self.timeout, remaining),
+                )
+                resp.raise_for_status()
+                return resp.json()
+
+        data = call_with_retries("openai", attempt, self.retry_policy, self.breaker)
+        usage = data.get("usage") or {}
+        return ChatCompletion(
+            content=data["choices"][0]["message"]["content"],
+            model=data.get("model") or payload["model"],
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        )
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from domain import ContactLog, Lead, LeadStatus, Proposal, ProposalStatus
+from infrastructure import Database
+
+logger = logging.getLogger(__name__)
+
+# Funnel order; LOST is a terminal side exit and has no rank.
+STAGES: Tuple[LeadStatus, ...] = (
+    LeadStatus.NEW,
+    LeadStatus.CALLING,
+    LeadStatus.MEETING_SCHEDULED,
+    LeadStatus.MEETING_DONE,
+    LeadStatus.PROPOSAL,
+    LeadStatus.FOLLOWING,
+    LeadStatus.WON,
+)
+RANK = {s.value: i for i, s in enumerate(STAGES)}
+CLOSED = {LeadStatus.WON.value, LeadStatus.LOST.value}
+OPEN_PROPOSALS = {ProposalStatus.DRAFT.value, ProposalStatus.SENT.value, ProposalStatus.FOLLOWING.value}
+
+
+@dataclass
+class PipelineStage:
+    status: str
+    count: int  # leads currently in the stage
+    open_mrr: int  # expected_mrr of those leads
+    reached: int  # leads that were ever in the stage
+    conversion_rate: Optional[float]  # share of `reached` that moved further down the funnel
+    win_probability: Optional[float]  # won / (won + lost) among closed leads that reached the stage, else overall
+    avg_days_in_stage: Optional[float]
+    avg_contacts: Optional[float]  # contact logs per lead while in the stage
+
+
+@dataclass
+class OwnerStats:
+    owner: str
+    open: int
+    won: int
+    lost: int
+    win_rate: Optional[float]
+    open_mrr: int
+    won_mrr: int
+
+
+@dataclass
+class PipelineReport:
+    stages: List[PipelineStage]
+    lead_forecast_mrr: float  # open expected_mrr weighted by each stage's win probability
+    proposal_forecast_mrr: float  # open proposal amounts weighted by the proposal win rate
+    forecast_mrr: float
+    proposals: Dict[str, Dict[str, int]]  # status -> {count, amount}
+    owners: List[OwnerStats]
+    transitions: Dict[str, int]  # "from->to" -> count
+    computed_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class _LeadState:
+    status: str
+    owner: str
+    mrr: int
+    entered_at: datetime
+    reached: Set[str]
+
+
+def _naive(dt: datetime) -> datetime:
+    """Stored timestamps are mostly naive UTC; fold aware ones so they stay comparable."""
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _ratio(num: float, den: float) -> Optional[float]:
+    return round(num / den, 4) if den else None
+
+
+class PipelineAnalytics:
+    """Sales pipeline aggregates maintained from lead status changes.
+
+    State is replayed once from lead_status_events, contact_logs and proposals (merged in
+    time order), then kept current through Database.on_write: each lead change removes the
+    lead's old contribution to the aggregates and adds the new one, so a report is built
+    from counters without touching the leads table.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._leads: Dict[str, _LeadState] = {}
+        self._proposals: Dict[str, Tuple[str, int]] = {}
+        self.funnel: Counter = Counter()
+        self.open_mrr: Counter = Counter()
+        self.reached: Counter = Counter()
+        self.advanced: Counter = Counter()
+        self.won_from: Counter = Counter()
+        self.lost_from: Counter = Counter()
+        self.owners: Dict[str, Counter] = defaultdict(Counter)
+        self.stage_seconds: Counter = Counter()
+        self.stage_exits: Counter = Counter()
+        self.stage_contacts: Counter = Counter()
+        self.transitions: Counter = Counter()
+        self.proposal_stats: Dict[str, Counter] = defaultdict(Counter)
+
+    def attach(self) -> None:
+        self.db.on_write("leads", self._on_leads)
+        self.db.on_write("contact_logs", self._on_contacts)
+        self.db.on_write("proposals", self._on_proposals)
+
+    # -- contributions -------------------------------------------------------
+
+    def _apply(self, state: _LeadState, sign: int) -> None:
+        status, owner, mrr = state.status, state.owner, state.mrr
+        self.funnel[status] += sign
+        owner_stats = self.owners[owner]
+        if status == LeadStatus.WON.value:
+            owner_stats["won"] += sign
+            owner_stats["won_mrr"] += sign * mrr
+        elif status == LeadStatus.LOST.value:
+            owner_stats["lost"] += sign
+        else:
+            self.open_mrr[status] += sign * mrr
+            owner_stats["open"] += sign
+            owner_stats["open_mrr"] += sign * mrr
+        top = max((RANK[s] for s in state.reached if s in RANK), default=-1)
+        for s in state.reached:
+            self.reached[s] += sign
+            if s in RANK and RANK[s] < top:
+                self.advanced[s] += sign
+            if status == LeadStatus.WON.value:
+                self.won_from[s] += sign
+            elif status == LeadStatus.LOST.value:
+                self.lost_from[s] += sign
+
+    def _lead_changed(self, lead_id: str, status: str, owner: str, mrr: int, at: datetime) -> None:
+        old = self._leads.get(lead_id)
+        if old is None:
+            state = _LeadState(status, owner, mrr, at, {status})
+            self._leads[lead_id] = state
+            self._apply(state, +1)
+            return
+        self._apply(old, -1)
+        if status != old.status:
+            self.transitions[f"{old.status}->{status}"] += 1
+            self.stage_seconds[old.status] += max(0.0, (at - old.entered_at).total_seconds())
+            self.stage_exits[old.status] += 1
+            old.status = status
+            old.entered_at = at
+            old.reached.add(status)
+        old.owner, old.mrr = owner, mrr
+        self._apply(old, +1)
+
+    def _contact(self, lead_id: str) -> None:
+        state = self._leads.get(lead_id)
+        if state:
+            self.stage_contacts[state.status] += 1
+
+    def _proposal_changed(self, proposal_id: str, status: str, amount: int) -> None:
+        old = self._proposals.get(proposal_id)
+        if old:
+            self.proposal_stats[old[0]]["count"] -= 1
+            self.proposal_stats[old[0]]["amount"] -= old[1]
+        self._proposals[proposal_id] = (status, amount)
+        self.proposal_stats[status]["count"] += 1
+        self.proposal_stats[status]["amount"] += amount
+
+    # -- loading / listeners -------------------------------------------------
+
+    def load(self) -> None:
+        with self._lock:
+            self._reset()
+            conn = self.db.conn
+            leads = {r["id"]: r for r in conn.execute("SELECT id, owner, expected_mrr FROM leads")}
+            events = (
+                (_naive(datetime.fromisoformat(r["changed_at"])), 0, r)
+                for r in conn.execute(
+                    "SELECT lead_id, to_status, changed_at FROM lead_status_events ORDER BY changed_at, id"
+                ).fetchall()
+            )
+            contacts = (
+                (_naive(datetime.fromisoformat(r["contact_at"])), 1, r)
+                for r in conn.execute("SELECT lead_id, contact_at FROM contact_logs ORDER BY contact_at").fetchall()
+            )
+            # Owner/MRR are not part of the event history; the current values are used throughout.
+            for at, kind, r in heapq.merge(events, contacts, key=lambda x: (x[0], x[1])):
+                if kind == 1:
+                    self._contact(r["lead_id"])
+                    continue
+                lead = leads.get(r["lead_id"])
+                if lead is not None:
+                    self._lead_changed(r["lead_id"], r["to_status"], lead["owner"] or "", lead["expected_mrr"] or 0, at)
+            for r in conn.execute("SELECT id, status, amount FROM proposals"):
+                self._proposal_changed(r["id"], r["status"], r["amount"] or 0)
+            self._loaded = True
+            logger.info("[pulss] pipeline analytics loaded: %d leads, %d proposals", len(self._leads), len(self._proposals))
+
+    def _on_leads(self, leads: List[Lead]) -> None:
+        with self._lock:
+            if not self._loaded:
+                return  # the first load reads the committed change
+            for lead in leads:
+                self._lead_changed(lead.id, lead.status.value, lead.owner or "", lead.expected_mrr or 0, _naive(lead.updated_at))
+
+    def _on_contacts(self, logs: List[ContactLog]) -> None:
+        with self._lock:
+            if self._loaded:
+                for log in logs:
+                    self._contact(log.lead_id)
+
+    def _on_proposals(self, proposals: List[Proposal]) -> None:
+        with self._lock:
+            if self._loaded:
+                for p in proposals:
+                    self._proposal_changed(p.id, p.status.value, p.amount or 0)
+
+    # -- report ---------------------------------------------------------------
+
+    def report(self) -> PipelineReport:
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            stages: List[PipelineStage] = []
+            lead_forecast = 0.0
+            won, lost = self.funnel[LeadStatus.WON.value], self.funnel[LeadStatus.LOST.value]
+            overall_win = _ratio(won, won + lost)
+            for status in [s.value for s in STAGES] + [LeadStatus.LOST.value]:
+                win_p = _ratio(self.won_from[status], self.won_from[status] + self.lost_from[status])
+                if status not in CLOSED:
+                    # No closed lead has passed through this stage yet: use the overall win rate.
+                    win_p = win_p if win_p is not None else overall_win
+                    lead_forecast += self.open_mrr[status] * (win_p or 0.0)
+                stages.append(
+                    PipelineStage(
+                        status=status,
+                        count=self.funnel[status],
+                        open_mrr=self.open_mrr[status],
+                        reached=self.reached[status],
+                        conversion_rate=None if status in CLOSED else _ratio(self.advanced[status], self.reached[status]),
+                        win_probability=win_p,
+                        avg_days_in_stage=_ratio(self.stage_seconds[status] / 86400, self.stage_exits[status]),
+                        avg_contacts=_ratio(self.stage_contacts[status], self.reached[status]),
+                    )
+                )
+            won = self.proposal_stats[ProposalStatus.WON.value]["count"]
+            lost = self.proposal_stats[ProposalStatus.LOST.value]["count"]
+            proposal_win = _ratio(won, won + lost) or 0.0
+            open_amount = sum(self.proposal_stats[s]["amount"] for s in OPEN_PROPOSALS)
+            proposal_forecast = open_amount * proposal_win
+            owners = [
+                OwnerStats(
+                    owner=name,
+                    open=c["open"],
+                    won=c["won"],
+                    lost=c["lost"],
+                    win_rate=_ratio(c["won"], c["won"] + c["lost"]),
+                    open_mrr=c["open_mrr"],
+                    won_mrr=c["won_mrr"],
+                )
+                for name, c in self.owners.items()
+                if c["open"] or c["won"] or c["lost"]
+            ]
+            owners.sort(key=lambda o: (-o.won_mrr, -o.won, -o.open_mrr, o.owner))
+            return PipelineReport(
+                stages=stages,
+                lead_forecast_mrr=round(lead_forecast, 2),
+                proposal_forecast_mrr=round(proposal_forecast, 2),
+                forecast_mrr=round(lead_forecast + proposal_forecast, 2),
+                proposals={s: dict(c) for s, c in self.proposal_stats.items() if c["count"]},
+                owners=owners,
+                transitions=dict(self.transitions),
+            )
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQS = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+# Occurrences a COUNT rule may have; keeps expanding a series from its start cheap.
+MAX_COUNT = 1000
+
+_BYDAY = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """The RFC 5545 RRULE subset used by schedules.
+
+    FREQ=DAILY|WEEKLY|MONTHLY|YEARLY with INTERVAL, and COUNT or UNTIL. WEEKLY takes
+    BYDAY=MO,WE; MONTHLY takes BYMONTHDAY=1,-1 and/or BYDAY with an ordinal (2TU, -1FR).
+    Occurrences keep the wall-clock time (and UTC offset) of the event's start.
+    """
+
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    by_day: Tuple[Tuple[int, int], ...] = ()  # (ordinal, weekday); ordinal 0 = every such weekday
+    by_month_day: Tuple[int, ...] = ()
+
+    @classmethod
+    def parse(cls, text: str) -> "RecurrenceRule":
+        """Parse 'FREQ=WEEKLY;BYDAY=MO' (an 'RRULE:' prefix is allowed); ValueError if unsupported."""
+        body = text.strip()
+        if body.upper().startswith("RRULE:"):
+            body = body[6:]
+        parts = {}
+        for part in filter(None, body.split(";")):
+            key, sep, value = part.partition("=")
+            if not sep or not value:
+                raise ValueError(f"Invalid RRULE part: {part!r}")
+            parts[key.strip().upper()] = value.strip().upper()
+        freq = parts.pop("FREQ", None)
+        if freq not in FREQS:
+            raise ValueError(f"FREQ must be one of {', '.join(FREQS)}")
+        try:
+            interval = int(parts.pop("INTERVAL", "1"))
+            count = int(parts.pop("COUNT")) if "COUNT" in parts else None
+            by_month_day = tuple(int(d) for d in parts.pop("BYMONTHDAY").split(",")) if "BYMONTHDAY" in parts else ()
+        except ValueError:
+            raise ValueError("INTERVAL, COUNT and BYMONTHDAY must be integers") from None
+        until = _parse_until(parts.pop("UNTIL")) if "UNTIL" in parts else None
+        by_day = tuple(_parse_byday(d) for d in parts.pop("BYDAY").split(",")) if "BYDAY" in parts else ()
+        if parts:
+            raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(parts))}")
+        if interval < 1:
+            raise ValueError("INTERVAL must be >= 1")
+        if count is not None and not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+        if count is not None and until is not None:
+            raise ValueError("COUNT and UNTIL cannot be combined")
+        if by_day and freq not in ("WEEKLY", "MONTHLY"):
+            raise ValueError("BYDAY is supported for WEEKLY and MONTHLY only")
+        if freq == "WEEKLY" and any(n for n, _ in by_day):
+            raise ValueError("BYDAY ordinals (e.g. 2TU) are supported for MONTHLY only")
+        if by_month_day and (freq != "MONTHLY" or any(not 1 <= abs(d) <= 31 for d in by_month_day)):
+            raise ValueError("BYMONTHDAY must be MONTHLY and within 1..31 or -31..-1")
+        return cls(freq, interval, count, until, by_day, by_month_day)
+
+    def __str__(self) -> str:
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            until = self.until.astimezone(timezone.utc) if self.until.tzinfo else self.until
+            parts.append(f"UNTIL={until:%Y%m%dT%H%M%S}{'Z' if self.until.tzinfo else ''}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(f"{n or ''}{WEEKDAYS[wd]}" for n, wd in self.by_day))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(str(d) for d in self.by_month_day))
+        return ";".join(parts)
+
+
+def _parse_until(value: str) -> datetime:
+    for fmt in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y%m%d":
+            parsed = parsed.replace(hour=23, minute=59, second=59)  # a date UNTIL includes that day
+        return parsed.replace(tzinfo=timezone.utc) if value.endswith("Z") else parsed
+    raise ValueError(f"Invalid UNTIL: {value}")
+
+
+def _parse_byday(value: str) -> Tuple[int, int]:
+    match = _BYDAY.match(value.strip())
+    if not match or (match.group(1) and not 1 <= abs(int(match.group(1))) <= 5):
+        raise ValueError(f"Invalid BYDAY: {value}")
+    return int(match.group(1) or 0), WEEKDAYS.index(match.group(2))
+
+
+def _align(dt: datetime, like: datetime) -> datetime:
+    """Make `dt` comparable with `like` (naive values are UTC)."""
+    if like.tzinfo and not dt.tzinfo:
+        return dt.replace(tzinfo=timezone.utc)
+    if dt.tzinfo and not like.tzinfo:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _months(year: int, month: int, add: int) -> Tuple[int, int]:
+    y, m = divmod(month - 1 + add, 12)
+    return year + y, m + 1
+
+
+def _first_period(rule: RecurrenceRule, dtstart: datetime, after: datetime) -> int:
+    """Index of the period containing `after`; every earlier period ends before it."""
+    if after <= dtstart:
+        return 0
+    start, target = dtstart.date(), after.astimezone(dtstart.tzinfo).date() if dtstart.tzinfo else after.date()
+    if rule.freq == "DAILY":
+        steps = (target - start).days
+    elif rule.freq == "WEEKLY":
+        steps = ((target - timedelta(days=target.weekday())) - (start - timedelta(days=start.weekday()))).days // 7
+    elif rule.freq == "MONTHLY":
+        steps = (target.year - start.year) * 12 + target.month - start.month
+    else:
+        steps = target.year - start.year
+    return max(0, steps // rule.interval)
+
+
+def _period(rule: RecurrenceRule, dtstart: datetime, k: int) -> Tuple[date, List[date]]:
+    """First day of period k and the candidate days in it, sorted."""
+    step = k * rule.interval
+    start = dtstart.date()
+    if rule.freq == "DAILY":
+        day = start + timedelta(days=step)
+        return day, [day]
+    if rule.freq == "WEEKLY":
+        week = start - timedelta(days=start.weekday()) + timedelta(weeks=step)
+        weekdays = sorted({wd for _, wd in rule.by_day}) or [start.weekday()]
+        return week, [week + timedelta(days=wd) for wd in weekdays]
+    if rule.freq == "MONTHLY":
+        year, month = _months(start.year, start.month, step)
+        ndays = calendar.monthrange(year, month)[1]
+        month_days = {d if d > 0 else ndays + d + 1 for d in rule.by_month_day}
+        weekdays = set()
+        for n, wd in rule.by_day:
+            first = 1 + (wd - calendar.weekday(year, month, 1)) % 7
+            matches = list(range(first, ndays + 1, 7))
+            if n == 0:
+                weekdays.update(matches)
+            elif abs(n) <= len(matches):
+                weekdays.add(matches[n - 1] if n > 0 else matches[n])
+        if rule.by_month_day and rule.by_day:
+            days = month_days & weekdays  # both given: days matching both, as in RFC 5545
+        elif rule.by_month_day or rule.by_day:
+            days = month_days | weekdays
+        else:
+            days = {start.day}  # the 31st is skipped in shorter months, as in RFC 5545
+        days = {d for d in days if 1 <= d <= ndays}
+        return date(year, month, 1), [date(year, month, d) for d in sorted(days)]
+    year = start.year + step
+    if start.month == 2 and start.day == 29 and not calendar.isleap(year):
+        return date(year, 1, 1), []
+    return date(year, 1, 1), [date(year, start.month, start.day)]
+
+
+def occurrences(rule: RecurrenceRule, dtstart: datetime, after: datetime, before: datetime) -> Iterator[datetime]:
+    """Occurrence starts s with after <= s < before, generated lazily.
+
+    Without COUNT the expansion jumps straight to the period containing `after`, so a window
+    years after the series start costs the same as the first one.
+    """
+    after, before = _align(after, dtstart), _align(before, dtstart)
+    until = _align(rule.until, dtstart) if rule.until else None
+    clock = dtstart.timetz()
+    emitted = 0
+    k = 0 if rule.count else _first_period(rule, dtstart, after)
+    while True:
+        first_day, days = _period(rule, dtstart, k)
+        if datetime.combine(first_day, time(), tzinfo=dtstart.tzinfo) >= before:
+            return
+        for day in days:
+            dt = datetime.combine(day, clock)
+            if dt < dtstart:
+                continue
+            if (until and dt > until) or dt >= before:
+                return
+            emitted += 1
+            if dt >= after:
+                yield dt
+            if rule.count and emitted >= rule.count:
+                return
+        k += 1
+
+
+def last_start(rule: RecurrenceRule, dtstart: datetime) -> Optional[datetime]:
+    """Start of the final occurrence, or None for an open-ended series."""
+    if rule.until:
+        return max(dtstart, _align(rule.until, dtstart))
+    if rule.count:
+        last = None
+        for last in occurrences(rule, dtstart, dtstart, dtstart + timedelta(days=MAX_COUNT * 366)):
+            pass
+        return last or dtstart
+    return None
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Optional, TypeVar
+
+import httpx
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BREAKER_STATE = REGISTRY.gauge(
+    "pulss_circuit_breaker_state", "Circuit breaker state (0=closed, 1=open, 2=half_open).", ("name",)
+)
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "pulss_circuit_breaker_transitions_total", "Circuit breaker state changes.", ("name", "state")
+)
+RETRIES = REGISTRY.counter("pulss_external_retries_total", "Retried outbound calls by reason.", ("service", "reason"))
+SHORT_CIRCUITED = REGISTRY.counter(
+    "pulss_circuit_breaker_rejections_total", "Calls rejected while the breaker was open.", ("name",)
+)
+
+_STATE_VALUES = {"closed": 0, "open": 1, "half_open": 2}
+# Least time left before the deadline for another attempt to be worth starting.
+MIN_ATTEMPT_SECONDS = 1.0
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)) or default)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    # Upper bound on total time spent in one call including retries and waits.
+    deadline: float = 60.0
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "RetryPolicy":
+        return cls(
+            max_attempts=max(1, int(_env_float(f"{prefix}_MAX_ATTEMPTS", cls.max_attempts))),
+            base_delay=_env_float(f"{prefix}_BACKOFF_BASE_SECONDS", cls.base_delay),
+            max_delay=_env_float(f"{prefix}_BACKOFF_MAX_SECONDS", cls.max_delay),
+            deadline=_env_float(f"{prefix}_DEADLINE_SECONDS", cls.deadline),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open after `failure_threshold` failures,
+    half_open after `recovery_timeout`, where a limited number of probe calls decide
+    between closing again and re-opening."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        BREAKER_STATE.set(name, value=0)
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            failure_threshold=max(1, int(_env_float(f"{prefix}_BREAKER_FAILURES", 5))),
+            recovery_timeout=_env_float(f"{prefix}_BREAKER_RESET_SECONDS", 30.0),
+        )
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.warning("[pulss] circuit breaker %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        BREAKER_STATE.set(self.name, value=_STATE_VALUES[state])
+        BREAKER_TRANSITIONS.inc(self.name, state)
+
+    def _maybe_half_open(self) -> None:
+        if self._state == "open" and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._probes = 0
+            self._transition("half_open")
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == "closed":
+                return
+            if self._state == "half_open" and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+        SHORT_CIRCUITED.inc(self.name)
+        raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._transition("open")
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """429 / 5xx responses and transport errors (timeouts, connection failures)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    value = exc.response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _reason(exc: BaseException) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return str(exc.response.status_code)
+    return type(exc).__name__
+
+
+def call_with_retries(
+    service: str,
+    fn: Callable[[float], T],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Run fn with bounded, jittered retries on retryable errors, honouring Retry-After.
+
+    fn receives the seconds left until `policy.deadline` and must not run longer (e.g. use it
+    to cap its request timeout), so the whole call, retries included, ends by the deadline.
+    Every attempt passes through the breaker; non-retryable HTTP errors (e.g. 400) are
+    re-raised immediately and do not count against upstream health.
+    """
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker is not None:
+            breaker.allow()
+        try:
+            result = fn(policy.deadline - (time.monotonic() - start))
+        except Exception as exc:  # noqa: BLE001
+            if not is_retryable(exc):
+                if breaker is not None:
+                    # A 4xx answer means the upstream itself is healthy.
+                    if isinstance(exc, httpx.HTTPStatusError):
+                        breaker.record_success()
+                    else:
+                        breaker.record_failure()
+                raise
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt >= policy.max_attempts:
+                raise
+            delay = policy.backoff(attempt)
+            hinted = retry_after_seconds(exc)
+            if hinted is not None:
+                delay = max(delay, hinted)
+            # A retry with only a sliver of the deadline left would just time out (and count
+            # against the breaker), so give up instead.
+            if time.monotonic() - start + delay + MIN_ATTEMPT_SECONDS > policy.deadline:
+                raise
+            RETRIES.inc(service, _reason(exc))
+            logger.info("[pulss] %s attempt %d failed (%s); retrying in %.2fs", service, attempt, _reason(exc), delay)
+            sleep(delay)
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
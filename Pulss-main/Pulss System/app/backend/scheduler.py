@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def start_daily(job: Callable[[], object], hour_utc: int, name: str) -> threading.Thread:
+    """Run `job` once a day at `hour_utc` on a daemon thread (errors are logged, not raised)."""
+
+    def loop() -> None:
+        while True:
+            now = datetime.utcnow()
+            next_run = now.replace(hour=hour_utc, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            time.sleep((next_run - now).total_seconds())
+            try:
+                job()
+            except Exception:
+                logger.exception("[pulss] daily job failed; name=%s", name)
+
+    thread = threading.Thread(target=loop, name=name, daemon=True)
+    thread.start()
+    return thread
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import contextvars
+import hashlib
 import os
+import re
 import uuid
 import secrets
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from itertools import islice
+from datetime import datetime, time as dt_time, timedelta, timezone
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from domain import (
     AiDraft,
@@ -21,13 +30,19 @@ from domain import (
     Contract,
     HearingRecord,
     Lead,
+    LlmUsage,
+    LlmUsageSummary,
     LeadStatus,
     MeetingNote,
+    KpiRow,
+    MetricSeries,
+    MetricSeriesSet,
     MetricSnapshot,
     Notification,
     Proposal,
     ProposalStatus,
     ScheduleEvent,
+    ScheduleException,
     PulssChatMessage,
     PulssChatSession,
     PulssLink,
@@ -48,11 +63,14 @@ from infrastructure import (
     ContentPostRepository,
     ContractRepository,
     LeadRepository,
+    LlmUsageRepository,
     MetricSnapshotRepository,
     NotificationRepository,
     ProposalRepository,
     ScheduleRepository,
     SnsNewsRepository,
+    schedule_key,
+    TableState,
     PulssChatMessageRepository,
     PulssChatSessionRepository,
     PulssLinkRepository,
@@ -61,13 +79,50 @@ from infrastructure import (
     TaskRepository,
     TaskTemplateRepository,
 )
+from admission import AdmissionController, AdmissionRejected, estimate_tokens
+from client_similarity import ClientSimilarityIndex, SimilarClient
+from dedup import DEFAULT_THRESHOLD, DuplicateGroup, DuplicateIndex, DuplicateMatch
+from embeddings import EmbeddingIndex, KnowledgeHit
+from kpi import QUANTILES, grouped_stats
+from lead_scoring import RESCORE_CHANGED, RESCORE_SECONDS, LeadRescoreResult, compute_scores, engagement_since
+from pipeline import PipelineAnalytics, PipelineReport
+from timeseries import align, compute_rollups, month_index, nan_to_none, period_label, period_range
+from intervals import IntervalTree
+from recurrence import RecurrenceRule, occurrences
+from hearing_slots import SLOT_LABELS, HearingSlots, extract_slots
+from llm_budget import BUDGET_ACTIONS, TOKENS, LlmBudget, compact_history, estimate_messages
+from metrics import REGISTRY, track_external
 from pulss_prompt import PULSS_SYSTEM_PROMPT
 from n8n_client import N8nNewsClient
-from utils import generate_id, generate_token
+from openai_client import ChatCompletion, OpenAIChatClient
+from resilience import CircuitOpenError
+from utils import content_hash, generate_id, generate_token
 import httpx
 
 logger = logging.getLogger(__name__)
 
+GENERATION_CACHE = REGISTRY.counter(
+    "pulss_ai_generation_cache_total", "AI suggestion/draft generation memo lookups.", ("kind", "result")
+)
+
+# Retrieval for chat turns and suggestions: hits per call, scan budget, and the similarity
+# below which a hit is considered unrelated (hashed n-grams always overlap a little).
+RAG_TOP_K = int(os.getenv("PULSS_RAG_TOP_K", "3") or 0)
+RAG_BUDGET_MS = float(os.getenv("PULSS_RAG_BUDGET_MS", "50") or 0)
+RAG_MIN_SCORE = float(os.getenv("PULSS_RAG_MIN_SCORE", "0.15") or 0)
+
+
+def _nan_none(*values: float) -> tuple:
+    return tuple(None if v != v else float(v) for v in values)
+
+
+# The platform note _pulse_from_slots appends to current_sns; replaced, not repeated, on the next pulse.
+_PLATFORM_NOTE = re.compile(r"（主要: [^）]*）$")
+
+
+def _format_hits(hits: List[KnowledgeHit]) -> str:
+    return "\n".join(f"- [{h.title}] {h.snippet[:120]}" for h in hits)
+
 
 class PulssLinkNotFound(Exception):
     """Raised when pulss link token is invalid or expired."""
@@ -81,6 +136,66 @@ class PulssPersistenceError(Exception):
     """Raised when DB write/read fails for pulss chat."""
 
 
+class PulssLlmOverloaded(Exception):
+    """Raised when the LLM admission queue sheds a call; retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: int = 5) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PulssIdempotencyConflict(Exception):
+    """Raised when an Idempotency-Key is reused for a different message in the same session."""
+
+
+class ScheduleConflictError(Exception):
+    """Raised when an event overlaps other events of the same team; see `conflicts`."""
+
+    def __init__(self, message: str, conflicts: List[ScheduleEvent]) -> None:
+        super().__init__(message)
+        self.conflicts = conflicts
+
+
+class DuplicateRecordError(Exception):
+    """Raised when a new lead/client name matches existing records; see `matches`."""
+
+    def __init__(self, message: str, matches: List[DuplicateMatch]) -> None:
+        super().__init__(message)
+        self.matches = matches
+
+
+def _check_duplicates(index: Optional[DuplicateIndex], name: str, kinds: tuple, reject: bool) -> List[DuplicateMatch]:
+    """Existing records that look like `name`; raises instead when `reject` is set."""
+    matches = index.find(name, kinds=kinds) if index else []
+    if matches and reject:
+        raise DuplicateRecordError(f"{len(matches)} existing record(s) look like '{name}'", matches)
+    return matches
+
+
+class _KeyedLock:
+    """One lock per key, dropped again once nobody holds or waits for it."""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self._locks: Dict[str, tuple[threading.Lock, int]] = {}
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        with self._guard:
+            lock, users = self._locks.get(key, (threading.Lock(), 0))
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                lock, users = self._locks[key]
+                if users <= 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+
 class ClientService:
     def __init__(
         self,
@@ -89,12 +204,21 @@ class ClientService:
         pulse_link_repo: PulseLinkRepository,
         template_repo: TaskTemplateRepository,
         task_repo: TaskRepository,
+        similarity: Optional[ClientSimilarityIndex] = None,
+        duplicates: Optional[DuplicateIndex] = None,
     ) -> None:
         self.client_repo = client_repo
         self.pulse_repo = pulse_repo
         self.pulse_link_repo = pulse_link_repo
         self.template_repo = template_repo
         self.task_repo = task_repo
+        self.similarity = similarity
+        self.duplicates = duplicates
+        self._create_lock = threading.Lock()
+
+    def list_state(self) -> TableState:
+        # list_clients also folds in the latest pulse response and task-derived progress/alerts.
+        return self.client_repo.db.table_state("clients", "pulse_responses", "tasks")
 
     def list_clients(self) -> List[Client]:
         items = self.client_repo.list()
@@ -108,7 +232,19 @@ class ClientService:
             client.latest_pulse_response = self.pulse_repo.latest_by_client(client_id)
         return client
 
-    def create_client(self, payload: dict) -> Client:
+    def similar_clients(self, client_id: str, k: int = 10, same_industry: bool = False) -> Optional[List[SimilarClient]]:
+        """Past clients closest in industry, stage, pulse profile (target/USP) and metrics."""
+        if self.similarity is None:
+            return [] if self.client_repo.get(client_id) else None
+        return self.similarity.similar(client_id, k=k, same_industry=same_industry)
+
+    def create_client(self, payload: dict, reject_duplicates: bool = False) -> Tuple[Client, List[DuplicateMatch]]:
+        """Insert a client; returns it with the existing clients whose names look alike."""
+        with self._create_lock:
+            matches = _check_duplicates(self.duplicates, payload["name"], ("client",), reject_duplicates)
+            return self._create_client(payload), matches
+
+    def _create_client(self, payload: dict) -> Client:
         now = datetime.utcnow()
         client = Client(
             id=generate_id(),
@@ -194,6 +330,8 @@ class PulssChatService:
         draft_repo: AiDraftRepository,
         client_repo: ClientRepository,
         pulse_repo: PulseResponseRepository,
+        usage_repo: LlmUsageRepository,
+        knowledge: Optional[EmbeddingIndex] = None,
     ) -> None:
         self.pulss_link_repo = pulss_link_repo
         self.session_repo = session_repo
@@ -201,11 +339,18 @@ class PulssChatService:
         self.draft_repo = draft_repo
         self.client_repo = client_repo
         self.pulse_repo = pulse_repo
+        self.usage_repo = usage_repo
+        self.knowledge = knowledge
         self.front_base_url = os.getenv("PULSS_FRONT_BASE_URL", "http://localhost:5173")
         self.webhook_url = os.getenv(
             "PULSS_N8N_TOUCHPOINT_WEBHOOK_URL", "http://localhost:5678/webhook/ai-touchpoint-draft"
         )
-        self.openai_model = os.getenv("PULSS_OPENAI_MODEL", "gpt-4o-mini")
+        self.openai_client = OpenAIChatClient()
+        self.admission = AdmissionController.from_env()
+        self.expected_completion_tokens = int(os.getenv("PULSS_LLM_EXPECTED_COMPLETION_TOKENS", "400") or 400)
+        self.budget = LlmBudget.from_env()
+        # Turns of one session run one at a time: history read -> LLM -> append.
+        self._turn_locks = _KeyedLock()
 
     def issue_link(self, client_id: str, expires_at: Optional[datetime] = None) -> PulssLink:
         existing = self.pulss_link_repo.get_active_by_client(client_id)
@@ -250,21 +395,16 @@ class PulssChatService:
         return link
 
     def _start_session(self, link: PulssLink) -> Optional[tuple[PulssChatSession, str, Client]]:
-        try:
-            session = PulssChatSession(
-                id=str(uuid.uuid4()),
-                client_id=link.client_id,
-                status="active",
-                created_at=datetime.utcnow(),
-                finalized_at=None,
-                final_report=None,
-            )
-            self.session_repo.add(session)
-        except Exception as e:  # noqa: BLE001
-            logger.exception("[pulss] failed to create session for token=%s", link.token)
-            raise PulssPersistenceError(str(e)) from e
-        logger.info("[pulss] session created: session_id=%s client_id=%s", session.id, session.client_id)
-
+        session = PulssChatSession(
+            id=str(uuid.uuid4()),
+            client_id=link.client_id,
+            status="active",
+            created_at=datetime.utcnow(),
+            finalized_at=None,
+            final_report=None,
+        )
+        # The opening message is generated before the session row is written, so a start shed
+        # by admission control (or a failed call) leaves no empty session behind.
         try:
             assistant_reply = self._call_openai(
                 [
@@ -273,10 +413,15 @@ class PulssChatService:
                         "role": "user",
                         "content": "上記ルールに従い、STEP0 の導入メッセージだけを日本語で1通出力してください。",
                     },
-                ]
+                ],
+                session_id=session.id,
+                client_id=session.client_id,
+                purpose="start",
             )
+        except PulssLlmOverloaded:
+            raise
         except Exception as e:  # noqa: BLE001
-            logger.exception("[pulss] openai call failed for token=%s session_id=%s", token, session.id)
+            logger.exception("[pulss] openai call failed for token=%s session_id=%s", link.token, session.id)
             raise PulssOpenAIError(str(e)) from e
 
         current_api_key = os.getenv("OPENAI_API_KEY")
@@ -286,6 +431,13 @@ class PulssChatService:
 
         assistant_reply = assistant_reply or "パルスヒアリングを開始します。まずは、現状のSNS運用状況や課題を教えてください。"
 
+        try:
+            self.session_repo.add(session)
+        except Exception as e:  # noqa: BLE001
+            logger.exception("[pulss] failed to create session for token=%s", link.token)
+            raise PulssPersistenceError(str(e)) from e
+        logger.info("[pulss] session created: session_id=%s client_id=%s", session.id, session.client_id)
+
         try:
             self.message_repo.add(
                 PulssChatMessage(
@@ -303,41 +455,98 @@ class PulssChatService:
         client = self.client_repo.get(session.client_id)
         return session, assistant_reply, client
 
-    def post_message(self, session_id: str, user_message: str) -> Optional[tuple[str, bool]]:
+    def post_message(
+        self, session_id: str, user_message: str, idempotency_key: Optional[str] = None
+    ) -> Optional[tuple[str, bool]]:
+        """Run one chat turn. Turns of the same session are serialized; a repeated
+        idempotency_key returns the stored reply without calling the LLM again."""
         session = self.session_repo.get(session_id)
         if not session:
             print(f"[pulss] session not found: {session_id}")
             return None
-        now = datetime.utcnow()
-        self.message_repo.add(
-            PulssChatMessage(
+        request_hash = hashlib.sha256(user_message.encode("utf-8")).hexdigest()
+        with self._turn_locks.hold(session_id):
+            if idempotency_key:
+                stored = self.message_repo.get_idempotent_reply(session_id, idempotency_key)
+                if stored:
+                    stored_hash, stored_reply, stored_done = stored
+                    if stored_hash != request_hash:
+                        raise PulssIdempotencyConflict("Idempotency-Key was already used for a different message")
+                    logger.info("[pulss] idempotent replay: session_id=%s key=%s", session_id, idempotency_key)
+                    return stored_reply, stored_done
+
+            user = PulssChatMessage(
                 id=generate_id(),
                 session_id=session_id,
                 role="user",
                 content=user_message,
-                created_at=now,
-            )
-        )
-        history = self.message_repo.list_for_session(session_id)
-        messages: List[Dict[str, str]] = [{"role": "system", "content": PULSS_SYSTEM_PROMPT}]
-        for m in history:
-            messages.append({"role": m.role, "content": m.content})
-
-        assistant_reply = self._call_openai(messages) or "回答を生成できませんでした。時間をおいて再試行してください。"
-        self.message_repo.add(
-            PulssChatMessage(
-                id=generate_id(),
-                session_id=session_id,
-                role="assistant",
-                content=assistant_reply,
                 created_at=datetime.utcnow(),
             )
+            history = self.message_repo.list_for_session(session_id)
+            messages: List[Dict[str, str]] = [{"role": "system", "content": PULSS_SYSTEM_PROMPT}]
+            reference = self._reference_note(session, user_message)
+            if reference:
+                messages.append({"role": "system", "content": reference})
+            for m in history:
+                messages.append({"role": m.role, "content": m.content})
+            messages.append({"role": "user", "content": user_message})
+
+            # The user message is stored together with the reply, so a shed (503) turn leaves
+            # nothing behind and can simply be retried.
+            assistant_reply = self._call_openai(
+                messages, session_id=session_id, client_id=session.client_id
+            ) or "回答を生成できませんでした。時間をおいて再試行してください。"
+            done = user_message.strip() == "送信"
+            self.message_repo.add_turn(
+                user,
+                PulssChatMessage(
+                    id=generate_id(),
+                    session_id=session_id,
+                    role="assistant",
+                    content=assistant_reply,
+                    created_at=datetime.utcnow(),
+                ),
+                done,
+                idempotency_key=idempotency_key,
+                request_hash=request_hash,
+            )
+            self._update_slots(session, history, user_message)
+            if done:
+                self.finalize_session(session_id, assistant_reply)
+        return assistant_reply, done
+
+    def _reference_note(self, session: PulssChatSession, user_message: str) -> Optional[str]:
+        """Related snippets (this client's past hearings/briefs and SNS news) for the prompt.
+
+        Bounded by RAG_BUDGET_MS so retrieval never adds noticeable latency to a turn.
+        """
+        if self.knowledge is None or RAG_TOP_K <= 0:
+            return None
+        slots = HearingSlots.from_dict(session.slots)
+        query = "\n".join(filter(None, [slots.company, slots.goals, slots.target, user_message]))
+        hits = self.knowledge.search(
+            query,
+            k=RAG_TOP_K,
+            client_id=session.client_id,
+            budget_ms=RAG_BUDGET_MS,
+            exclude=[("pulss_chat_sessions", session.id)],
+            min_score=RAG_MIN_SCORE,
         )
+        if not hits:
+            return None
+        return "参考情報（自動抽出。関連する場合のみ質問や提案に活用してください）:\n" + _format_hits(hits)
 
-        done = user_message.strip() == "送信"
-        if done:
-            self.finalize_session(session_id, assistant_reply)
-        return assistant_reply, done
+    def _update_slots(self, session: PulssChatSession, history: List[PulssChatMessage], user_message: str) -> None:
+        """Fold this turn's answer into the session's slot state (rule based, no LLM call)."""
+        last_assistant = next((m.content for m in reversed(history) if m.role == "assistant"), None)
+        slots = extract_slots(HearingSlots.from_dict(session.slots), user_message, last_assistant)
+        if slots.to_dict() != HearingSlots.from_dict(session.slots).to_dict():
+            session.slots = slots.to_dict()
+            self.session_repo.update_slots(session.id, session.slots)
+
+    def get_slots(self, session_id: str) -> Optional[HearingSlots]:
+        session = self.session_repo.get(session_id)
+        return HearingSlots.from_dict(session.slots) if session else None
 
     def finalize_session(self, session_id: str, final_report: str) -> None:
         session = self.session_repo.get(session_id)
@@ -349,29 +558,80 @@ class PulssChatService:
         session.final_report = final_report
         self.session_repo.update(session_id, status=session.status, finalized_at=session.finalized_at, final_report=final_report)
 
+        slots = HearingSlots.from_dict(session.slots)
+        previous = self.pulse_repo.latest_by_client(session.client_id)
+        pulse = self._pulse_from_slots(session, slots, final_report, previous)
+        if pulse:
+            self.pulse_repo.add(pulse)
+        else:
+            pulse = previous  # nothing extracted: report the client's latest pulse, as before
+
         if not self.webhook_url:
             return
         client = self.client_repo.get(session.client_id)
-        latest_pulse = self.pulse_repo.latest_by_client(session.client_id)
         payload = {
             "client_id": session.client_id,
             "client_name": client.name if client else None,
             "industry": client.industry if client else None,
             "pulse_report": {
-                "needs": latest_pulse.problem if latest_pulse else None,
-                "current_sns": latest_pulse.current_sns if latest_pulse else None,
-                "target_goal": latest_pulse.target if latest_pulse else None,
-                "product_summary": latest_pulse.product_summary if latest_pulse else None,
-                "usp": latest_pulse.strengths_usp if latest_pulse else None,
-                "brand_story": latest_pulse.brand_story if latest_pulse else None,
+                "needs": pulse.problem if pulse else None,
+                "current_sns": pulse.current_sns if pulse else None,
+                "target_goal": pulse.target if pulse else None,
+                "product_summary": pulse.product_summary if pulse else None,
+                "usp": pulse.strengths_usp if pulse else None,
+                "brand_story": pulse.brand_story if pulse else None,
+                "platforms": slots.platforms,
+                "reference_accounts": slots.references or (pulse.reference_accounts if pulse else None) or [],
+                "missing_slots": [SLOT_LABELS[k] for k in slots.missing()],
             },
         }
         try:
-            httpx.post(self.webhook_url, json=payload, timeout=10.0)
+            with track_external("n8n"):
+                httpx.post(self.webhook_url, json=payload, timeout=10.0).raise_for_status()
         except Exception as e:  # noqa: BLE001
             print(f"[pulss] webhook post failed: {e}")
 
+    def _pulse_from_slots(
+        self,
+        session: PulssChatSession,
+        slots: HearingSlots,
+        final_report: str,
+        previous: Optional[PulseResponse] = None,
+    ) -> Optional[PulseResponse]:
+        """A PulseResponse from the hearing slots; fields the chat did not cover keep the
+        values of the client's previous pulse, so finalizing never loses what was known."""
+        if slots.is_empty():
+            return None
+
+        def keep(value: Any, name: str) -> Any:
+            return value or (getattr(previous, name) if previous else None)
+
+        current_sns = slots.current_sns or _PLATFORM_NOTE.sub("", keep(None, "current_sns") or "") or None
+        if slots.platforms:
+            current_sns = f"{current_sns or ''}（主要: {' / '.join(slots.platforms)}）".strip()
+
+        return PulseResponse(
+            id=generate_id(),
+            client_id=session.client_id,
+            problem=keep(slots.goals, "problem"),
+            current_sns=current_sns,
+            target=keep(slots.target, "target"),
+            product_summary=keep(slots.company, "product_summary"),
+            strengths_usp=keep(slots.usp, "strengths_usp"),
+            brand_story=keep(None, "brand_story"),
+            reference_accounts=keep(slots.references, "reference_accounts"),
+            raw_payload={"source": "pulss_chat", "session_id": session.id, "slots": slots.to_dict(), "final_report": final_report},
+            submitted_at=session.finalized_at or datetime.utcnow(),
+        )
+
     def save_ai_draft(self, client_id: str, draft_type: str, status: str, content: str) -> AiDraft:
+        # Re-posting an identical draft (e.g. a retried n8n callback) returns the stored row.
+        input_hash = content_hash([draft_type, status, content])
+        existing = self.draft_repo.find_by_hash(client_id, input_hash)
+        if existing:
+            GENERATION_CACHE.inc("draft", "hit")
+            return existing
+        GENERATION_CACHE.inc("draft", "miss")
         now = datetime.utcnow()
         draft = AiDraft(
             id=generate_id(),
@@ -381,29 +641,119 @@ class PulssChatService:
             content=content,
             created_at=now,
             updated_at=now,
+            input_hash=input_hash,
         )
         return self.draft_repo.add(draft)
 
-    def _call_openai(self, messages: List[Dict[str, str]]) -> Optional[str]:
-        api_key = os.getenv("OPENAI_API_KEY")
+    def list_ai_drafts(self, client_id: str, limit: Optional[int] = None) -> List[AiDraft]:
+        return self.draft_repo.list_for_client(client_id, limit=limit)
+
+    def usage_summary(
+        self,
+        group_by: str,
+        client_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[LlmUsageSummary]:
+        return self.usage_repo.summarize(
+            group_by, client_id=client_id, session_id=session_id, since=since, until=until, limit=limit
+        )
+
+    def _apply_budget(
+        self, messages: List[Dict[str, str]], session_id: Optional[str], client_id: Optional[str]
+    ) -> tuple[List[Dict[str, str]], Optional[str]]:
+        """Compact the history and/or pick the cheap model according to the configured budgets."""
+        budget = self.budget
+        over = False
+        if budget.session_tokens or budget.client_daily_tokens:
+            session_used = self.usage_repo.total_for_session(session_id) if session_id and budget.session_tokens else 0
+            client_used = 0
+            if client_id and budget.client_daily_tokens:
+                midnight = datetime.combine(datetime.utcnow().date(), dt_time.min)
+                client_used = self.usage_repo.total_for_client(client_id, midnight)
+            over = budget.over_budget(session_used, client_used)
+        model = None
+        if over and budget.cheap_model:
+            model = budget.cheap_model
+            BUDGET_ACTIONS.inc("cheap_model")
+        limit = budget.history_token_limit // 2 if over else budget.history_token_limit
+        compacted = compact_history(messages, limit)
+        if compacted is not messages:
+            BUDGET_ACTIONS.inc("compact_history")
+            logger.info(
+                "[pulss] history compacted: session_id=%s messages=%d->%d over_budget=%s",
+                session_id,
+                len(messages),
+                len(compacted),
+                over,
+            )
+        return compacted, model
+
+    def _record_usage(
+        self,
+        messages: List[Dict[str, str]],
+        result: ChatCompletion,
+        latency_ms: float,
+        session_id: Optional[str],
+        client_id: Optional[str],
+        purpose: str,
+    ) -> None:
+        estimated = result.prompt_tokens is None or result.completion_tokens is None
+        prompt_tokens = result.prompt_tokens if result.prompt_tokens is not None else estimate_messages(messages)
+        completion_tokens = (
+            result.completion_tokens if result.completion_tokens is not None else estimate_tokens(result.content)
+        )
+        TOKENS.inc(result.model, "prompt", amount=prompt_tokens)
+        TOKENS.inc(result.model, "completion", amount=completion_tokens)
+        try:
+            self.usage_repo.add(
+                LlmUsage(
+                    id=generate_id(),
+                    session_id=session_id,
+                    client_id=client_id,
+                    purpose=purpose,
+                    model=result.model,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    latency_ms=round(latency_ms, 1),
+                    estimated=estimated,
+                    created_at=datetime.utcnow(),
+                )
+            )
+        except Exception:  # noqa: BLE001
+            # Accounting must never cost the user their reply.
+            logger.exception("[pulss] failed to record llm usage: session_id=%s", session_id)
+
+    def _call_openai(
+        self,
+        messages: List[Dict[str, str]],
+        session_id: Optional[str] = None,
+        client_id: Optional[str] = None,
+        purpose: str = "turn",
+    ) -> Optional[str]:
+        api_key = self.openai_client.api_key
         if not api_key:
             logger.info("[pulss] OPENAI_API_KEY not set; skip call (env=%s)", bool(api_key))
             return None
+        messages, model = self._apply_budget(messages, session_id, client_id)
+        tokens = estimate_messages(messages) + self.expected_completion_tokens
         try:
-            resp = httpx.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={"model": self.openai_model, "messages": messages},
-                timeout=30.0,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            content = data["choices"][0]["message"]["content"]
+            with self.admission.admit(session_id, tokens=tokens):
+                start = time.perf_counter()
+                result = self.openai_client.create(messages, model=model)
+                latency_ms = (time.perf_counter() - start) * 1000
+            self._record_usage(messages, result, latency_ms, session_id, client_id, purpose)
+            content = result.content
             logger.debug("[pulss] openai reply (head): %s", content[:30])
             return content
+        except AdmissionRejected as e:
+            logger.warning("[pulss] openai call shed (%s): session_id=%s", e.reason, session_id)
+            raise PulssLlmOverloaded("LLM is busy; please retry shortly", retry_after=e.retry_after) from e
+        except CircuitOpenError:
+            logger.warning("[pulss] openai circuit open; skip call")
+            return None
         except Exception as e:  # noqa: BLE001
             logger.exception("[pulss] openai call failed")
             return None
@@ -416,6 +766,9 @@ class TaskService:
     def list_tasks(self, client_id: str, category: Optional[TaskCategory] = None) -> List[Task]:
         return self.task_repo.list_by_client(client_id, category=category)
 
+    def list_state(self) -> TableState:
+        return self.task_repo.db.table_state("tasks")
+
     def create_task(self, client_id: str, payload: dict) -> Task:
         task = Task(
             id="",
@@ -438,28 +791,90 @@ class TaskService:
         return self.task_repo.update(task_id, **payload)
 
 class AiSuggestionService:
-    def __init__(self, repo: AiSuggestionRepository) -> None:
-        self.repo = repo
+    SUGGESTION_TYPE = "touchpoint_message"
 
-    def list_for_client(self, client_id: str) -> List[AiSuggestion]:
-        return self.repo.list_by_client(client_id)
+    def __init__(
+        self,
+        repo: AiSuggestionRepository,
+        task_repo: Optional[TaskRepository] = None,
+        brief_repo: Optional[ClientBriefRepository] = None,
+        knowledge: Optional[EmbeddingIndex] = None,
+    ) -> None:
+        self.repo = repo
+        self.task_repo = task_repo
+        self.brief_repo = brief_repo
+        self.knowledge = knowledge
+
+    def list_for_client(self, client_id: str, limit: Optional[int] = None) -> List[AiSuggestion]:
+        return self.repo.list_by_client(client_id, limit=limit)
+
+    def generation_inputs(self, client: Client, context: dict) -> dict:
+        """Everything a suggestion for this client depends on; its hash is the memo key.
+
+        Knowledge hits are left out: shared news would make every client's key change on each
+        news refresh, and a search cut short by its latency budget would change it at random.
+        """
+        pulse = client.latest_pulse_response
+        inputs: Dict[str, Any] = {
+            "type": self.SUGGESTION_TYPE,
+            "client": [client.id, client.name, client.industry, client.phase.value],
+            "pulse": [pulse.id, pulse.problem] if pulse else None,
+            "context": context,
+        }
+        if self.task_repo is not None:
+            inputs["tasks"] = sorted([t.id, t.status.value] for t in self.task_repo.list_by_client(client.id))
+        if self.brief_repo is not None:
+            brief = self.brief_repo.get_by_client(client.id)
+            inputs["brief"] = [brief.id, brief.updated_at] if brief else None
+        return inputs
+
+    def related_knowledge(self, client: Client, context: dict) -> List[KnowledgeHit]:
+        if self.knowledge is None or RAG_TOP_K <= 0:
+            return []
+        pulse = client.latest_pulse_response
+        query = "\n".join(
+            filter(None, [client.name, client.industry, pulse.problem if pulse else None, context.get("extra")])
+        )
+        return self.knowledge.search(
+            query, k=RAG_TOP_K, client_id=client.id, budget_ms=RAG_BUDGET_MS, min_score=RAG_MIN_SCORE
+        )
 
-    def generate(self, client: Client, context: Optional[dict] = None) -> AiSuggestion:
+    def generate(self, client: Client, context: Optional[dict] = None, force: bool = False) -> AiSuggestion:
+        """Return the suggestion for the current inputs, generating it only if they changed
+        since the last generation (or when force is set)."""
+        suggestion, is_new = self.prepare(client, context or {}, force=force)
+        return self.repo.add(suggestion) if is_new else suggestion
+
+    def prepare(self, client: Client, context: dict, force: bool = False) -> tuple[AiSuggestion, bool]:
+        """Build (without saving) the suggestion for the current inputs.
+
+        Returns (suggestion, True) for a new one, or (stored suggestion, False) when the
+        inputs are unchanged.
+        """
+        input_hash = content_hash(self.generation_inputs(client, context))
+        if not force:
+            cached = self.repo.find_by_hash(client.id, self.SUGGESTION_TYPE, input_hash)
+            if cached:
+                GENERATION_CACHE.inc("suggestion", "hit")
+                return cached, False
+        GENERATION_CACHE.inc("suggestion", "miss")
+        related = self.related_knowledge(client, context)
         now = datetime.utcnow()
         suggestion = AiSuggestion(
             id=generate_id(),
             client_id=client.id,
-            type="touchpoint_message",
+            type=self.SUGGESTION_TYPE,
             title=f"{client.name} 向け次回提案ドラフト",
-            body=self._build_body(client, context or {}),
+            body=self._build_body(client, context, related),
             status=AiSuggestionStatus.DRAFT,
             created_by="ai",
             created_at=now,
             updated_at=now,
+            input_hash=input_hash,
         )
-        return self.repo.add(suggestion)
+        return suggestion, True
 
-    def _build_body(self, client: Client, context: dict) -> str:
+    def _build_body(self, client: Client, context: dict, related: Optional[List[KnowledgeHit]] = None) -> str:
         lines = [
             f"クライアント: {client.name}",
             f"フェーズ: {client.phase.value}",
@@ -473,9 +888,156 @@ class AiSuggestionService:
             lines.append(f"課題サマリ: {client.latest_pulse_response.problem}")
         if context.get("extra"):
             lines.append(f"メモ: {context['extra']}")
+        if related:
+            lines.append("関連情報:")
+            lines.append(_format_hits(related))
         return "\n".join(lines)
 
 
+@dataclass
+class BulkSuggestionJob:
+    id: str
+    filters: Dict[str, Any]
+    status: str = "queued"  # queued / running / completed / failed
+    total: int = 0
+    processed: int = 0
+    generated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class BulkSuggestionService:
+    """Generates AI suggestions for a whole slice of the client book in the background.
+
+    Clients are prepared concurrently on a bounded pool; clients whose generation inputs are
+    unchanged since the last run are skipped, and new suggestions are written with one bulk
+    insert at the end. Jobs live in memory (the most recent `keep_jobs`), and only one runs
+    at a time: starting another while one is active returns the active job.
+    """
+
+    def __init__(
+        self,
+        client_service: ClientService,
+        ai_service: AiSuggestionService,
+        max_workers: Optional[int] = None,
+        keep_jobs: int = 20,
+    ) -> None:
+        self.client_service = client_service
+        self.ai_service = ai_service
+        self.max_workers = max_workers or int(os.getenv("PULSS_BULK_WORKERS", "4") or 4)
+        self.keep_jobs = keep_jobs
+        self._jobs: Dict[str, BulkSuggestionJob] = {}
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        status: Optional[ClientStatus] = ClientStatus.CONTRACTED,
+        phase: Optional[ClientPhase] = None,
+        client_ids: Optional[List[str]] = None,
+        context: Optional[dict] = None,
+        force: bool = False,
+    ) -> BulkSuggestionJob:
+        with self._lock:
+            active = next((j for j in self._jobs.values() if j.status in ("queued", "running")), None)
+            if active:
+                return active
+            job = BulkSuggestionJob(
+                id=generate_id(),
+                filters={
+                    "status": status.value if status else None,
+                    "phase": phase.value if phase else None,
+                    "client_ids": client_ids,
+                    "force": force,
+                },
+            )
+            self._jobs[job.id] = job
+            for old in list(self._jobs)[: max(0, len(self._jobs) - self.keep_jobs)]:
+                del self._jobs[old]
+        threading.Thread(
+            target=self._run,
+            args=(job, status, phase, client_ids, context or {}, force),
+            name=f"pulss-bulk-{job.id}",
+            daemon=True,
+        ).start()
+        return job
+
+    def get(self, job_id: str) -> Optional[BulkSuggestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[BulkSuggestionJob]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def _select(
+        self, status: Optional[ClientStatus], phase: Optional[ClientPhase], client_ids: Optional[List[str]]
+    ) -> List[Client]:
+        wanted = set(client_ids) if client_ids else None
+        return [
+            c
+            for c in self.client_service.list_clients()
+            if (status is None or c.status == status)
+            and (phase is None or c.phase == phase)
+            and (wanted is None or c.id in wanted)
+        ]
+
+    def _run(
+        self,
+        job: BulkSuggestionJob,
+        status: Optional[ClientStatus],
+        phase: Optional[ClientPhase],
+        client_ids: Optional[List[str]],
+        context: dict,
+        force: bool,
+    ) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        try:
+            clients = self._select(status, phase, client_ids)
+            job.total = len(clients)
+            new: List[AiSuggestion] = []
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pulss-bulk") as pool:
+                futures = {pool.submit(self.ai_service.prepare, c, context, force): c for c in clients}
+                for future in as_completed(futures):
+                    try:
+                        suggestion, is_new = future.result()
+                    except Exception:  # noqa: BLE001
+                        logger.exception("[pulss] bulk suggestion failed: job=%s client_id=%s", job.id, futures[future].id)
+                        with self._lock:
+                            job.failed += 1
+                            job.processed += 1
+                        continue
+                    with self._lock:
+                        if is_new:
+                            new.append(suggestion)
+                            job.generated += 1
+                        else:
+                            job.skipped += 1
+                        job.processed += 1
+            if new:
+                self.ai_service.repo.add_many(new)
+            job.status = "completed"
+        except Exception as e:  # noqa: BLE001
+            logger.exception("[pulss] bulk suggestion job failed: job=%s", job.id)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+            logger.info(
+                "[pulss] bulk suggestion job %s: status=%s total=%d generated=%d skipped=%d failed=%d",
+                job.id,
+                job.status,
+                job.total,
+                job.generated,
+                job.skipped,
+                job.failed,
+            )
+
+
 class ManagementService:
     def __init__(
         self,
@@ -487,6 +1049,8 @@ class ManagementService:
         content_repo: ContentPostRepository,
         metric_repo: MetricSnapshotRepository,
         notification_repo: NotificationRepository,
+        pipeline: Optional[PipelineAnalytics] = None,
+        duplicates: Optional[DuplicateIndex] = None,
     ) -> None:
         self.lead_repo = lead_repo
         self.contact_repo = contact_repo
@@ -496,12 +1060,37 @@ class ManagementService:
         self.content_repo = content_repo
         self.metric_repo = metric_repo
         self.notification_repo = notification_repo
+        if pipeline is None:
+            pipeline = PipelineAnalytics(lead_repo.db)
+            pipeline.attach()
+        self.pipeline = pipeline
+        self.duplicates = duplicates
+        self._create_lock = threading.Lock()
+        self._rollup_lock = threading.Lock()
+        self._rescore_lock = threading.Lock()
+        # (period, industry, group_by) -> rows, for closed months only; see kpi_report.
+        self._kpi_cache: Dict[tuple, List[KpiRow]] = {}
+        self._kpi_lock = threading.Lock()
+        self._kpi_generation = 0
+        db = metric_repo.db
+        db.on_write("metric_snapshots", lambda snaps: self._invalidate_kpis({s.period for s in snaps}))
+        db.on_write("clients", lambda clients: self._invalidate_kpis(None))
 
     # Leads
     def list_leads(self) -> List[Lead]:
         return self.lead_repo.list()
 
-    def create_lead(self, payload: dict) -> Lead:
+    def leads_state(self) -> TableState:
+        return self.lead_repo.db.table_state("leads")
+
+    def create_lead(self, payload: dict, reject_duplicates: bool = False) -> Tuple[Lead, List[DuplicateMatch]]:
+        """Insert a lead; returns it with the existing leads/clients whose names look alike."""
+        # Check and insert under one lock so two imports of the same company cannot both pass.
+        with self._create_lock:
+            matches = _check_duplicates(self.duplicates, payload["company_name"], ("lead", "client"), reject_duplicates)
+            return self._create_lead(payload), matches
+
+    def _create_lead(self, payload: dict) -> Lead:
         now = datetime.utcnow()
         lead = Lead(
             id=generate_id(),
@@ -527,6 +1116,36 @@ class ManagementService:
             payload["last_contact_at"] = datetime.fromisoformat(payload["last_contact_at"])
         return self.lead_repo.update(lead_id, payload)
 
+    def pipeline_report(self) -> PipelineReport:
+        return self.pipeline.report()
+
+    # Duplicates (leads and clients share one index)
+    def find_duplicates(
+        self, name: str, kinds: Optional[List[str]] = None, threshold: float = DEFAULT_THRESHOLD
+    ) -> List[DuplicateMatch]:
+        return self.duplicates.find(name, threshold=threshold, kinds=kinds) if self.duplicates else []
+
+    def duplicate_report(self, kinds: Optional[List[str]] = None, threshold: float = DEFAULT_THRESHOLD) -> List[DuplicateGroup]:
+        return self.duplicates.report(threshold=threshold, kinds=kinds) if self.duplicates else []
+
+    def rescore_leads(self) -> LeadRescoreResult:
+        """Recompute every lead's score in one vectorized pass and write back only the changes.
+
+        Run after lead imports and daily (see app.py); the sales board then sorts by the
+        stored score without computing anything per request.
+        """
+        started = time.perf_counter()
+        with self._rescore_lock:
+            rows = self.lead_repo.scoring_inputs(engagement_since())
+            scores = compute_scores(rows)
+            changed = [(int(s), r["id"]) for r, s in zip(rows, scores) if r["score"] != s]
+            self.lead_repo.update_scores(changed)
+        elapsed = time.perf_counter() - started
+        RESCORE_SECONDS.observe(value=elapsed)
+        RESCORE_CHANGED.inc(amount=len(changed))
+        logger.info("[pulss] leads rescored: %d leads, %d changed in %.0fms", len(rows), len(changed), elapsed * 1000)
+        return LeadRescoreResult(scored=len(rows), changed=len(changed), duration_ms=round(elapsed * 1000, 1))
+
     # Contact logs
     def add_contact(self, lead_id: str, payload: dict) -> ContactLog:
         now = datetime.utcnow()
@@ -572,8 +1191,8 @@ class ManagementService:
             payload["follow_due_at"] = datetime.fromisoformat(payload["follow_due_at"])
         return self.proposal_repo.update(proposal_id, payload)
 
-    def list_proposals(self, client_id: str) -> List[Proposal]:
-        return self.proposal_repo.list_for_client(client_id)
+    def list_proposals(self, client_id: str, limit: Optional[int] = None) -> List[Proposal]:
+        return self.proposal_repo.list_for_client(client_id, limit=limit)
 
     # Contracts
     def create_contract(self, payload: dict) -> Contract:
@@ -592,8 +1211,8 @@ class ManagementService:
         )
         return self.contract_repo.add(contract)
 
-    def list_contracts(self, client_id: str) -> List[Contract]:
-        return self.contract_repo.list_for_client(client_id)
+    def list_contracts(self, client_id: str, limit: Optional[int] = None) -> List[Contract]:
+        return self.contract_repo.list_for_client(client_id, limit=limit)
 
     # Client brief
     def upsert_brief(self, payload: dict) -> ClientBrief:
@@ -613,8 +1232,8 @@ class ManagementService:
         return self.brief_repo.get_by_client(client_id)
 
     # Content calendar
-    def list_content(self, client_id: str) -> List[ContentPost]:
-        return self.content_repo.list_for_client(client_id)
+    def list_content(self, client_id: str, limit: Optional[int] = None) -> List[ContentPost]:
+        return self.content_repo.list_for_client(client_id, limit=limit)
 
     def create_content(self, payload: dict) -> ContentPost:
         now = datetime.utcnow()
@@ -641,8 +1260,8 @@ class ManagementService:
         return self.content_repo.update(post_id, payload)
 
     # Metrics
-    def list_metrics(self, client_id: str) -> List[MetricSnapshot]:
-        return self.metric_repo.list_for_client(client_id)
+    def list_metrics(self, client_id: str, limit: Optional[int] = None) -> List[MetricSnapshot]:
+        return self.metric_repo.list_for_client(client_id, limit=limit)
 
     def create_metric(self, payload: dict) -> MetricSnapshot:
         snap = MetricSnapshot(
@@ -654,6 +1273,146 @@ class ManagementService:
         )
         return self.metric_repo.add(snap)
 
+    def refresh_metric_rollups(self, batch_clients: int = 1000) -> int:
+        """Recompute rollups for clients with new metric values, in NumPy batches."""
+        refreshed = 0
+        with self._rollup_lock:
+            while True:
+                dirty = self.metric_repo.dirty_clients(limit=batch_clients)
+                if not dirty:
+                    return refreshed
+                rows, months = [], []
+                for r in self.metric_repo.values_for_clients(list(dirty)):
+                    try:
+                        months.append(month_index(r["period"]))
+                    except ValueError:
+                        # Left out of the rollups rather than failing every refresh (and every
+                        # series/KPI read) until the row is fixed.
+                        logger.warning("[pulss] skipping metric value with invalid period %r (client %s)", r["period"], r["client_id"])
+                        continue
+                    rows.append(r)
+                keys: Dict[tuple, int] = {}
+                series = [keys.setdefault((r["client_id"], r["metric"]), len(keys)) for r in rows]
+                rollups = compute_rollups(series, months, [r["value"] for r in rows])
+                out = [
+                    (r["client_id"], r["metric"], r["period"], r["value"], *_nan_none(mom, yoy, avg3))
+                    for r, mom, yoy, avg3 in zip(rows, rollups.mom, rollups.yoy, rollups.avg3)
+                ]
+                self.metric_repo.replace_rollups(dirty, out)
+                refreshed += len(dirty)
+
+    def metric_series(
+        self,
+        client_ids: Optional[List[str]] = None,
+        industry: Optional[str] = None,
+        metrics: Optional[List[str]] = None,
+        period_from: Optional[str] = None,
+        period_to: Optional[str] = None,
+    ) -> MetricSeriesSet:
+        """Chart-ready series for many clients: every series shares one period axis."""
+        self.refresh_metric_rollups()
+        rows = self.metric_repo.rollups(client_ids, industry, metrics, period_from, period_to)
+        if not rows:
+            return MetricSeriesSet(periods=[], series=[])
+        months = [month_index(r["period"]) for r in rows]
+        start = month_index(period_from) if period_from else min(months)
+        end = month_index(period_to) if period_to else max(months)
+        series: List[MetricSeries] = []
+        lo = 0
+        for hi in range(1, len(rows) + 1):
+            if hi < len(rows) and (rows[hi]["client_id"], rows[hi]["metric"]) == (rows[lo]["client_id"], rows[lo]["metric"]):
+                continue
+            group = rows[lo:hi]
+            columns = [[r[c] if r[c] is not None else float("nan") for r in group] for c in ("value", "mom", "yoy", "avg3")]
+            values, mom, yoy, avg3 = align(months[lo:hi], columns, start, end)
+            series.append(
+                MetricSeries(
+                    client_id=group[0]["client_id"],
+                    metric=group[0]["metric"],
+                    values=nan_to_none(values),
+                    mom=nan_to_none(mom),
+                    yoy=nan_to_none(yoy),
+                    avg3=nan_to_none(avg3),
+                )
+            )
+            lo = hi
+        return MetricSeriesSet(periods=period_range(start, end), series=series)
+
+    KPI_GROUPS = ("none", "industry", "phase", "status")
+
+    def kpi_report(
+        self,
+        period_from: Optional[str] = None,
+        period_to: Optional[str] = None,
+        industry: Optional[str] = None,
+        group_by: str = "none",
+        metrics: Optional[List[str]] = None,
+    ) -> List[KpiRow]:
+        """Per period (and group), the distribution of each metric across clients.
+
+        Defaults to the 12 months up to the current one. Closed months are cached per
+        (period, industry, group_by); only the current month and uncached periods are
+        aggregated, in one pass. A late write to a past month drops that month (and the next,
+        whose MoM depends on it) from the cache.
+        """
+        current = month_index(datetime.utcnow().strftime("%Y-%m"))
+        end = month_index(period_to) if period_to else current
+        start = month_index(period_from) if period_from else end - 11
+        periods = period_range(start, end)
+        with self._kpi_lock:
+            cached = {p: self._kpi_cache.get((p, industry, group_by)) for p in periods}
+            generation = self._kpi_generation
+        missing = [p for p in periods if cached[p] is None]
+        if missing:
+            self.refresh_metric_rollups()
+            computed = self._compute_kpis(missing, industry, group_by)
+            with self._kpi_lock:
+                for p in missing:
+                    cached[p] = computed.get(p, [])
+                    if generation == self._kpi_generation and month_index(p) < current:
+                        self._kpi_cache[(p, industry, group_by)] = cached[p]
+        rows = [row for p in periods for row in cached[p]]
+        return [r for r in rows if r.metric in metrics] if metrics else rows
+
+    def _compute_kpis(self, periods: List[str], industry: Optional[str], group_by: str) -> Dict[str, List[KpiRow]]:
+        source = self.metric_repo.kpi_source(periods, industry)
+        keys: Dict[tuple, int] = {}
+        codes = [
+            keys.setdefault((r["period"], r[group_by] if group_by != "none" else "all", r["metric"]), len(keys))
+            for r in source
+        ]
+        stats = grouped_stats(codes, [r["value"] for r in source])
+        has_mom = [i for i, r in enumerate(source) if r["mom"] is not None]
+        mom = grouped_stats([codes[i] for i in has_mom], [source[i]["mom"] for i in has_mom])
+        mom_median = dict(zip(mom["keys"].tolist(), mom["median"].tolist())) if has_mom else {}
+        by_code = {code: key for key, code in keys.items()}
+        out: Dict[str, List[KpiRow]] = {}
+        for i, code in enumerate(stats["keys"].tolist()):
+            period, group, metric = by_code[code]
+            out.setdefault(period, []).append(
+                KpiRow(
+                    period=period,
+                    group=group or "",
+                    metric=metric,
+                    clients=int(stats["count"][i]),
+                    mom_median=round(mom_median[code], 4) if code in mom_median else None,
+                    **{k: round(float(stats[k][i]), 4) for k in ("total", "mean", "min", "max", *dict(QUANTILES))},
+                )
+            )
+        for rows in out.values():
+            rows.sort(key=lambda r: (r.group, r.metric))
+        return out
+
+    def _invalidate_kpis(self, periods: Optional[set]) -> None:
+        with self._kpi_lock:
+            self._kpi_generation += 1
+            if periods is None:
+                self._kpi_cache.clear()
+                return
+            stale = periods | {period_label(month_index(p) + 1) for p in periods}
+            for key in [k for k in self._kpi_cache if k[0] in stale]:
+                del self._kpi_cache[key]
+
     # Notifications
     def list_notifications(self, user: str) -> List[Notification]:
         return self.notification_repo.list_for_user(user)
@@ -666,35 +1425,328 @@ class ManagementService:
         return self.notification_repo.mark_read(notification_id)
 
 
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _epoch(key: str) -> float:
+    return (datetime.fromisoformat(key) - datetime(1970, 1, 1)).total_seconds()
+
+
+def _occurrence(series: ScheduleEvent, original: datetime, exc: Optional[ScheduleException] = None) -> ScheduleEvent:
+    key = schedule_key(original)
+    start = exc.start if exc and exc.start else original
+    end = exc.end if exc and exc.end else start + (series.end - series.start)
+    return ScheduleEvent(
+        id=f"{series.id}@{key}",
+        title=exc.title if exc and exc.title else series.title,
+        start=start,
+        end=end,
+        type=series.type,
+        team=series.team,
+        description=exc.description if exc and exc.description is not None else series.description,
+        series_id=series.id,
+        recurrence_id=original,
+    )
+
+
+def _original_start(series: ScheduleEvent, key: str) -> datetime:
+    """recurrence_id key (naive UTC) -> datetime in the series' own offset."""
+    original = datetime.fromisoformat(key)
+    if series.start.tzinfo:
+        return original.replace(tzinfo=timezone.utc).astimezone(series.start.tzinfo)
+    return original
+
+
+def _expand_series(
+    series: ScheduleEvent, exceptions: Dict[str, ScheduleException], start: datetime, end: datetime
+) -> List[ScheduleEvent]:
+    """Concrete occurrences of a series overlapping [start, end), exceptions applied."""
+    lo, hi = schedule_key(start), schedule_key(end)
+    rule = RecurrenceRule.parse(series.rrule or "")
+    out = []
+    for original in occurrences(rule, series.start, start - (series.end - series.start), end):
+        if schedule_key(original) not in exceptions:
+            out.append(_occurrence(series, original))
+    # Moved occurrences can land in the window from anywhere, so check every modified one.
+    for key, exc in exceptions.items():
+        if not exc.cancelled:
+            out.append(_occurrence(series, _original_start(series, key), exc))
+    return [e for e in out if schedule_key(e.start) < hi and schedule_key(e.end) > lo]
+
+
+def _reschedules(before: ScheduleEvent, after: ScheduleEvent) -> bool:
+    """Whether an edit can change which events overlap (time, team or recurrence)."""
+    return (
+        schedule_key(before.start) != schedule_key(after.start)
+        or schedule_key(before.end) != schedule_key(after.end)
+        or before.team != after.team
+        or before.rrule != after.rrule
+    )
+
+
+def _split_occurrence_id(event_id: str) -> Optional[Tuple[str, str]]:
+    """'<series id>@<original start key>' -> (series id, key)."""
+    series_id, sep, key = event_id.partition("@")
+    if not sep:
+        return None
+    try:
+        return series_id, schedule_key(datetime.fromisoformat(key))
+    except ValueError:
+        return None
+
+
 class ScheduleService:
+    # How far ahead a new or changed series is checked for conflicts, and at most how many occurrences.
+    CONFLICT_HORIZON = timedelta(days=365)
+    CONFLICT_MAX_OCCURRENCES = 200
+
     def __init__(self, schedule_repo: ScheduleRepository) -> None:
         self.schedule_repo = schedule_repo
+        # One interval tree per team for single events, plus the recurring series (expanded
+        # on demand), loaded on first use. Writes go through this service, which updates
+        # them under the same lock as the conflict check.
+        self._lock = threading.RLock()
+        self._trees: Dict[str, IntervalTree] = {}
+        self._teams: Dict[str, str] = {}
+        self._series: Dict[str, ScheduleEvent] = {}
+        self._exceptions: Dict[str, Dict[str, ScheduleException]] = {}
+        self._max_span = 0.0
+        self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            for r in self.schedule_repo.intervals():
+                if r["start"] and r["end"]:
+                    self._track(r["id"], r["team"] or "", _epoch(r["start"]), _epoch(r["end"]))
+            self._series = {e.id: e for e in self.schedule_repo.series()}
+            self._exceptions = self.schedule_repo.exceptions(list(self._series))
+            self._loaded = True
+
+    def _track(self, event_id: str, team: str, start: float, end: float) -> None:
+        self._untrack(event_id)
+        self._teams[event_id] = team
+        self._trees.setdefault(team, IntervalTree()).add(event_id, start, end)
+        self._max_span = max(self._max_span, end - start)
+
+    def _untrack(self, event_id: str) -> None:
+        team = self._teams.pop(event_id, None)
+        if team is not None:
+            self._trees[team].remove(event_id)
+        self._series.pop(event_id, None)
+
+    def _track_event(self, event: ScheduleEvent) -> None:
+        if event.rrule:
+            self._untrack(event.id)
+            self._series[event.id] = event
+        else:
+            self._track(event.id, event.team, _epoch(schedule_key(event.start)), _epoch(schedule_key(event.end)))
+
+    def list(
+        self,
+        date: Optional[str] = None,
+        team: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[ScheduleEvent]:
+        """Events starting on `date` and/or overlapping [start, end); a month view is one indexed query.
+
+        With a date or a from/to window, recurring series are expanded into concrete
+        occurrences within it; otherwise series come back as their stored row (with rrule).
+        """
+        earliest = None
+        if start:
+            self._ensure_loaded()
+            earliest = schedule_key(start - timedelta(seconds=self._max_span))
+        events = self.schedule_repo.list(
+            date=date,
+            team=team,
+            start=schedule_key(start) if start else None,
+            end=schedule_key(end) if end else None,
+            earliest_start=earliest,
+        )
+        lo = schedule_key(start) if start else None
+        hi = schedule_key(end) if end else None
+        if date:
+            day = datetime.fromisoformat(date[:10])
+            window = (day, day + timedelta(days=1))
+        elif start and end:
+            window = (start, end)
+        else:
+            if start or end:
+                events += self.schedule_repo.series(team, lo, hi)
+            return events
+        series = self.schedule_repo.series(team, schedule_key(window[0]), schedule_key(window[1]))
+        exceptions = self.schedule_repo.exceptions([e.id for e in series])
+        for item in series:
+            for o in _expand_series(item, exceptions.get(item.id, {}), *window):
+                if date and not schedule_key(window[0]) <= schedule_key(o.start) < schedule_key(window[1]):
+                    continue  # `date` selects occurrences starting that day
+                if (lo and schedule_key(o.end) <= lo) or (hi and schedule_key(o.start) >= hi):
+                    continue
+                events.append(o)
+        events.sort(key=lambda e: schedule_key(e.start))
+        return events
+
+    def list_state(self) -> TableState:
+        return self.schedule_repo.db.table_state("schedules", "schedule_exceptions")
+
+    def conflicts(
+        self, team: str, start: datetime, end: datetime, exclude: Optional[str] = None
+    ) -> List[ScheduleEvent]:
+        """Events and series occurrences of `team` overlapping [start, end).
+
+        Back-to-back events do not conflict. `exclude` is an event, series or occurrence id
+        (a series id excludes all of its occurrences).
+        """
+        self._ensure_loaded()
+        with self._lock:
+            tree = self._trees.get(team)
+            ids = tree.overlapping(_epoch(schedule_key(start)), _epoch(schedule_key(end))) if tree else []
+            found = [
+                o
+                for s in self._series.values()
+                if s.team == team and s.id != exclude
+                for o in _expand_series(s, self._exceptions.get(s.id, {}), start, end)
+                if o.id != exclude
+            ]
+        found += self.schedule_repo.get_many([i for i in ids if i != exclude])
+        found.sort(key=lambda e: schedule_key(e.start))
+        return found
+
+    def _check(self, event: ScheduleEvent, exclude: Optional[str] = None, reject: bool = False) -> List[ScheduleEvent]:
+        """Events `event` would overlap; raises instead when `reject` is set."""
+        if event.rrule:
+            horizon = event.start + self.CONFLICT_HORIZON
+            spans = [
+                (o, o + (event.end - event.start))
+                for o in islice(
+                    occurrences(RecurrenceRule.parse(event.rrule), event.start, event.start, horizon),
+                    self.CONFLICT_MAX_OCCURRENCES,
+                )
+            ]
+        else:
+            spans = [(event.start, event.end)]
+        conflicts: Dict[str, ScheduleEvent] = {}
+        for s, e in spans:
+            for c in self.conflicts(event.team, s, e, exclude=exclude):
+                conflicts.setdefault(c.id, c)
+        if conflicts and reject:
+            raise ScheduleConflictError(
+                f"Overlaps {len(conflicts)} event(s) of team '{event.team}'", list(conflicts.values())
+            )
+        return list(conflicts.values())
 
-    def list(self, date: Optional[str] = None, team: Optional[str] = None) -> List[ScheduleEvent]:
-        return self.schedule_repo.list(date=date, team=team)
+    def create(self, payload: dict, reject_conflicts: bool = False) -> Tuple[ScheduleEvent, List[ScheduleEvent]]:
+        """Add an event; with `rrule` it is stored once as a recurring series. ValueError on a bad rule.
 
-    def create(self, payload: dict) -> ScheduleEvent:
+        Returns the event with the events of the same team it overlaps (saved anyway unless
+        `reject_conflicts`)."""
         event = ScheduleEvent(
             id=generate_id(),
             title=payload["title"],
-            start=datetime.fromisoformat(payload["start"].replace("Z", "+00:00")),
-            end=datetime.fromisoformat(payload["end"].replace("Z", "+00:00")),
+            start=_as_datetime(payload["start"]),
+            end=_as_datetime(payload["end"]),
             type=payload.get("type", "meeting"),
             team=payload.get("team", "sales"),
             description=payload.get("description"),
+            rrule=str(RecurrenceRule.parse(payload["rrule"])) if payload.get("rrule") else None,
         )
-        return self.schedule_repo.add(event)
-
-    def update(self, event_id: str, payload: dict) -> Optional[ScheduleEvent]:
+        self._ensure_loaded()
+        with self._lock:
+            conflicts = self._check(event, reject=reject_conflicts)
+            self.schedule_repo.add(event)
+            self._track_event(event)
+        return event, conflicts
+
+    def update(
+        self, event_id: str, payload: dict, reject_conflicts: bool = False
+    ) -> Optional[Tuple[ScheduleEvent, List[ScheduleEvent]]]:
+        """Update an event or series; an occurrence id ('<series>@<start>') changes that occurrence only.
+
+        Overlaps are only looked for when the time, team or rule changes, so renaming an event
+        that already overlaps another is not a conflict."""
         mapped = dict(payload)
         if payload.get("start"):
-            mapped["start"] = datetime.fromisoformat(payload["start"].replace("Z", "+00:00"))
+            mapped["start"] = _as_datetime(payload["start"])
         if payload.get("end"):
-            mapped["end"] = datetime.fromisoformat(payload["end"].replace("Z", "+00:00"))
-        return self.schedule_repo.update(event_id, mapped)
+            mapped["end"] = _as_datetime(payload["end"])
+        if payload.get("rrule"):
+            mapped["rrule"] = str(RecurrenceRule.parse(payload["rrule"]))
+        self._ensure_loaded()
+        occurrence = _split_occurrence_id(event_id)
+        if occurrence:
+            return self._update_occurrence(*occurrence, mapped, reject_conflicts)
+        with self._lock:
+            current = self.schedule_repo.get(event_id)
+            if not current:
+                return None
+            changes = {k: v for k, v in mapped.items() if hasattr(current, k) and v is not None}
+            updated = ScheduleEvent(**{**current.__dict__, **changes})
+            conflicts = (
+                self._check(updated, exclude=event_id, reject=reject_conflicts) if _reschedules(current, updated) else []
+            )
+            event = self.schedule_repo.update(event_id, mapped)
+            if not event:
+                return None
+            self._track_event(event)
+        return event, conflicts
+
+    def _series_occurrence(self, series_id: str, key: str) -> Optional[Tuple[ScheduleEvent, datetime]]:
+        series = self._series.get(series_id)
+        if not series:
+            return None
+        original = _original_start(series, key)
+        rule = RecurrenceRule.parse(series.rrule or "")
+        if next(occurrences(rule, series.start, original, original + timedelta(seconds=1)), None) is None:
+            return None  # not an occurrence of this series
+        return series, original
+
+    def _update_occurrence(
+        self, series_id: str, key: str, mapped: dict, reject_conflicts: bool
+    ) -> Optional[Tuple[ScheduleEvent, List[ScheduleEvent]]]:
+        with self._lock:
+            found = self._series_occurrence(series_id, key)
+            if not found:
+                return None
+            series, original = found
+            current = self._exceptions.get(series_id, {}).get(key)
+            base = _occurrence(series, original, current)
+            exc = ScheduleException(
+                event_id=series_id,
+                recurrence_id=key,
+                cancelled=False,
+                title=mapped.get("title") or base.title,
+                start=mapped.get("start") or base.start,
+                end=mapped.get("end") or base.end,
+                description=mapped["description"] if mapped.get("description") is not None else base.description,
+            )
+            event = _occurrence(series, original, exc)
+            conflicts = (
+                self._check(event, exclude=event.id, reject=reject_conflicts) if _reschedules(base, event) else []
+            )
+            self.schedule_repo.put_exception(exc)
+            self._exceptions.setdefault(series_id, {})[key] = exc
+        return event, conflicts
 
     def delete(self, event_id: str) -> None:
-        self.schedule_repo.delete(event_id)
+        """Delete an event or a whole series; an occurrence id cancels just that occurrence."""
+        self._ensure_loaded()
+        with self._lock:
+            occurrence = _split_occurrence_id(event_id)
+            if occurrence:
+                if self._series_occurrence(*occurrence):
+                    exc = ScheduleException(event_id=occurrence[0], recurrence_id=occurrence[1], cancelled=True)
+                    self.schedule_repo.put_exception(exc)
+                    self._exceptions.setdefault(occurrence[0], {})[occurrence[1]] = exc
+                return
+            self.schedule_repo.delete(event_id)
+            self._untrack(event_id)
+            self._exceptions.pop(event_id, None)
 
 
 class SnsNewsService:
@@ -735,10 +1787,19 @@ class SnsNewsService:
         ]
         self.news_repo.add_many(items)
 
-    def list(self, platform: Optional[str] = None, industry: Optional[str] = None, limit: int = 30) -> List[SnsNews]:
-        self._refresh_if_needed()
+    def list(
+        self, platform: Optional[str] = None, industry: Optional[str] = None, limit: int = 30, refresh: bool = True
+    ) -> List[SnsNews]:
+        """Latest news; refresh=False skips the n8n pull (for callers that just ran list_state)."""
+        if refresh:
+            self._refresh_if_needed()
         return self.news_repo.list(platform=platform, industry=industry, limit=limit)
 
+    def list_state(self) -> TableState:
+        # Pull from n8n first so a refresh shows up as a new version.
+        self._refresh_if_needed()
+        return self.news_repo.db.table_state("sns_news")
+
     def _refresh_if_needed(self) -> None:
         if not self.n8n_client.url:
             return
@@ -786,3 +1847,72 @@ class SnsNewsService:
             published_at=published_at,
             fetched_at=now,
         )
+
+
+@dataclass
+class ClientWorkspace:
+    client: Client
+    tasks: List[Task]
+    sections: Dict[str, Any] = field(default_factory=dict)
+    has_more: Dict[str, bool] = field(default_factory=dict)
+
+
+class ClientWorkspaceService:
+    """Assembles everything the client detail page needs in one call."""
+
+    SECTIONS = ("tasks", "ai_suggestions", "proposals", "contracts", "brief", "content_posts", "metrics", "ai_drafts")
+
+    def __init__(
+        self,
+        client_service: ClientService,
+        task_service: TaskService,
+        ai_service: AiSuggestionService,
+        management_service: ManagementService,
+        pulss_service: PulssChatService,
+        max_workers: int = 8,
+    ) -> None:
+        self.client_service = client_service
+        self.task_service = task_service
+        self.ai_service = ai_service
+        self.management_service = management_service
+        self.pulss_service = pulss_service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pulss-workspace")
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> "Future[Any]":
+        # Run in a copy of the caller's context so per-request DB stats follow the query.
+        return self._executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def load(self, client_id: str, include: Optional[List[str]] = None, limit: int = 20) -> Optional[ClientWorkspace]:
+        wanted = [s for s in self.SECTIONS if not include or s in include]
+        # Fetch one extra row per list so the response can flag truncated sections.
+        fetch = limit + 1
+        loaders: Dict[str, Callable[[], Any]] = {
+            "ai_suggestions": lambda: self.ai_service.list_for_client(client_id, limit=fetch),
+            "proposals": lambda: self.management_service.list_proposals(client_id, limit=fetch),
+            "contracts": lambda: self.management_service.list_contracts(client_id, limit=fetch),
+            "brief": lambda: self.management_service.latest_brief(client_id),
+            "content_posts": lambda: self.management_service.list_content(client_id, limit=fetch),
+            "metrics": lambda: self.management_service.list_metrics(client_id, limit=fetch),
+            "ai_drafts": lambda: self.pulss_service.list_ai_drafts(client_id, limit=fetch),
+        }
+        # Tasks are always loaded in full: the client summary derives progress/alerts from them.
+        client_future = self._submit(self.client_service.get_client, client_id)
+        tasks_future = self._submit(self.task_service.list_tasks, client_id)
+        futures = {name: self._submit(loaders[name]) for name in wanted if name in loaders}
+
+        client = client_future.result()
+        tasks = tasks_future.result()
+        results = {name: f.result() for name, f in futures.items()}
+        if not client:
+            return None
+
+        workspace = ClientWorkspace(client=client, tasks=tasks)
+        if "tasks" in wanted:
+            results["tasks"] = tasks[:fetch]
+        for name in wanted:
+            value = results.get(name)
+            if isinstance(value, list):
+                workspace.has_more[name] = len(value) > limit
+                value = value[:limit]
+            workspace.sections[name] = value
+        return workspace
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("PULSS_SLOW_QUERY_MS", "100") or 100)
+# Distinct statement shapes tracked since startup; further new shapes are not recorded.
+MAX_SHAPES = int(os.getenv("PULSS_SLOW_QUERY_MAX_SHAPES", "500") or 500)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace, literals and IN (?, ?, ...) lists so equivalent statements share one shape."""
+    shape = _STRING.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryShapeStats:
+    sql: str
+    count: int = 0
+    slow_count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_rows: int = 0
+    param_types: List[str] = field(default_factory=list)
+    plan: List[str] = field(default_factory=list)
+    last_slow_at: Optional[datetime] = None
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SlowQueryLog:
+    """Query observer: per-shape timing for every statement, plus a log line with
+    EXPLAIN QUERY PLAN for statements slower than the threshold."""
+
+    def __init__(self, conn: sqlite3.Connection, threshold_ms: float = SLOW_QUERY_MS) -> None:
+        self.conn = conn
+        self.threshold_ms = threshold_ms
+        self._shapes: Dict[str, QueryShapeStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, sql: str, params: Sequence[object], seconds: float, rows: int) -> None:
+        shape = normalize_sql(sql)
+        elapsed_ms = seconds * 1000
+        slow = elapsed_ms >= self.threshold_ms
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                if len(self._shapes) >= MAX_SHAPES and not slow:
+                    return
+                stats = self._shapes[shape] = QueryShapeStats(sql=shape)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.last_rows = rows
+            if slow:
+                stats.slow_count += 1
+                stats.last_slow_at = datetime.utcnow()
+                stats.param_types = [type(p).__name__ for p in params]
+            need_plan = slow and not stats.plan
+        if not slow:
+            return
+        if need_plan:
+            plan = self._explain(sql, params)
+            with self._lock:
+                stats.plan = plan
+        logger.warning(
+            "[pulss] slow query %.1fms rows=%d sql=%s param_types=%s plan=%s",
+            elapsed_ms,
+            rows,
+            shape,
+            stats.param_types,
+            " | ".join(stats.plan),
+        )
+
+    def _explain(self, sql: str, params: Sequence[object]) -> List[str]:
+        keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if keyword not in _EXPLAINABLE or (not params and "?" in sql):
+            return []
+        try:
+            # A plain cursor bypasses the instrumented execute(), so EXPLAIN is not observed itself.
+            cur = sqlite3.Cursor(self.conn)
+            rows = cur.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params)).fetchall()
+        except sqlite3.Error as e:
+            return [f"(explain failed: {e})"]
+        return [str(r[-1]) for r in rows]
+
+    def top(self, limit: int = 20) -> List[QueryShapeStats]:
+        with self._lock:
+            shapes = list(self._shapes.values())
+        return sorted(shapes, key=lambda s: s.max_ms, reverse=True)[:limit]
@@ -0,0 +1,88 @@
+import pytest
+
+from dedup import DuplicateIndex, _Entry, jaccard, normalize_company, shingles
+from infrastructure import Database
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "株式会社ABC",
+        "ABC株式会社",
+        "ABC(株)",
+        "ＡＢＣ（株）",
+        "㈱ABC",
+        "ABC Co., Ltd.",
+        "abc inc",
+        "ABC Corporation",
+        " A B C ",
+    ],
+)
+def test_entity_markers_width_and_spacing_are_ignored(name):
+    assert normalize_company(name) == "abc"
+
+
+def test_kana_is_folded():
+    assert normalize_company("さくら・フーズ") == normalize_company("サクラフーズ") == "サクラフーズ"
+    assert normalize_company("キッチンカフェ") == normalize_company("キツチンカフエ")
+    assert normalize_company("ｶﾌｪ") == normalize_company("カフェ")
+
+
+def test_entity_words_inside_a_name_are_kept():
+    assert normalize_company("Company Kitchen") == "companykitchen"
+    assert normalize_company("Incubate Labs") == "incubatelabs"
+
+
+def test_name_of_only_an_entity_marker_is_empty():
+    assert normalize_company("株式会社") == ""
+    assert normalize_company("") == ""
+    assert normalize_company(None) == ""
+
+
+def test_shingles_and_jaccard():
+    assert shingles("ab") == frozenset({"^a", "ab", "b$"})
+    assert jaccard(shingles("abc"), shingles("abc")) == 1.0
+    assert jaccard(frozenset(), frozenset()) == 0.0
+    assert 0.0 < jaccard(shingles("abcd"), shingles("abce")) < 1.0
+
+
+def test_similarity():
+    assert _Entry.of("株式会社さくら").similarity(_Entry.of("サクラ(株)")) == 1.0
+    # Numbered branches are different companies however similar the rest is.
+    assert _Entry.of("パルス第1営業所").similarity(_Entry.of("パルス第2営業所")) == 0.0
+    assert _Entry.of("店舗00010").similarity(_Entry.of("店舗00100")) == 0.0
+    assert _Entry.of("Sakura Foods").similarity(_Entry.of("Sakura Food")) > 0.6
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "dedup.db"))
+    yield database
+    database.conn.close()
+
+
+def test_find_reads_existing_rows_and_follows_updates(db):
+    db.execute("INSERT INTO leads(id, company_name) VALUES(?, ?)", ("L1", "株式会社さくらフーズ"))
+    db.execute("INSERT INTO leads(id, company_name) VALUES(?, ?)", ("L2", "パルス第1営業所"))
+    db.execute("INSERT INTO clients(id, name) VALUES(?, ?)", ("C1", "サクラフーズ(有)"))
+    index = DuplicateIndex(db)
+
+    matches = index.find("さくらフーズ")
+    assert [(m.kind, m.id, m.score) for m in matches] == [("client", "C1", 1.0), ("lead", "L1", 1.0)]
+    assert [m.id for m in index.find("サクラフーズ", kinds=["lead"])] == ["L1"]
+    assert [m.id for m in index.find("サクラフーズ", exclude=("lead", "L1"))] == ["C1"]
+    assert index.find("パルス第2営業所") == []
+    assert index.find("株式会社") == []
+
+    index.update([(("lead", "L1"), "Tokyo Bakery")])
+    assert [m.id for m in index.find("さくらフーズ")] == ["C1"]
+    assert [m.id for m in index.find("Tokyo Bakery Inc.")] == ["L1"]
+
+
+def test_report_groups_duplicates(db):
+    for i, name in enumerate(["株式会社ABC", "ABC(株)", "ＡＢＣ Co., Ltd.", "XYZ"]):
+        db.execute("INSERT INTO leads(id, company_name) VALUES(?, ?)", (f"L{i}", name))
+    groups = DuplicateIndex(db).report()
+    assert len(groups) == 1
+    assert groups[0].normalized == "abc"
+    assert sorted(m.id for m in groups[0].members) == ["L0", "L1", "L2"]
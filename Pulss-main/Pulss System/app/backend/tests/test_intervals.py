@@ -0,0 +1,72 @@
+import random
+
+from intervals import IntervalTree
+
+
+def brute(spans, start, end):
+    return sorted(i for i, (s, e) in spans.items() if s < end and e > start)
+
+
+def test_touching_intervals_do_not_overlap():
+    tree = IntervalTree()
+    tree.add("a", 10, 20)
+    assert tree.overlapping(20, 30) == []
+    assert tree.overlapping(0, 10) == []
+    assert tree.overlapping(19, 21) == ["a"]
+
+
+def test_results_are_ordered_by_start():
+    tree = IntervalTree()
+    for i, start in enumerate([50, 10, 30, 20, 40]):
+        tree.add(f"e{i}", start, start + 100)
+    assert tree.overlapping(0, 1000) == ["e1", "e3", "e2", "e4", "e0"]
+
+
+def test_add_moves_an_existing_interval():
+    tree = IntervalTree()
+    tree.add("a", 0, 10)
+    tree.add("a", 100, 110)
+    assert len(tree) == 1
+    assert tree.overlapping(0, 10) == []
+    assert tree.overlapping(105, 106) == ["a"]
+
+
+def test_remove_unknown_id_is_a_no_op():
+    tree = IntervalTree()
+    tree.add("a", 0, 10)
+    tree.remove("missing")
+    assert "a" in tree and "missing" not in tree
+
+
+def test_same_start_different_ids():
+    tree = IntervalTree()
+    for i in range(20):
+        tree.add(f"e{i:02d}", 5, 6 + i)
+    tree.remove("e10")
+    assert tree.overlapping(15, 16) == [f"e{i:02d}" for i in range(10, 20) if i != 10]
+
+
+def test_random_operations_match_brute_force():
+    # Enough inserts and deletes to go through every rotation and two-child delete path.
+    rng = random.Random(42)
+    tree = IntervalTree()
+    spans = {}
+    for step in range(3000):
+        op = rng.random()
+        if op < 0.55 or not spans:
+            item = f"e{rng.randrange(400)}"
+            start = rng.randrange(1000)
+            spans[item] = (start, start + rng.randrange(1, 80))
+            tree.add(item, *spans[item])
+        elif op < 0.85:
+            item = rng.choice(sorted(spans))
+            del spans[item]
+            tree.remove(item)
+        else:
+            start = rng.randrange(1100)
+            end = start + rng.randrange(1, 120)
+            assert sorted(tree.overlapping(start, end)) == brute(spans, start, end), step
+        assert len(tree) == len(spans)
+    for item in sorted(spans):
+        tree.remove(item)
+    assert len(tree) == 0 and tree.overlapping(0, 2000) == []
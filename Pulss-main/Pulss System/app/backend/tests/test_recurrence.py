@@ -0,0 +1,200 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from domain import ScheduleEvent, ScheduleException
+from infrastructure import schedule_key
+from recurrence import MAX_COUNT, RecurrenceRule, last_start, occurrences
+from services import _expand_series
+
+JST = timezone(timedelta(hours=9))
+
+
+def expand(rrule, dtstart, after=None, before=None):
+    return list(occurrences(RecurrenceRule.parse(rrule), dtstart, after or dtstart, before or dtstart + timedelta(days=800)))
+
+
+def days(dts):
+    return [dt.strftime("%Y-%m-%d") for dt in dts]
+
+
+# -- parsing -----------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "FREQ=DAILY",
+        "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",
+        "FREQ=MONTHLY;COUNT=6;BYDAY=2TU",
+        "FREQ=MONTHLY;BYMONTHDAY=1,-1",
+        "FREQ=YEARLY;UNTIL=20300101T000000Z",
+    ],
+)
+def test_parse_round_trips(text):
+    assert str(RecurrenceRule.parse(text)) == text
+
+
+def test_parse_accepts_prefix_and_lowercase():
+    assert RecurrenceRule.parse("RRULE:freq=weekly;byday=mo") == RecurrenceRule.parse("FREQ=WEEKLY;BYDAY=MO")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "FREQ=HOURLY",
+        "FREQ=DAILY;COUNT=2;UNTIL=20300101",
+        "FREQ=DAILY;COUNT=0",
+        f"FREQ=DAILY;COUNT={MAX_COUNT + 1}",
+        "FREQ=DAILY;INTERVAL=0",
+        "FREQ=WEEKLY;BYDAY=2TU",
+        "FREQ=DAILY;BYDAY=MO",
+        "FREQ=MONTHLY;BYMONTHDAY=32",
+        "FREQ=MONTHLY;BYDAY=6MO",
+        "FREQ=WEEKLY;BYSETPOS=1",
+        "FREQ=DAILY;COUNT",
+    ],
+)
+def test_parse_rejects_unsupported_rules(text):
+    with pytest.raises(ValueError):
+        RecurrenceRule.parse(text)
+
+
+# -- expansion -----------------------------------------------------------------
+
+
+def test_weekly_byday_keeps_time_of_day():
+    start = datetime(2026, 11, 2, 10, 0)  # Monday
+    got = expand("FREQ=WEEKLY;BYDAY=MO,TH;COUNT=4", start)
+    assert got == [
+        datetime(2026, 11, 2, 10, 0),
+        datetime(2026, 11, 5, 10, 0),
+        datetime(2026, 11, 9, 10, 0),
+        datetime(2026, 11, 12, 10, 0),
+    ]
+
+
+def test_weekly_byday_skips_days_before_dtstart():
+    start = datetime(2026, 11, 4, 9, 0)  # Wednesday; Monday of that week is not an occurrence
+    assert days(expand("FREQ=WEEKLY;BYDAY=MO,FR;COUNT=3", start)) == ["2026-11-06", "2026-11-09", "2026-11-13"]
+
+
+def test_monthly_byday_ordinals():
+    start = datetime(2026, 1, 1, 9, 0)
+    assert days(expand("FREQ=MONTHLY;COUNT=4;BYDAY=2TU", start)) == ["2026-01-13", "2026-02-10", "2026-03-10", "2026-04-14"]
+    assert days(expand("FREQ=MONTHLY;COUNT=3;BYDAY=-1FR", start)) == ["2026-01-30", "2026-02-27", "2026-03-27"]
+
+
+def test_monthly_fifth_weekday_skips_months_without_one():
+    got = days(expand("FREQ=MONTHLY;COUNT=3;BYDAY=5MO", datetime(2026, 1, 1)))
+    assert got == ["2026-03-30", "2026-06-29", "2026-08-31"]
+
+
+def test_bymonthday_minus_one_is_the_last_day_of_each_month():
+    got = days(expand("FREQ=MONTHLY;COUNT=4;BYMONTHDAY=-1", datetime(2027, 12, 1)))
+    assert got == ["2027-12-31", "2028-01-31", "2028-02-29", "2028-03-31"]
+
+
+def test_bymonthday_and_byday_intersect():
+    # Friday the 13th
+    got = days(expand("FREQ=MONTHLY;COUNT=2;BYMONTHDAY=13;BYDAY=FR", datetime(2026, 1, 1)))
+    assert got == ["2026-02-13", "2026-03-13"]
+
+
+def test_monthly_on_the_31st_skips_short_months():
+    got = days(expand("FREQ=MONTHLY;COUNT=4", datetime(2026, 1, 31)))
+    assert got == ["2026-01-31", "2026-03-31", "2026-05-31", "2026-07-31"]
+
+
+def test_yearly_feb_29_only_in_leap_years():
+    got = days(expand("FREQ=YEARLY;COUNT=3", datetime(2024, 2, 29), before=datetime(2040, 1, 1)))
+    assert got == ["2024-02-29", "2028-02-29", "2032-02-29"]
+
+
+def test_until_is_inclusive_and_a_date_until_covers_the_whole_day():
+    start = datetime(2026, 11, 1, 18, 0)
+    assert days(expand("FREQ=DAILY;UNTIL=20261103T180000", start)) == ["2026-11-01", "2026-11-02", "2026-11-03"]
+    assert days(expand("FREQ=DAILY;UNTIL=20261103", start)) == ["2026-11-01", "2026-11-02", "2026-11-03"]
+
+
+def test_count_is_counted_from_the_series_start_not_the_window():
+    start = datetime(2026, 11, 2, 10, 0)
+    got = expand("FREQ=DAILY;COUNT=5", start, after=datetime(2026, 11, 5), before=datetime(2026, 12, 1))
+    assert days(got) == ["2026-11-05", "2026-11-06"]
+
+
+def test_window_far_after_the_start_matches_a_full_expansion():
+    start = datetime(2020, 1, 6, 9, 0)
+    for rrule in ("FREQ=WEEKLY;INTERVAL=3;BYDAY=MO,WE", "FREQ=MONTHLY;INTERVAL=5;BYDAY=-1SU", "FREQ=DAILY;INTERVAL=7"):
+        after, before = datetime(2026, 3, 1), datetime(2026, 9, 1)
+        full = [d for d in expand(rrule, start, before=before) if d >= after]
+        assert expand(rrule, start, after=after, before=before) == full
+
+
+def test_aware_series_with_naive_utc_window():
+    start = datetime(2026, 11, 2, 10, 0, tzinfo=JST)  # 01:00 UTC
+    # A naive window is UTC: [00:30, 01:30) UTC contains the first occurrence.
+    got = expand("FREQ=DAILY;COUNT=3", start, after=datetime(2026, 11, 2, 0, 30), before=datetime(2026, 11, 2, 1, 30))
+    assert got == [start]
+    # Occurrences keep the series' own offset.
+    assert all(d.utcoffset() == timedelta(hours=9) for d in expand("FREQ=DAILY;COUNT=3", start))
+
+
+def test_naive_series_with_aware_window():
+    start = datetime(2026, 11, 2, 1, 0)
+    got = expand(
+        "FREQ=DAILY;COUNT=3",
+        start,
+        after=datetime(2026, 11, 3, 9, 0, tzinfo=JST),  # 2026-11-03 00:00 UTC
+        before=datetime(2026, 11, 4, 9, 0, tzinfo=JST),
+    )
+    assert got == [datetime(2026, 11, 3, 1, 0)]
+
+
+def test_last_start():
+    start = datetime(2026, 1, 1, 9, 0)
+    assert last_start(RecurrenceRule.parse("FREQ=MONTHLY;COUNT=3;BYDAY=1MO"), start) == datetime(2026, 3, 2, 9, 0)
+    assert last_start(RecurrenceRule.parse("FREQ=WEEKLY;UNTIL=20260201"), start) == datetime(2026, 2, 1, 23, 59, 59)
+    assert last_start(RecurrenceRule.parse("FREQ=DAILY"), start) is None
+    assert last_start(RecurrenceRule.parse(f"FREQ=YEARLY;COUNT={MAX_COUNT}"), datetime(2024, 2, 29)) is not None
+
+
+# -- series with exceptions -------------------------------------------------------
+
+
+def _series(rrule):
+    return ScheduleEvent(
+        id="s1",
+        title="定例",
+        start=datetime(2026, 11, 2, 10, 0),
+        end=datetime(2026, 11, 2, 11, 0),
+        type="meeting",
+        team="sales",
+        description=None,
+        rrule=rrule,
+    )
+
+
+def test_count_with_a_cancelled_occurrence_does_not_extend_the_series():
+    series = _series("FREQ=DAILY;COUNT=3")
+    key = schedule_key(datetime(2026, 11, 3, 10, 0))
+    cancelled = {key: ScheduleException(event_id="s1", recurrence_id=key, cancelled=True)}
+    got = _expand_series(series, cancelled, datetime(2026, 11, 1), datetime(2026, 12, 1))
+    assert days(o.start for o in got) == ["2026-11-02", "2026-11-04"]
+
+
+def test_moved_occurrence_keeps_its_id_and_lands_in_the_new_window():
+    series = _series("FREQ=DAILY;COUNT=3")
+    key = schedule_key(datetime(2026, 11, 3, 10, 0))
+    moved = {
+        key: ScheduleException(
+            event_id="s1",
+            recurrence_id=key,
+            cancelled=False,
+            start=datetime(2026, 11, 20, 15, 0),
+            end=datetime(2026, 11, 20, 16, 0),
+        )
+    }
+    got = _expand_series(series, moved, datetime(2026, 11, 20), datetime(2026, 11, 21))
+    assert [(o.id, o.start) for o in got] == [(f"s1@{key}", datetime(2026, 11, 20, 15, 0))]
+    assert _expand_series(series, moved, datetime(2026, 11, 3), datetime(2026, 11, 4)) == []
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def month_index(period: str) -> int:
+    """'YYYY-MM' -> months since year 0, so consecutive months differ by 1."""
+    year, month = period[:7].split("-")
+    return int(year) * 12 + int(month) - 1
+
+
+def period_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def period_range(start: int, end: int) -> List[str]:
+    return [period_label(i) for i in range(start, end + 1)]
+
+
+@dataclass
+class Rollups:
+    """Per input row: growth vs. the previous month / the same month last year, and the
+    trailing 3-month mean over the months that have a value. NaN where undefined."""
+
+    mom: np.ndarray
+    yoy: np.ndarray
+    avg3: np.ndarray
+
+
+def _growth(dense: np.ndarray, lag: int) -> np.ndarray:
+    out = np.full(dense.shape, np.nan)
+    if dense.shape[1] > lag:
+        prev = dense[:, :-lag]
+        cur = dense[:, lag:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[:, lag:] = np.where(prev != 0, cur / prev - 1.0, np.nan)
+    return out
+
+
+def _trailing_mean(dense: np.ndarray, window: int) -> np.ndarray:
+    present = ~np.isnan(dense)
+    sums = np.cumsum(np.where(present, dense, 0.0), axis=1)
+    counts = np.cumsum(present, axis=1)
+    sums[:, window:] -= sums[:, :-window].copy()
+    counts[:, window:] -= counts[:, :-window].copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def compute_rollups(series: Sequence[int], months: Sequence[int], values: Sequence[float]) -> Rollups:
+    """Vectorized MoM / YoY / 3-month rolling mean for many series at once.
+
+    `series[i]` identifies the (client, metric) series of row i and `months[i]` its
+    month_index. Rows are scattered into one dense series x month matrix (gaps are NaN, so a
+    missing month yields NaN growth instead of comparing non-adjacent months), the rollups
+    are computed column-wise, and gathered back to the input row order.
+    """
+    s = np.asarray(series, dtype=np.int64)
+    m = np.asarray(months, dtype=np.int64)
+    v = np.asarray(values, dtype=np.float64)
+    if not len(v):
+        empty = np.zeros(0)
+        return Rollups(empty, empty, empty)
+    sid, s_inv = np.unique(s, return_inverse=True)
+    col = m - m.min()
+    dense = np.full((len(sid), int(col.max()) + 1), np.nan)
+    dense[s_inv, col] = v
+    return Rollups(
+        mom=_growth(dense, 1)[s_inv, col],
+        yoy=_growth(dense, 12)[s_inv, col],
+        avg3=_trailing_mean(dense, 3)[s_inv, col],
+    )
+
+
+def nan_to_none(values: np.ndarray, digits: int = 4) -> List[Optional[float]]:
+    return [None if np.isnan(x) else round(float(x), digits) for x in values]
+
+
+def align(months: Sequence[int], columns: Sequence[Sequence[float]], start: int, end: int) -> List[np.ndarray]:
+    """Scatter each column's (month, value) pairs onto the [start, end] month axis; gaps are NaN."""
+    m = np.asarray(months, dtype=np.int64) - start
+    keep = (m >= 0) & (m <= end - start)
+    out = []
+    for column in columns:
+        axis = np.full(end - start + 1, np.nan)
+        axis[m[keep]] = np.asarray(column, dtype=np.float64)[keep]
+        out.append(axis)
+    return out
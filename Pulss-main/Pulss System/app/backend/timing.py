@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Send this request header (any value but "0") to get a Server-Timing breakdown.
+TIMING_HEADER = "x-pulss-timing"
+
+
+class RequestTiming:
+    """Accumulated span durations for one request (spans may run on worker threads)."""
+
+    def __init__(self) -> None:
+        self.spans: Dict[str, List[float]] = {}  # name -> [seconds, count]
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.spans.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def server_timing(self, total: float) -> str:
+        parts = []
+        with self._lock:
+            items = list(self.spans.items())
+        for name, (seconds, count) in items:
+            parts.append(f'{name};dur={seconds * 1000:.2f};desc="{int(count)}x"')
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar("pulss_timing", default=None)
+
+
+def record(name: str, seconds: float) -> None:
+    timing = _current.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block into the current request's breakdown; a no-op when timing is off."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+def record_db_query(sql: str, params: Sequence[object], seconds: float, rows: int) -> None:
+    """Query observer for Database."""
+    record("db", seconds)
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span("app"):
+                return await endpoint(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span("app"):
+            return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that separates endpoint time ("app") from validation + serialization ("render")."""
+
+    def get_route_handler(self) -> Callable[..., Any]:
+        # Wrap only the call FastAPI runs; the signature was already analysed from the original endpoint.
+        call = self.dependant.call
+        if call is not None and not getattr(call, "_pulss_timed", False):
+            self.dependant.call = _timed_endpoint(call)
+            self.dependant.call._pulss_timed = True  # type: ignore[attr-defined]
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Any) -> Any:
+            timing = _current.get()
+            if timing is None:
+                return await handler(request)
+            start = time.perf_counter()
+            before = timing.spans.get("app", [0.0, 0])[0]
+            try:
+                return await handler(request)
+            finally:
+                endpoint_seconds = timing.spans.get("app", [0.0, 0])[0] - before
+                timing.add("render", max(0.0, time.perf_counter() - start - endpoint_seconds))
+
+        return timed_handler
+
+
+class TimingMiddleware:
+    """Adds Server-Timing and logs one structured line for requests that opt in via X-Pulss-Timing."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        flag = Headers(scope=scope).get(TIMING_HEADER)
+        if not flag or flag == "0":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        status = 500
+
+        async def wrapped_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", timing.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, wrapped_send)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            logger.info(
+                "[pulss] timing %s",
+                json.dumps(
+                    {
+                        "method": scope.get("method"),
+                        "path": scope.get("path"),
+                        "route": getattr(route, "path", None),
+                        "status": status,
+                        "total_ms": round((time.perf_counter() - start) * 1000, 2),
+                        "spans": {
+                            name: {"ms": round(seconds * 1000, 2), "count": int(count)}
+                            for name, (seconds, count) in timing.spans.items()
+                        },
+                    },
+                    ensure_ascii=False,
+                ),
+            )
@@ -1,5 +1,8 @@
+import hashlib
+import json
 import secrets
 import string
+from typing import Any
 
 
 def generate_id() -> str:
@@ -9,3 +12,9 @@ def generate_id() -> str:
 def generate_token(length: int = 24) -> str:
     alphabet = string.ascii_letters + string.digits
     return "".join(secrets.choice(alphabet) for _ in range(length))
+
+
+def content_hash(payload: Any) -> str:
+    """Stable sha256 of a JSON-able structure (key order does not matter)."""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()